@@ -1,8 +1,13 @@
 import logging
-import random
-from typing import Dict, Any, TYPE_CHECKING, List, Optional
+from typing import Dict, Any, TYPE_CHECKING, List, Optional, Tuple
 
+from combat_encounter import CombatEncounter
+from combat_log import CombatLog
+from combat_tactics import CombatTactics, TacticalAction
+from config import COMBAT_FLAVOR_TEXT_ENABLED
 from definitions.entities import Character
+from dice import dice
+from game_events import GameEvent, NPC_DEFEATED
 from game_state import GameState, GameWorld
 
 if TYPE_CHECKING:
@@ -10,15 +15,20 @@ if TYPE_CHECKING:
 
 class CombatHandler:
 
+    def __init__(self, tactics: Optional[CombatTactics] = None):
+        self.tactics = tactics or CombatTactics()
+
     def process_combat_intent(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', intent_data: Dict[str, Any]) -> str:
         intent = intent_data.get("intent")
 
         if not game_state.combat_state and intent == "attack":
             return self._initiate_combat(game_state, world, ai_manager, intent_data)
 
-        if game_state.combat_state:
-            active_char_name = game_state.combat_state["participants"][game_state.combat_state["turn_index"]]
-            if active_char_name != game_state.player.name:
+        encounter = game_state.combat_state
+        if encounter:
+            active_char = encounter.current_actor
+            if active_char is not game_state.player:
+                active_char_name = active_char.name if active_char else "someone else"
                 logging.error("Received player combat intent when it was not the player's turn.")
                 return f"Failure: It is not your turn. {active_char_name} is acting."
 
@@ -27,14 +37,13 @@ class CombatHandler:
                 if not target_name:
                     return "Failure: You must specify a target to attack."
 
-                participants = self._get_combat_participants(game_state, world)
-                target = next((p for p in participants if p.name.lower() == target_name.lower() and p != game_state.player), None)
+                target = next((p for p in encounter.participants if p.name.lower() == target_name.lower() and p is not game_state.player), None)
                 if not target:
                     return f"Failure: '{target_name}' is not in this fight."
 
-                attack_narration = self._execute_attack(game_state, game_state.player, target)
-                game_state.combat_state["turn_index"] += 1
-                return self._run_combat_loop(game_state, world, ai_manager, initial_narration=attack_narration)
+                log = CombatLog()
+                self._execute_attack(game_state, game_state.player, target, log)
+                return self._run_combat_loop(game_state, world, ai_manager, log)
             
             return "Failure: That is not a valid action in combat."
 
@@ -63,146 +72,203 @@ class CombatHandler:
         initial_participants = [game_state.player] + [char for char in location.characters if char.is_hostile or char == target]
         for p in initial_participants:
             p.is_hostile = True
+        game_state.mark_changed(*initial_participants)
 
-        turn_order = sorted(initial_participants, key=lambda x: random.randint(1, 20) + (x.stats.get("dexterity", 10) - 10) // 2, reverse=True)
-
-        game_state.combat_state = {
-            "participants": [p.name for p in turn_order],
-            "turn_index": 0,
-            "round_count": 1
-        }
-        
-        initial_narration = f"You draw your weapon and attack {target.name}! Combat has begun."
-        attack_narration = self._execute_attack(game_state, game_state.player, target)
-
-        game_state.combat_state["turn_index"] += 1
-        return self._run_combat_loop(game_state, world, ai_manager, initial_narration=f"{initial_narration}\n{attack_narration}")
-
-    def _get_combat_participants(self, game_state: GameState, world: GameWorld) -> List[Character]:
-        if not game_state.combat_state:
-            return []
-
-        location = game_state.get_current_location(world)
-        if not location:
-            return []
-
-        participant_names = game_state.combat_state.get("participants", [])
-        all_chars = [game_state.player] + location.characters
-        
-        participant_objects = []
-        for name in participant_names:
-            found_char = next((char for char in all_chars if char.name == name), None)
-            if found_char:
-                participant_objects.append(found_char)
+        encounter = CombatEncounter(player=game_state.player)
+        for p in initial_participants:
+            encounter.add(p, dice.roll("1d20+dex", p.stats, stream="combat"))
+        game_state.combat_state = encounter
         
-        return participant_objects
-
-    def _run_combat_loop(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', initial_narration: str = "") -> str:
-        narration_log = [initial_narration] if initial_narration else []
-
-        while game_state.combat_state:
-            end_state = self._check_combat_end(game_state, world)
+        log = CombatLog()
+        log.note(f"You draw your weapon and attack {target.name}! Combat has begun.")
+        self._execute_attack(game_state, game_state.player, target, log)
+
+        # The opening attack is the player's turn for round one; everyone else acts in initiative order.
+        encounter.start(first_actor=game_state.player)
+        return self._run_combat_loop(game_state, world, ai_manager, log)
+
+    def start_battle(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', sides: Dict[str, List[Character]]) -> str:
+        """
+        Starts a fight between groups already at the player's location, such as
+        a bandit raid on the town guard. The player fights on the side they are
+        listed in (or on their own). Runs until it is the player's turn.
+        """
+        if game_state.combat_state:
+            return "Failure: A fight is already under way."
+
+        encounter = CombatEncounter(player=game_state.player)
+        player_side = next((side for side, members in sides.items() if any(m is game_state.player for m in members)), None)
+        for side, members in sides.items():
+            for member in members:
+                if member is not game_state.player:
+                    member.is_hostile = side != player_side
+                encounter.add(member, dice.roll("1d20+dex", member.stats, stream="combat"), side=side)
+        if game_state.player not in encounter:
+            encounter.add(game_state.player, dice.roll("1d20+dex", game_state.player.stats, stream="combat"))
+        game_state.mark_changed(*(m for members in sides.values() for m in members))
+        game_state.combat_state = encounter
+        logging.info(f"Battle started with {len(encounter)} participants on sides: {', '.join(encounter.sides)}.")
+
+        log = CombatLog()
+        log.note(f"Battle breaks out between {' and '.join(side.replace('_', ' ') for side in sides)}!")
+        encounter.start()
+        return self._run_combat_loop(game_state, world, ai_manager, log)
+
+    def _run_combat_loop(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', log: Optional[CombatLog] = None) -> str:
+        log = log or CombatLog()
+        game_state.mark_changed()
+
+        encounter = game_state.combat_state
+        while encounter:
+            end_state = self._check_combat_end(game_state)
             if end_state:
                 game_state.combat_state = None
-                narration_log.append(end_state)
-                return "\n".join(filter(None, narration_log))
-
-            turn_index = game_state.combat_state["turn_index"]
-            participant_names = game_state.combat_state["participants"]
-            
-            if turn_index >= len(participant_names):
-                game_state.combat_state["turn_index"] = 0
-                game_state.combat_state["round_count"] += 1
-                narration_log.append(f"--- Round {game_state.combat_state['round_count']} ---")
-                continue
-
-            participants = self._get_combat_participants(game_state, world)
-            if not participants:
+                self._add_flavor_text(ai_manager, log)
+                log.note(end_state)
+                return log.render()
+
+            attacker, new_round = encounter.advance()
+            if new_round:
+                log.note(f"--- Round {encounter.round_count} ---")
+            if attacker is None:
                 game_state.combat_state = None
                 return "Victory: The last foe falls, and the dust settles."
-            
-            attacker = participants[turn_index]
-            
-            if attacker.hp <= 0:
-                game_state.combat_state["turn_index"] += 1
-                continue
 
-            if attacker == game_state.player:
-                narration_log.append("It is your turn to act.")
-                return "\n".join(filter(None, narration_log))
-            else:
-                npc_action = self._get_npc_combat_action(attacker, game_state, world, ai_manager)
-                
-                if npc_action and npc_action.get("action") == "attack":
-                    target_name = npc_action.get("target")
-                    target = game_state.player if target_name == game_state.player.name else None
-                    if target:
-                        narration_log.append(self._execute_attack(game_state, attacker, target))
-                else:
-                    narration_log.append(f"{attacker.name} hesitates, unsure what to do.")
-            
-            game_state.combat_state["turn_index"] += 1
+            if attacker is game_state.player:
+                self._add_flavor_text(ai_manager, log)
+                log.note("It is your turn to act.")
+                return log.render()
+
+            self._carry_out_npc_action(attacker, self._get_npc_combat_action(attacker, game_state, world), game_state, world, log)
         
-        return "\n".join(filter(None, narration_log))
+        return log.render()
+
+    def _get_npc_combat_action(self, npc: Character, game_state: GameState, world: GameWorld) -> TacticalAction:
+        encounter = game_state.combat_state
+        assert encounter is not None
+        # Every NPC of a round is planned together, the first time one of them acts.
+        # The plans live on the encounter, so a new fight (or a loaded one) always plans afresh.
+        if encounter.planned_round != encounter.round_count or id(npc) not in encounter.plans:
+            encounter.plans = self.tactics.plan_round(encounter, game_state, world)
+            encounter.planned_round = encounter.round_count
+        return encounter.plans.get(id(npc)) or TacticalAction("wait")
+
+    def _carry_out_npc_action(self, npc: Character, plan: TacticalAction, game_state: GameState, world: GameWorld, log: CombatLog):
+        encounter = game_state.combat_state
+        assert encounter is not None
+
+        if plan.action == "heal" and plan.item and plan.item in npc.inventory:
+            amount = plan.item.use_effect.get("amount", 0)
+            npc.hp = min(npc.max_hp, npc.hp + amount)
+            if plan.item.category == "potion":
+                npc.remove_item_from_inventory(plan.item)
+            game_state.mark_changed(npc)
+            logging.info(f"NPC '{npc.name}' used {plan.item.name}, healing for {amount}. HP: {npc.hp}/{npc.max_hp}")
+            log.event("healed", [npc.name], f"{npc.name} uses {plan.item.name} and recovers {amount} HP.")
+            return
+
+        if plan.action == "flee" and plan.destination_id:
+            location = game_state.get_current_location(world)
+            destination = world.get_location(plan.destination_id)
+            if location and destination and npc in location.characters:
+                encounter.remove(npc)
+                location.remove_character(npc)
+                destination.add_character(npc)
+                game_state.mark_changed(location, destination)
+                logging.info(f"NPC '{npc.name}' fled combat from '{location.id}' to '{destination.id}'.")
+                log.event("fled", [npc.name], f"{npc.name} breaks away and flees towards {destination.name}!")
+                return
 
-    def _get_npc_combat_action(self, npc: Character, game_state: GameState, world: GameWorld, ai_manager: 'AIManager') -> Dict[str, Any]:
-        logging.info(f"Getting combat action for NPC '{npc.name}'.")
-        return {
-            "action": "attack",
-            "target": game_state.player.name
-        }
+        if plan.action == "call_for_help":
+            joined = self._bring_in_allies(plan.allies, encounter.side_of(npc), game_state, world)
+            if joined:
+                names = [ally.name for ally in joined]
+                log.event("joined", names, f"{npc.name} shouts for help! {', '.join(names)} joins the fight.")
+                return
 
-    def _execute_attack(self, game_state: GameState, attacker: Character, target: Character) -> str:
-        def get_attack_roll(char: Character) -> int:
-            modifier = (char.stats.get("strength", 10) - 10) // 2 + char.get_total_attack_bonus()
-            return random.randint(1, 20) + modifier
-        
-        def get_damage_amount(char: Character) -> int:
-            dice_str = char.get_damage_dice()
-            num_dice, dice_size = map(int, dice_str.split('d'))
-            return sum(random.randint(1, dice_size) for _ in range(num_dice))
+        if plan.action != "wait":
+            # Attack, or fall back to attacking when the planned action is no longer possible.
+            target = plan.target
+            if target is None or target.hp <= 0 or target not in encounter:
+                target = self.tactics.fallback_target(encounter, npc)
+            if target:
+                self._execute_attack(game_state, npc, target, log)
+                return
 
-        attack_roll = get_attack_roll(attacker)
-        target_ac = target.get_total_armor_class()
+        log.event("waited", [npc.name], f"{npc.name} hesitates, unsure what to do.")
 
-        if attack_roll >= target_ac:
-            damage = get_damage_amount(attacker)
-            target.hp -= damage
-            logging.info(f"HIT! {attacker.name} attacks {target.name} for {damage} damage. {target.name} HP: {target.hp}/{target.max_hp}")
-            
-            narration = f"{attacker.name}'s attack hits {target.name} for {damage} damage!"
-            if target.hp <= 0:
-                narration += f" {target.name} collapses, defeated!"
-                if game_state.combat_state:
-                    self._remove_defeated_participant(character=target, game_state=game_state)
-            return narration
-        else:
-            logging.info(f"MISS! {attacker.name} attacks {target.name} but fails to hit.")
-            return f"{attacker.name} attacks {target.name} but misses."
+    def _bring_in_allies(self, allies: Tuple[Character, ...], side: Optional[str], game_state: GameState, world: GameWorld) -> List[Character]:
+        encounter = game_state.combat_state
+        location = game_state.get_current_location(world)
+        if not encounter or not location:
+            return []
 
-    def _check_combat_end(self, game_state: GameState, world: GameWorld) -> Optional[str]:
-        participants = self._get_combat_participants(game_state, world)
+        joined = []
+        for ally in allies:
+            if ally in encounter or ally.hp <= 0:
+                continue
+            if not any(c is ally for c in location.characters):
+                found = world.find_character_anywhere(ally.name)
+                if not found or found[0] is not ally:
+                    continue
+                found[1].remove_character(ally)
+                location.add_character(ally)
+                game_state.mark_changed(found[1], location)
+            ally.is_hostile = side != encounter.side_of(game_state.player)
+            game_state.mark_changed(ally)
+            encounter.add(ally, dice.roll("1d20+dex", ally.stats, stream="combat"), side=side)
+            joined.append(ally)
+        return joined
+
+    def _add_flavor_text(self, ai_manager: 'AIManager', log: CombatLog):
+        """One optional model call per round that colours the NPCs' mechanical results."""
+        if not COMBAT_FLAVOR_TEXT_ENABLED or not ai_manager or not log.npc_lines():
+            return
+        flavor = ai_manager.describe_combat_round(log.npc_lines())
+        log.note(flavor)
+
+    def _execute_attack(self, game_state: GameState, attacker: Character, target: Character, log: CombatLog):
+        def get_attack_roll(char: Character) -> int:
+            return dice.roll("1d20+str", char.stats, stream="combat") + char.get_total_attack_bonus()
         
+        def get_damage_amount(char: Character) -> int:
+            try:
+                return max(0, dice.roll(char.get_damage_dice(), char.stats, stream="combat"))
+            except ValueError as e:
+                logging.error(f"Bad damage dice for '{char.name}', falling back to 1d4. Error: {e}")
+                return dice.roll("1d4", stream="combat")
+
+        hit = get_attack_roll(attacker) >= target.get_total_armor_class()
+        self._apply_attack(game_state, attacker, target, hit, get_damage_amount(attacker) if hit else 0, log)
+
+    def _apply_attack(self, game_state: GameState, attacker: Character, target: Character, hit: bool, damage: int, log: CombatLog):
+        involves_player = game_state.player is attacker or game_state.player is target
+        by_npc = attacker is not game_state.player
+        if not hit:
+            logging.info(f"MISS! {attacker.name} attacks {target.name} but fails to hit.")
+            log.attack(f"{attacker.name} attacks {target.name} but misses.", False, 0, involves_player=involves_player, by_npc=by_npc)
+            return
+
+        target.hp -= damage
+        game_state.mark_changed(target)
+        logging.info(f"HIT! {attacker.name} attacks {target.name} for {damage} damage. {target.name} HP: {target.hp}/{target.max_hp}")
+
+        narration = f"{attacker.name}'s attack hits {target.name} for {damage} damage!"
+        defeated = None
+        if target.hp <= 0:
+            narration += f" {target.name} collapses, defeated!"
+            defeated = target.name
+            if target is not game_state.player:
+                game_state.emit(GameEvent(NPC_DEFEATED, target.name))
+            if game_state.combat_state and target in game_state.combat_state:
+                game_state.combat_state.remove(target)
+        log.attack(narration, True, damage, defeated=defeated, involves_player=involves_player, by_npc=by_npc)
+
+    def _check_combat_end(self, game_state: GameState) -> Optional[str]:
         if game_state.player.hp <= 0:
             return "Defeat: You have been vanquished."
 
-        living_opponents = [p for p in participants if p != game_state.player and p.hp > 0]
-        if not living_opponents:
+        if game_state.combat_state and not game_state.combat_state.living_opponents:
             return "Victory: The last of your foes has been defeated!"
         
         return None
-    
-    def _remove_defeated_participant(self, character: Character, game_state: GameState):
-        if game_state.combat_state and character.name in game_state.combat_state["participants"]:
-            current_turn_index = game_state.combat_state["turn_index"]
-            defeated_char_index = -1
-            try:
-                defeated_char_index = game_state.combat_state["participants"].index(character.name)
-            except ValueError:
-                logging.warning(f"Tried to remove defeated participant '{character.name}' who was already removed.")
-                return
-
-            game_state.combat_state["participants"].remove(character.name)
-            
-            if defeated_char_index < current_turn_index:
-                game_state.combat_state["turn_index"] -= 1
\ No newline at end of file
@@ -1,28 +1,57 @@
 import logging
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 from game_state import GameState, GameWorld, Character
 from game_mechanics import perform_skill_check
 from definitions.quests import Quest
+from managers.quest_offer_manager import QuestOfferManager, QuestOffer, OPEN_OFFER_ID
+from quest_graph import QuestGraph
 
 if TYPE_CHECKING:
     from ai_manager import AIManager
 
 class DialogueHandler:
 
+    def __init__(self, quest_offers: Optional[QuestOfferManager] = None, quest_graph: Optional[QuestGraph] = None):
+        self.quest_offers = quest_offers
+        self.quest_graph = quest_graph
+
+    def _offer_topic(self, npc: Character, offer_id: str, ai_manager: 'AIManager') -> Optional[str]:
+        """Uses a pre-generated offer if one is ready, so the NPC describes exactly the quest the player will get."""
+        if not self.quest_offers:
+            return None
+        offer: Optional[QuestOffer] = self.quest_offers.ready_offer(npc, offer_id)
+        offer_text = ai_manager.resolve_prefetched(offer.offer_text if offer else "")
+        if not offer_text:
+            return None
+        if offer:
+            self.quest_offers.mark_presented(offer)
+        logging.info(f"NPC '{npc.name}' is making the pre-generated offer '{offer_id}'.")
+        return f"The player seems capable. Offer them this job, keeping to its details and staying in character: \"{offer_text}\""
+
     def _get_quest_from_location(self, quest_id: str, location: Any) -> Quest | None:
         if not location:
             return None
         return location.get_quest_by_id(quest_id)
 
-    def _handle_work_inquiry(self, game_state: GameState, world: GameWorld, npc: Character) -> str:
+    def _handle_work_inquiry(self, game_state: GameState, world: GameWorld, npc: Character, ai_manager: 'AIManager') -> str:
         current_location = game_state.get_current_location(world)
-        if not current_location or not npc.available_quest_ids:
+        if current_location and not npc.available_quest_ids and OPEN_OFFER_ID in QuestOfferManager.offer_ids(npc):
+            offer_topic = self._offer_topic(npc, OPEN_OFFER_ID, ai_manager)
+            if offer_topic:
+                return offer_topic
+
+        # Only quests whose prerequisites are met and that the player hasn't taken yet.
+        quest_ids = self.quest_graph.offerable_ids(game_state, world, npc) if self.quest_graph else list(npc.available_quest_ids)
+        if not current_location or not quest_ids:
             logging.info(f"NPC '{npc.name}' has no available quests.")
             return "The player is asking for work, but you have none to offer. Politely tell them you don't have any jobs right now."
 
-        quest_id_to_offer = npc.available_quest_ids[0]
-        quest_to_offer = self._get_quest_from_location(quest_id_to_offer, current_location)
+        quest_id_to_offer = quest_ids[0]
+        if self.quest_graph:
+            quest_to_offer = self.quest_graph.template(quest_id_to_offer)
+        else:
+            quest_to_offer = self._get_quest_from_location(quest_id_to_offer, current_location)
 
         if not quest_to_offer:
             logging.error(f"NPC '{npc.name}' has quest ID '{quest_id_to_offer}' but it was not found in location '{current_location.id}'.")
@@ -35,6 +64,9 @@ class DialogueHandler:
 
         if passed_check:
             logging.info("Player passed the stat check. NPC will offer the quest.")
+            offer_topic = self._offer_topic(npc, quest_id_to_offer, ai_manager)
+            if offer_topic:
+                return offer_topic
             return f"The player seems capable. You should offer them the '{quest_to_offer.name}' quest and describe it."
         else:
             logging.info("Player failed the stat check. NPC will refuse to offer the quest.")
@@ -55,6 +87,7 @@ class DialogueHandler:
                     if target_obj.state["locked"]:
                         logging.info(f"NPC '{npc.name}' is willing and able to unlock '{target_obj.name}'.")
                         target_obj.state["locked"] = False
+                        game_state.mark_changed(target_obj)
                         return f"Success: Dialogue - {npc.name} nods. 'Of course.' He walks over and unlocks the {target_obj.name} with a click."
                     else:
                         return f"Success: Dialogue - {npc.name} looks at the {target_obj.name} and says, 'It's already unlocked.'"
@@ -85,7 +118,7 @@ class DialogueHandler:
 
         is_asking_for_work = any(keyword in topic for keyword in ["work", "job", "task", "quest"])
         if is_asking_for_work:
-            final_topic = self._handle_work_inquiry(game_state, world, npc)
+            final_topic = self._handle_work_inquiry(game_state, world, npc, ai_manager)
 
         dialogue_response = ai_manager.generate_dialogue_response(
             game_state=game_state,
@@ -21,11 +21,7 @@ class EquipmentHandler:
         return "Failure: The world doesn't know how to do that."
 
     def _find_item_in_inventory(self, player: Character, item_name: str) -> Item | None:
-        if not player.inventory: return None
-        for item in player.inventory:
-            if item_name.lower() in item.name.lower():
-                return item
-        return None
+        return player.inventory.find(item_name)
 
     def _handle_equip(self, game_state: GameState, intent_data: Dict[str, Any]) -> str:
         item_name = intent_data.get("target")
@@ -50,6 +46,7 @@ class EquipmentHandler:
         # Equip the new item
         game_state.player.equipment[slot] = item_to_equip
         game_state.player.remove_item_from_inventory(item_to_equip)
+        game_state.mark_changed(game_state.player)
         logging.info(f"Player equipped '{item_to_equip.name}' into slot '{slot}'.")
 
         return f"Success: Equipped {item_to_equip.name}"
@@ -75,6 +72,7 @@ class EquipmentHandler:
         # Move item from equipment to inventory
         game_state.player.equipment[target_slot] = None
         game_state.player.add_item_to_inventory(item_to_unequip)
+        game_state.mark_changed(game_state.player)
         logging.info(f"Player unequipped '{item_to_unequip.name}' from slot '{target_slot}'.")
 
         return f"Success: Unequipped {item_to_unequip.name}"
\ No newline at end of file
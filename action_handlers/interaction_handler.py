@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any, TYPE_CHECKING
 
 from definitions.entities import Item
+from game_events import GameEvent, INTERACTED
 from game_state import GameState, GameWorld
 
 if TYPE_CHECKING:
@@ -33,8 +34,8 @@ class InteractionHandler:
         if found_in_location:
             target_obj, obj_type = found_in_location
         
-        if not target_obj and game_state.player.inventory:
-            player_item = next((item for item in game_state.player.inventory if target_name.lower() in item.name.lower()), None)
+        if not target_obj:
+            player_item = game_state.player.inventory.find(target_name)
             if player_item:
                 target_obj = player_item
                 obj_type = "item_in_inventory"
@@ -63,6 +64,7 @@ class InteractionHandler:
         if 'container' in target_obj.state:
             if not target_obj.state.get('opened'):
                 target_obj.state['opened'] = True
+                game_state.mark_changed(target_obj)
                 logging.info(f"Player opened container '{target_obj.name}'.")
                 
                 location = game_state.get_current_location(world)
@@ -71,10 +73,13 @@ class InteractionHandler:
                 loot = target_obj.state.get('container', [])
                 if loot:
                     for item_data in loot:
-                        location.items.append(Item(**item_data))
+                        location.items.append(Item.from_dict(item_data))
                     target_obj.state['container'] = []
+                    game_state.mark_changed(location)
+                    game_state.emit(GameEvent(INTERACTED, target_obj.name))
                     return "Success: Open and loot"
                 else:
+                    game_state.emit(GameEvent(INTERACTED, target_obj.name))
                     return "Success: Open empty"
             else:
                 return "Failure: It is already open."
@@ -82,7 +87,9 @@ class InteractionHandler:
         if 'toggled' in target_obj.state:
             current_state = target_obj.state['toggled']
             target_obj.state['toggled'] = not current_state
+            game_state.mark_changed(target_obj)
             logging.info(f"Player toggled '{target_obj.name}' from {current_state} to {not current_state}.")
+            game_state.emit(GameEvent(INTERACTED, target_obj.name))
             return "Success"
             
         return f"Failure: You're not sure how to interact with the {target_obj.name}."
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any, TYPE_CHECKING
 
 from definitions.entities import Character, Item
+from game_events import GameEvent, ITEM_GIVEN, ITEM_LOST
 from game_state import GameState, GameWorld
 
 if TYPE_CHECKING:
@@ -23,11 +24,7 @@ class ItemHandler:
         return "Failure: The world doesn't know how to do that."
 
     def _find_item_in_inventory(self, player: Character, item_name: str) -> Item | None:
-        if not player.inventory: return None
-        for item in player.inventory:
-            if item_name.lower() in item.name.lower():
-                return item
-        return None
+        return player.inventory.find(item_name)
 
     def _handle_use_item(self, game_state: GameState, world: GameWorld, intent_data: Dict[str, Any]) -> str:
         item_name = intent_data.get("target")
@@ -48,6 +45,8 @@ class ItemHandler:
             logging.info(f"Player used {item_to_use.name}, healing for {amount}. New HP: {game_state.player.hp}")
             if item_to_use.category == "potion":
                 game_state.player.remove_item_from_inventory(item_to_use)
+                game_state.emit(GameEvent(ITEM_LOST, item_to_use.name))
+            game_state.mark_changed(game_state.player)
             return "Success"
 
         elif effect_op == "unlock":
@@ -65,6 +64,7 @@ class ItemHandler:
 
             if item_to_use.unlocks_id == target_obj.id and target_obj.state.get("locked"):
                 target_obj.state["locked"] = False
+                game_state.mark_changed(target_obj)
                 logging.info(f"Player used {item_to_use.name} to unlock {target_obj.name}.")
                 return "Success"
             else:
@@ -87,6 +87,8 @@ class ItemHandler:
         
         game_state.player.remove_item_from_inventory(item_to_drop)
         location.items.append(item_to_drop)
+        game_state.mark_changed(game_state.player, location)
+        game_state.emit(GameEvent(ITEM_LOST, item_to_drop.name))
         logging.info(f"Player dropped '{item_to_drop.name}' in '{location.id}'.")
         return "Success"
 
@@ -107,5 +109,7 @@ class ItemHandler:
 
         game_state.player.remove_item_from_inventory(item_to_give)
         recipient.add_item_to_inventory(item_to_give)
+        game_state.mark_changed(game_state.player, recipient)
+        game_state.emit(GameEvent(ITEM_GIVEN, item_to_give.name, recipient=recipient.name))
         logging.info(f"Player gave '{item_to_give.name}' to NPC '{recipient.name}'.")
         return "Success"
\ No newline at end of file
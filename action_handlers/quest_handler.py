@@ -1,9 +1,11 @@
+import json
 import logging
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 from game_state import GameState, GameWorld, Character
-from event_executor import execute_world_mutations
 from managers.quest_manager import QuestManager
+from managers.quest_offer_manager import OPEN_OFFER_ID, QuestOfferManager
+from quest_graph import QuestGraph
 
 if TYPE_CHECKING:
     from ai_manager import AIManager
@@ -11,8 +13,30 @@ if TYPE_CHECKING:
 
 class QuestHandler:
 
-    def __init__(self, quest_manager: QuestManager):
+    def __init__(self, quest_manager: QuestManager, quest_offers: Optional[QuestOfferManager] = None, quest_graph: Optional[QuestGraph] = None):
         self.quest_manager = quest_manager
+        self.quest_offers = quest_offers
+        self.quest_graph = quest_graph
+
+    def _take_presented_offer(self, game_state: GameState, world: GameWorld, quest_giver: Character, ai_manager: 'AIManager') -> Optional[Dict[str, Any]]:
+        """The quest from the offer the NPC just made, if it was pre-generated."""
+        if not self.quest_offers:
+            return None
+        offer = self.quest_offers.presented_offer(quest_giver)
+        if offer and offer.offer_id == OPEN_OFFER_ID and self.quest_graph:
+            # Only an offer written from an authored outline carries that quest's id (see validate_offer).
+            offer.quest_data["id"] = self.quest_graph.improvised_id(game_state, world, offer.quest_data["id"])
+        raw_quest = ai_manager.resolve_prefetched(json.dumps(offer.quest_data) if offer else "")
+        if not raw_quest:
+            return None
+        try:
+            quest_data = json.loads(raw_quest)
+        except json.JSONDecodeError as e:
+            logging.error(f"Recorded quest offer could not be parsed. Error: {e}")
+            return None
+        if offer:
+            self.quest_offers.consume(offer)
+        return quest_data
 
     def process_quest_intent(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', intent_data: Dict[str, Any]) -> str:
         action_type = intent_data.get("action_type")
@@ -38,40 +62,29 @@ class QuestHandler:
             else:
                 return f"Failure: You don't see {quest_giver_name} here to accept a quest from."
 
-        quest_offer_memory = None
-        for memory in reversed(quest_giver.memory):
-            if "work" in memory.lower() or "job" in memory.lower() or "task" in memory.lower() or "catch" in memory.lower():
-                quest_offer_memory = memory
-                break
-        
-        if not quest_offer_memory:
-            logging.warning(f"Player tried to accept a quest from '{quest_giver.name}', but no recent offer memory was found.")
-            return "Failure: They don't seem to recall offering you any work."
+        quest_data = self._take_presented_offer(game_state, world, quest_giver, ai_manager)
+        if quest_data:
+            logging.info(f"Accepting the pre-generated quest '{quest_data.get('id')}' from '{quest_giver.name}'.")
+        else:
+            quest_offer_memory = None
+            for memory in reversed(quest_giver.memory):
+                if "work" in memory.lower() or "job" in memory.lower() or "task" in memory.lower() or "catch" in memory.lower():
+                    quest_offer_memory = memory
+                    break
+
+            if not quest_offer_memory:
+                logging.warning(f"Player tried to accept a quest from '{quest_giver.name}', but no recent offer memory was found.")
+                return "Failure: They don't seem to recall offering you any work."
 
-        quest_data = ai_manager.generate_quest_from_context(quest_giver, quest_offer_memory)
+            quest_data = ai_manager.generate_quest_from_context(quest_giver, quest_offer_memory)
+            if not quest_data:
+                logging.error(f"AI failed to generate quest data from memory: '{quest_offer_memory}'")
+                return "Failure: There was a misunderstanding about the details of the job."
+            if self.quest_graph:
+                # Written from the conversation rather than an authored outline, so it keeps its own id
+                # and never takes over an authored quest's chain or on_accept effects (see QuestGraph).
+                quest_data["id"] = self.quest_graph.improvised_id(game_state, world, quest_data.get("id", ""))
 
-        if not quest_data:
-            logging.error(f"AI failed to generate quest data from memory: '{quest_offer_memory}'")
-            return "Failure: There was a misunderstanding about the details of the job."
-            
         display: 'DisplayManager' = intent_data["display"]
         self.quest_manager.start_quest(game_state, quest_data, display)
-        
-        # Example of a hardcoded quest trigger. This can be made more robust later.
-        if "grog" in quest_data.get("id", ""):
-            storeroom_door = game_state.find_interactable_in_location("storeroom door", world)
-            if storeroom_door and storeroom_door.state.get("locked"):
-                logging.info(f"Unlocking storeroom_door as part of quest acceptance.")
-                storeroom_door.state["locked"] = False
-                
-                current_location = game_state.get_current_location(world)
-                if current_location and "salty_siren_storeroom" not in current_location.exits.values():
-                    mutation = {
-                        "op": "add_exit",
-                        "location_id": current_location.id,
-                        "exit_description": "a heavy oak door to the storeroom",
-                        "destination_id": "salty_siren_storeroom"
-                    }
-                    execute_world_mutations(game_state, world, [mutation])
-
         return "Success: Quest Accepted"
\ No newline at end of file
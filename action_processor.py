@@ -1,12 +1,19 @@
 import logging
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
 
+from game_events import GameEvent, ITEM_ACQUIRED, LOCATION_ENTERED
 from game_state import GameState, GameWorld
+from world_graph import DEFAULT_TRAVEL_MINUTES
 
 if TYPE_CHECKING:
     from ai_manager import AIManager
 
+# Run whenever the player enters a location, including each stop of a multi-leg journey.
+EntryHook = Callable[[GameState, GameWorld, 'AIManager'], None]
+
 class ActionProcessor:
+    def __init__(self, entry_hooks: Optional[List[EntryHook]] = None):
+        self.entry_hooks = list(entry_hooks or [])
 
     def process_action(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', intent_data: Dict[str, Any]) -> str:
         intent = intent_data.get("intent")
@@ -17,6 +24,8 @@ class ActionProcessor:
             return self._handle_move(game_state, world, ai_manager, intent_data)
         elif intent == "pass_time":
             return self._handle_pass_time(game_state, world, intent_data)
+        elif intent == "travel":
+            return self._handle_travel(game_state, world, ai_manager, intent_data)
         
         logging.warning(f"No state-changing action found for intent '{intent}'.")
         return "Automatic Success"
@@ -31,6 +40,7 @@ class ActionProcessor:
 
         if item_to_take:
             game_state.move_item_from_location_to_player(item_to_take, world)
+            game_state.emit(GameEvent(ITEM_ACQUIRED, item_to_take.name))
             logging.info(f"Player took '{item_to_take.name}'. State updated.")
             return "Success"
         else:
@@ -60,6 +70,8 @@ class ActionProcessor:
             destination = world.get_location(target_id)
             if destination:
                 game_state.current_location_id = target_id
+                game_state.mark_changed()
+                game_state.emit(GameEvent(LOCATION_ENTERED, target_id))
                 logging.info(f"Player moved from '{current_location.id}' to '{target_id}'. State updated.")
                 return "Success"
             else:
@@ -75,6 +87,9 @@ class ActionProcessor:
                     newly_created_location = world.create_and_add_location(location_data)
                     if newly_created_location:
                         game_state.current_location_id = target_id
+                        game_state.mark_changed(newly_created_location)
+                        game_state.mark_changed()
+                        game_state.emit(GameEvent(LOCATION_ENTERED, target_id))
                         logging.info(f"Dynamically created and moved player to '{target_id}'.")
                         return "Success"
                     else:
@@ -94,5 +109,41 @@ class ActionProcessor:
             return "Failure: The AI could not determine how long you wanted to wait."
         
         game_state.minutes_elapsed += duration
+        game_state.mark_changed()
         logging.info(f"Player passed time by {duration} minutes. New time: {game_state.minutes_elapsed}")
-        return "Success"
\ No newline at end of file
+        return "Success"
+
+    def _handle_travel(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager', intent_data: Dict[str, Any]) -> str:
+        target_name = intent_data.get("target")
+        if not target_name:
+            logging.warning("AI intent 'travel' was missing a 'target' location.")
+            return "Failure: The AI could not determine where you wanted to travel."
+
+        destination = world.find_location_by_name(target_name)
+        if not destination:
+            logging.info(f"Player tried to travel to unknown location '{target_name}'.")
+            return f"Failure: You don't know of any place called '{target_name}'."
+
+        if destination.id == game_state.current_location_id:
+            return f"Failure: You are already at {destination.name}."
+
+        route = world.graph.cheapest_path(game_state.current_location_id, destination.id)
+        if not route:
+            logging.info(f"No known route from '{game_state.current_location_id}' to '{destination.id}'.")
+            return f"Failure: You don't know a way to reach {destination.name} from here."
+
+        # Every stop on the way is entered in turn, so reach_location objectives and the
+        # off-screen NPCs and weather along the route see the player pass through.
+        for previous_id, location_id in zip(route, route[1:]):
+            game_state.minutes_elapsed += world.graph.path_cost([previous_id, location_id])
+            game_state.current_location_id = location_id
+            game_state.emit(GameEvent(LOCATION_ENTERED, location_id))
+            for hook in self.entry_hooks:
+                hook(game_state, world, ai_manager)
+        # The game loop already charges one move's worth of time for a successful action.
+        game_state.minutes_elapsed -= DEFAULT_TRAVEL_MINUTES
+        game_state.mark_changed()
+
+        stops = [loc.name for loc in (world.get_location(loc_id) for loc_id in route[1:]) if loc]
+        logging.info(f"Player traveled along route {route}. State updated.")
+        return f"Success: Traveled {len(route) - 1} legs via {' -> '.join(stops)}"
@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, Deque, Iterable, List
 
 from config import OLLAMA_ENABLED, USE_GEMINI_API
 from prompts import (
@@ -10,7 +11,9 @@ from prompts import (
     NPC_STATE_UPDATE_PROMPT,
     WORLD_EVENT_PROMPT,
     DIALOGUE_GENERATION_PROMPT,
-    QUEST_GENERATION_PROMPT
+    QUEST_GENERATION_PROMPT,
+    QUEST_OFFER_PROMPT,
+    COMBAT_FLAVOR_PROMPT
 )
 from prompts.decomposition import (
     GET_INTENT_PROMPT,
@@ -25,6 +28,7 @@ from prompts.decomposition import (
 from game_state import GameState, GameWorld, Location, Character
 from ai_providers.gemini_client import GeminiClient
 from ai_providers.ollama_client import OllamaClient
+from ai_providers.cassette_client import wrap_with_cassette
 from ai_parser import AIParser
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,25 +36,70 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 class AIManager:
 
     def __init__(self):
-        self.gemini_client = GeminiClient() if USE_GEMINI_API else None
-        self.ollama_client = OllamaClient() if OLLAMA_ENABLED else None
+        self.gemini_client = wrap_with_cassette(GeminiClient(), namespace="gemini") if USE_GEMINI_API else None
+        self.ollama_client = wrap_with_cassette(OllamaClient()) if OLLAMA_ENABLED else None
         self.parser = AIParser()
+        # Raw responses of the current turn, kept for the turn journal.
+        self._captured_responses: Optional[List[Optional[str]]] = None
+        # Recorded responses served instead of calling a provider while a journal is replayed.
+        self._replay_responses: Optional[Deque[Optional[str]]] = None
 
         if not self.ollama_client:
             raise RuntimeError("Ollama is not enabled, but is required as the default provider.")
 
         logging.info("AIManager initialized. Default provider: Ollama. Gemini is available for specialized tasks.")
 
-    def _generate_content(self, prompt: str, expect_json: bool) -> Optional[str]:
-        # Guard Clause to satisfy Pylance and prevent runtime errors.
-        if not self.ollama_client:
-            logging.critical("Ollama client is not available to generate content.")
-            return None
-            
-        return self.ollama_client.generate_content(prompt, force_json=expect_json)
+    def start_capture(self):
+        self._captured_responses = []
+
+    def stop_capture(self) -> List[Optional[str]]:
+        captured, self._captured_responses = self._captured_responses or [], None
+        return captured
+
+    def queue_replay(self, responses: Iterable[Optional[str]]):
+        self._replay_responses = deque(responses)
+
+    def finish_replay(self) -> int:
+        """Leaves replay mode and returns how many queued responses were never asked for."""
+        unused, self._replay_responses = len(self._replay_responses or ()), None
+        return unused
+
+    def resolve_prefetched(self, raw_text: str) -> str:
+        """
+        Makes a response that was generated in the background part of the
+        current turn, so the turn journal records (and replays) it like any
+        other. During a replay the recorded response is returned instead.
+        An empty string stands for "nothing was prefetched".
+        """
+        if self._replay_responses is not None:
+            if not self._replay_responses:
+                logging.warning("Replay ran out of recorded AI responses; the turn has diverged from the journal.")
+                return ""
+            return self._replay_responses.popleft() or ""
+        if self._captured_responses is not None:
+            self._captured_responses.append(raw_text)
+        return raw_text
+
+    def _generate_content(self, prompt: str, expect_json: bool, journaled: bool = True) -> Optional[str]:
+        if journaled and self._replay_responses is not None:
+            if self._replay_responses:
+                raw_text = self._replay_responses.popleft()
+            else:
+                logging.warning("Replay ran out of recorded AI responses; the turn has diverged from the journal.")
+                raw_text = None
+        else:
+            # Guard Clause to satisfy Pylance and prevent runtime errors.
+            if not self.ollama_client:
+                logging.critical("Ollama client is not available to generate content.")
+                return None
+            raw_text = self.ollama_client.generate_content(prompt, force_json=expect_json)
+
+        if journaled and self._captured_responses is not None:
+            self._captured_responses.append(raw_text)
+        return raw_text
 
-    def _execute_prompt(self, prompt: str, expect_json: bool = True) -> Optional[Dict[str, Any] | str]:
-        raw_text = self._generate_content(prompt, expect_json=expect_json)
+    def _execute_prompt(self, prompt: str, expect_json: bool = True, journaled: bool = True) -> Optional[Dict[str, Any] | str]:
+        raw_text = self._generate_content(prompt, expect_json=expect_json, journaled=journaled)
         if raw_text is None:
             return None
 
@@ -68,6 +117,17 @@ class AIManager:
         return None
 
     def get_player_intent(self, game_state: GameState, world: GameWorld, user_input: str) -> Optional[Dict[str, Any]]:
+        travel_prefix = "travel to "
+        if user_input.lower().startswith(travel_prefix):
+            # Multi-hop travel is resolved by the world graph, so it skips the LLM assembly line entirely.
+            destination = user_input[len(travel_prefix):].strip()
+            logging.info(f"Recognized direct travel command to '{destination}'.")
+            return {
+                "intent": "travel",
+                "target": destination,
+                "action_description": f"The player travels to {destination}."
+            }
+
         logging.info("--- Starting Intent Assembly Line ---")
 
         logging.info("Station 1: Classifying Intent...")
@@ -166,6 +226,17 @@ class AIManager:
         logging.error(f"Failed to generate valid JSON for quest from '{quest_giver.name}'.")
         return None
 
+    def generate_quest_offer(self, npc_profile: Dict[str, Any], location_name: str, outline: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Runs on a background thread, outside the turn journal; see QuestOfferManager."""
+        logging.info(f"Pre-generating a quest offer for NPC '{npc_profile.get('name')}'.")
+        outline_text = json.dumps(outline, indent=2) if outline else "None - invent a fitting job."
+        prompt = f"{QUEST_OFFER_PROMPT}\n\nCONTEXT:\n- Quest Giver: {json.dumps(npc_profile)}\n- Location: \"{location_name}\"\n- Quest Outline: {outline_text}"
+        result = self._execute_prompt(prompt, expect_json=True, journaled=False)
+        if isinstance(result, dict):
+            return result
+        logging.error(f"Failed to generate a valid quest offer for '{npc_profile.get('name')}'.")
+        return None
+
     def generate_new_location(self, source_location: Location, exit_description: str, new_location_id: str) -> Optional[Dict[str, Any]]:
         logging.info(f"Dynamically generating new location '{new_location_id}' from source '{source_location.id}'.")
         prompt = f"{LOCATION_GENERATION_PROMPT}\n\nHere is the context for the new location to generate:\n- The player is coming from a location named: \"{source_location.name}\" (ID: {source_location.id})\n- The exit they used was described as: \"{exit_description}\"\n- The required unique ID for this new location must be: \"{new_location_id}\""
@@ -194,6 +265,14 @@ class AIManager:
             return narration.strip('"')
         return None
 
+    def describe_combat_round(self, events: List[str]) -> Optional[str]:
+        logging.info(f"Adding flavour text to a combat round of {len(events)} events.")
+        prompt = COMBAT_FLAVOR_PROMPT.format(events="\n".join(f"- {event}" for event in events))
+        narration = self._execute_prompt(prompt, expect_json=False)
+        if isinstance(narration, str) and narration:
+            return narration.strip('"')
+        return None
+
     def update_npc_state(self, npc: Character, action_description: str, narration: str) -> Optional[Dict[str, Any]]:
         logging.info(f"Phase 4: Updating state for NPC '{npc.name}'.")
         npc_state_json = json.dumps(npc.to_dict(), indent=2)
@@ -0,0 +1,156 @@
+# ai_providers/cassette_client.py
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import AI_CASSETTE_LATENCY, AI_CASSETTE_MODE, AI_CASSETTE_PATH
+
+CASSETTE_MODES = ("passthrough", "record", "replay")
+# Several clients may record into one cassette; their saves are merged one at a time.
+_save_lock = threading.Lock()
+
+def prompt_key(prompt: str, namespace: str = "", **options: Any) -> str:
+    """A stable hash of a prompt and the options (such as force_json) it was sent with, within a provider's namespace."""
+    # The default namespace hashes as before namespaces existed, so older cassettes still match.
+    fields: Dict[str, Any] = {"prompt": prompt, "options": options}
+    if namespace:
+        fields["namespace"] = namespace
+    payload = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CassetteClient:
+    """
+    Wraps an AI provider client so its responses can be recorded to, and
+    replayed from, a cassette file of prompt hash -> raw responses.
+
+    - record: every call goes to the wrapped client and its response is stored.
+      A session starts empty: on save, each prompt recorded in this session
+      replaces that prompt's responses on the cassette, and prompts it did not
+      send are kept. Failed calls (None) are not recorded.
+    - replay: responses come from the cassette, optionally after a simulated
+      latency; the wrapped client is never called. Prompts that are not on the
+      cassette return None and are reported when the client is closed.
+    - passthrough: calls go straight to the wrapped client.
+
+    A prompt that is sent several times keeps each response in order, and
+    replay serves them in that order (repeating the last one). Each provider
+    wraps its client with its own namespace, so providers sharing a cassette
+    never serve each other's responses for the same prompt.
+    """
+
+    def __init__(self, client: Any, mode: str = AI_CASSETTE_MODE, cassette_path: str = AI_CASSETTE_PATH, latency: float = AI_CASSETTE_LATENCY, namespace: str = ""):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Expected one of: {', '.join(CASSETTE_MODES)}")
+        self.client = client
+        self.mode = mode
+        self.cassette_path = Path(cassette_path)
+        self.latency = latency
+        self.namespace = namespace
+        self.entries: Dict[str, List[Optional[str]]] = {}
+        self.prompts: Dict[str, str] = {}
+        self.unmatched: Dict[str, str] = {}
+        self.calls = 0
+        self.hits = 0
+        self._replay_positions: Dict[str, int] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.mode == "replay":
+            self._load()
+        atexit.register(self.close)
+        logging.info(f"CassetteClient initialized in '{mode}' mode with cassette '{self.cassette_path}' ({len(self.entries)} prompts).")
+
+    def generate_content(self, prompt: str, **options: Any) -> Optional[str]:
+        if self.mode == "passthrough":
+            return self.client.generate_content(prompt, **options)
+
+        key = prompt_key(prompt, self.namespace, **options)
+        with self._lock:
+            self.calls += 1
+        if self.mode == "record":
+            response = self.client.generate_content(prompt, **options)
+            if response is None:
+                return None
+            with self._lock:
+                self.entries.setdefault(key, []).append(response)
+                self.prompts[key] = prompt
+                self._dirty = True
+            return response
+
+        with self._lock:
+            responses = self.entries.get(key)
+            if not responses:
+                self.unmatched[key] = prompt
+                logging.warning(f"Cassette has no response for prompt {key[:12]} ({prompt[:80]!r}...).")
+                return None
+            position = self._replay_positions.get(key, 0)
+            self._replay_positions[key] = position + 1
+            self.hits += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return responses[min(position, len(responses) - 1)]
+
+    def _load(self):
+        for key, entry in self._read_entries().items():
+            self.entries[key] = entry["responses"]
+            self.prompts[key] = entry.get("prompt", "")
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cassette_path, 'r') as f:
+                entries = json.load(f).get("entries", {})
+            if all(isinstance(entry.get("responses"), list) for entry in entries.values()):
+                return entries
+            logging.error(f"Cassette '{self.cassette_path}' has an entry without a response list.")
+        except FileNotFoundError:
+            if self.mode == "replay":
+                logging.warning(f"Cassette '{self.cassette_path}' does not exist yet; every prompt will be unmatched.")
+        except (IOError, json.JSONDecodeError, AttributeError, TypeError) as e:
+            logging.error(f"Failed to read cassette '{self.cassette_path}'. Error: {e}")
+        return {}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            recorded = {key: {"prompt": self.prompts.get(key, ""), "responses": list(responses)} for key, responses in self.entries.items()}
+            self._dirty = False
+        with _save_lock:
+            entries = {**self._read_entries(), **recorded}
+            self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.cassette_path.parent, prefix=f".{self.cassette_path.name}.", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"version": 1, "entries": entries}, f, indent=2)
+            os.replace(temp_name, self.cassette_path)
+        logging.info(f"Cassette '{self.cassette_path}' saved with {len(recorded)} prompts recorded this session ({len(entries)} in total).")
+
+    def unmatched_report(self) -> Dict[str, Any]:
+        return {
+            "cassette": str(self.cassette_path),
+            "calls": self.calls,
+            "hits": self.hits,
+            "unmatched": [{"key": key, "prompt": prompt} for key, prompt in self.unmatched.items()],
+        }
+
+    def close(self):
+        if self.mode == "record":
+            self.save()
+        elif self.mode == "replay" and self.unmatched:
+            report_path = self.cassette_path.with_name(f"{self.cassette_path.stem}.unmatched.json")
+            with open(report_path, 'w') as f:
+                json.dump(self.unmatched_report(), f, indent=2)
+            logging.warning(f"{len(self.unmatched)} prompts were not on cassette '{self.cassette_path}'. See '{report_path}'.")
+            self.unmatched = {}
+
+def wrap_with_cassette(client: Any, namespace: str = "") -> Any:
+    """Wraps a provider client according to AI_CASSETTE_MODE; passthrough returns the client unchanged."""
+    if AI_CASSETTE_MODE == "passthrough":
+        return client
+    return CassetteClient(client, namespace=namespace)
@@ -0,0 +1,172 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from change_tracking import ChangedLocations
+from config import AUTOSAVE_BACKUPS, AUTOSAVE_INTERVAL_TURNS, AUTOSAVE_SLOT
+from definitions.world_objects import Location
+from game_state import GameState, GameWorld
+from persistence import PersistenceManager, build_save_metadata
+
+@dataclass
+class _SaveJob:
+    slot_name: str
+    write: Callable[[], bool]
+    # Manual saves report back through a future; autosaves are only logged.
+    done: Optional[Future] = None
+
+class AutosaveService:
+    """
+    Periodically saves the game without blocking the input loop.
+
+    At a turn boundary the main thread takes a snapshot as a list of immutable
+    JSON fragments. Each location's fragment is cached until the ChangeSets
+    published at the end of each turn report the location changed, so only
+    those locations are serialized again. A background worker joins the fragments and writes them through
+    PersistenceManager's atomic temp-file + fsync + rename path, keeping
+    rotating backups. If a new snapshot arrives while the worker is still
+    writing, it replaces any snapshot that has not started yet.
+
+    Manual saves go through the same worker, so only one thread ever writes
+    the save files: submit_save() serializes the game on the caller's thread
+    and queues the write behind whatever the worker already has.
+    """
+
+    def __init__(
+        self,
+        persistence_manager: PersistenceManager,
+        slot_name: str = AUTOSAVE_SLOT,
+        interval_turns: int = AUTOSAVE_INTERVAL_TURNS,
+        backups: int = AUTOSAVE_BACKUPS,
+    ):
+        self.persistence_manager = persistence_manager
+        self.slot_name = slot_name
+        self.interval_turns = interval_turns
+        self.backups = backups
+
+        self._fragment_cache: Dict[str, Tuple[Location, str]] = {}
+        self._changes: Optional[ChangedLocations] = None
+        self._condition = threading.Condition()
+        self._queue: Deque[_SaveJob] = deque()
+        self._writing = False
+        self._stopping = False
+        self._worker: Optional[threading.Thread] = None
+        logging.info(f"AutosaveService initialized. Slot: '{slot_name}', every {interval_turns} turns, {backups} backups.")
+
+    def on_turn_end(self, game_state: GameState, world: GameWorld):
+        if self.interval_turns <= 0 or game_state.turn_count % self.interval_turns != 0:
+            return
+        self.request_save(game_state, world)
+
+    def request_save(self, game_state: GameState, world: GameWorld):
+        start = time.perf_counter()
+        fragments = self._take_snapshot(game_state, world)
+        metadata = build_save_metadata(self.slot_name, game_state, world)
+        logging.info(f"Autosave snapshot taken in {(time.perf_counter() - start) * 1000:.1f} ms.")
+
+        snapshot_text = "".join(fragments)
+        def write() -> bool:
+            return self.persistence_manager.write_snapshot_text(self.slot_name, snapshot_text, backups=self.backups, metadata=metadata)
+
+        with self._condition:
+            # An autosave that has not started yet is superseded; later saves stay queued behind the new one.
+            self._queue = deque(job for job in self._queue if job.done is not None)
+            self._queue.append(_SaveJob(self.slot_name, write))
+            self._condition.notify()
+        self._ensure_worker()
+
+    def submit_save(self, game_state: GameState, world: GameWorld, slot_name: str) -> Future:
+        """Queues a save of the game into `slot_name`. The returned future resolves to True once it is written."""
+        done: Future = Future()
+        write = self.persistence_manager.prepare_save(game_state, world, slot_name)
+        if write is None:
+            done.set_result(False)
+            return done
+        with self._condition:
+            self._queue.append(_SaveJob(slot_name, write, done))
+            self._condition.notify()
+        self._ensure_worker()
+        return done
+
+    def _take_snapshot(self, game_state: GameState, world: GameWorld) -> List[str]:
+        if self._changes is None or self._changes.game_state is not game_state:
+            # A new game, a load or an undo: nothing cached for the previous game state can be trusted.
+            if self._changes:
+                self._changes.close()
+            self._changes = ChangedLocations(game_state, world)
+            self._fragment_cache = {}
+        changed = self._changes.take(world)
+
+        location_fragments = []
+        for loc_id, location in world.loaded_locations():
+            cached = self._fragment_cache.get(loc_id)
+            if not cached or cached[0] is not location or loc_id in changed:
+                cached = (location, json.dumps(location.to_dict(compact=True)))
+                self._fragment_cache[loc_id] = cached
+            location_fragments.append(f"{json.dumps(loc_id)}: {cached[1]}")
+
+        # Locations a lazily loaded world never read stay in the slot it was loaded from.
+        unloaded = ""
+        unloaded_ids = getattr(world.locations, "unloaded_ids", None)
+        if unloaded_ids:
+            unloaded = ', "unloaded": ' + json.dumps({"slot": world.locations.source_slot, "location_ids": unloaded_ids()})
+
+        return [
+            '{"snapshot_id": ', json.dumps(uuid.uuid4().hex),
+            ', "game_state": ', json.dumps(game_state.to_dict(compact=True)),
+            ', "game_world": {"locations": {', ", ".join(location_fragments), '}', unloaded, '}}',
+        ]
+
+    def _ensure_worker(self):
+        if self._worker and self._worker.is_alive():
+            return
+        self._stopping = False
+        self._worker = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+                if not self._queue and self._stopping:
+                    return
+                job = self._queue.popleft()
+                self._writing = True
+
+            written = False
+            try:
+                start = time.perf_counter()
+                written = job.write()
+                if written:
+                    logging.info(f"Save written to slot '{job.slot_name}' in {(time.perf_counter() - start) * 1000:.1f} ms.")
+            except Exception as e:
+                logging.error(f"Save to slot '{job.slot_name}' failed. Error: {e}", exc_info=True)
+            finally:
+                if job.done is not None:
+                    job.done.set_result(written)
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every requested save has been written. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._writing, timeout=timeout)
+
+    def shutdown(self, timeout: Optional[float] = 10.0):
+        self.flush(timeout=timeout)
+        if self._changes:
+            self._changes.close()
+            self._changes = None
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._worker:
+            self._worker.join(timeout=timeout)
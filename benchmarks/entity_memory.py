@@ -0,0 +1,129 @@
+# benchmarks/entity_memory.py
+"""
+Reports the memory cost (bytes per entity) of the game's entity classes,
+comparing the current slotted representations against the original plain
+dataclass layout.
+
+Run from the project root:
+    python -m benchmarks.entity_memory [--count 5000]
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from definitions.entities import Character, Item
+from definitions.quests import Objective, Quest
+from definitions.shared_values import FrozenDict
+from definitions.world_objects import Interactable, Location
+
+# Representative payloads, serialized so that every entity is decoded from its
+# own JSON string, just like AI-generated NPCs and loaded items are.
+SAMPLES: Dict[str, str] = {
+    "Item": json.dumps({
+        "name": "a healing potion",
+        "description": "A small vial of bubbling red liquid that smells faintly of cinnamon.",
+        "category": "potion",
+        "value": 25,
+        "use_effect": {"op": "heal", "amount": 10},
+        "damage_type": None,
+    }),
+    "Character": json.dumps({
+        "name": "Town Guard",
+        "description": "A guard in a dented helmet, watching the crowd.",
+        "stats": {"strength": 12, "dexterity": 11, "intelligence": 9},
+        "mood": "neutral",
+        "personality_tags": ["dutiful", "suspicious"],
+        "faction": "town_guard",
+    }),
+    "Interactable": json.dumps({
+        "id": "storeroom_door",
+        "name": "storeroom door",
+        "description": "A heavy, reinforced oak door.",
+        "state": {"locked": True},
+    }),
+    "Location": json.dumps({
+        "id": "generated_clearing",
+        "name": "A Quiet Clearing",
+        "description": "Sunlight filters through the canopy onto soft moss.",
+        "exits": {"the path back": "whispering_woods_entrance"},
+    }),
+    "Objective": json.dumps({
+        "id": "unload_ale_barrel_1",
+        "description": "Move an ale barrel from the storeroom to the tavern.",
+        "type": "interact",
+        "target": "ale barrel",
+    }),
+    "Quest": json.dumps({
+        "id": "grog_ale_unloading",
+        "name": "Grog's Heavy Lifting",
+        "description": "Grog needs help unloading ale barrels.",
+        "status": "active",
+    }),
+}
+
+CURRENT_CLASSES: Dict[str, type] = {
+    "Item": Item,
+    "Character": Character,
+    "Interactable": Interactable,
+    "Location": Location,
+    "Objective": Objective,
+    "Quest": Quest,
+}
+
+
+def make_legacy_class(cls: type) -> type:
+    """Rebuilds ``cls`` as the original layout: no slots, no interning, per-instance empty containers."""
+    legacy_fields = []
+    for f in dataclasses.fields(cls):
+        if isinstance(f.default, FrozenDict):
+            spec = dataclasses.field(default_factory=dict)
+        elif isinstance(f.default, tuple):
+            spec = dataclasses.field(default_factory=list)
+        elif f.default is not dataclasses.MISSING:
+            spec = dataclasses.field(default=f.default)
+        elif f.default_factory is not dataclasses.MISSING:
+            spec = dataclasses.field(default_factory=f.default_factory)
+        else:
+            spec = dataclasses.field()
+        legacy_fields.append((f.name, f.type, spec))
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", legacy_fields)
+
+
+def measure_bytes_per_entity(factory: Callable[[Dict[str, Any]], Any], payload: str, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    entities: List[Any] = [factory(json.loads(payload)) for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the entities is not part of their cost.
+    list_overhead = entities.__sizeof__()
+    del entities
+    return (after - before - list_overhead) / count
+
+
+def run(count: int):
+    print(f"Entity memory benchmark ({count} instances per class)\n")
+    print(f"{'Entity':<14}{'legacy B/entity':>18}{'slotted B/entity':>18}{'saved':>10}")
+    print("-" * 60)
+    for name, cls in CURRENT_CLASSES.items():
+        payload = SAMPLES[name]
+        legacy_cls = make_legacy_class(cls)
+        legacy = measure_bytes_per_entity(lambda data: legacy_cls(**data), payload, count)
+        current = measure_bytes_per_entity(lambda data: cls(**data), payload, count)
+        saved = (1 - current / legacy) * 100 if legacy else 0.0
+        print(f"{name:<14}{legacy:>18.1f}{current:>18.1f}{saved:>9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes per game entity.")
+    parser.add_argument("--count", type=int, default=5000, help="Number of instances to build per class.")
+    args = parser.parse_args()
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
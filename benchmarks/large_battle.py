@@ -0,0 +1,82 @@
+# benchmarks/large_battle.py
+"""
+Times combat rounds in large battles (a bandit raid on the town guard, with
+the player fighting alongside the guard) and reports how long the combat
+report handed to narration, and the NPC lines handed to flavor text, get.
+
+Run from the project root:
+    python -m benchmarks.large_battle [--participants 50 200 1000] [--turns 10]
+"""
+import argparse
+import logging
+import time
+
+from action_handlers.combat_handler import CombatHandler
+from benchmarks.world_fixtures import build_large_world
+from combat_log import CombatLog
+from definitions.entities import Character
+from dice import dice
+
+def build_battle(participants: int):
+    game_state, world = build_large_world(1, npcs_per_location=0, items_per_location=0)
+    location = game_state.get_current_location(world)
+    game_state.player.hp = game_state.player.max_hp = 10_000
+
+    def fighter(name: str, faction: str, tags) -> Character:
+        return Character(name=name, description="A fighter.", stats={"strength": 13, "dexterity": 11}, hp=18, max_hp=18,
+                         faction=faction, personality_tags=tags)
+
+    guards = [fighter(f"Guard {i}", "town_guard", ["dutiful"]) for i in range(participants // 2 - 1)]
+    bandits = [fighter(f"Bandit {i}", "bandits", ["cruel"] if i % 3 else ["cowardly"]) for i in range(participants - len(guards) - 1)]
+    for char in guards + bandits:
+        location.add_character(char)
+    return game_state, world, {"town_guard": [game_state.player] + guards, "bandits": bandits}
+
+class RecordingHandler(CombatHandler):
+    """Keeps the NPC lines each round would send for flavor text, without a model call."""
+
+    def __init__(self):
+        super().__init__()
+        self.flavor_lines = []
+
+    def _add_flavor_text(self, ai_manager, log: CombatLog):
+        self.flavor_lines.append(log.npc_lines())
+
+def run_battle(participants: int, turns: int):
+    game_state, world, sides = build_battle(participants)
+    handler = RecordingHandler()
+    dice.reseed(42)
+
+    start = time.perf_counter()
+    reports = [handler.start_battle(game_state, world, None, sides)]
+    for _ in range(turns - 1):
+        encounter = game_state.combat_state
+        if not encounter:
+            break
+        target = next((c for c in encounter.enemies_of(game_state.player) if c.hp > 0), None)
+        if target is None:
+            break
+        reports.append(handler.process_combat_intent(game_state, world, None, {"intent": "attack", "target": target.name}))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    most_lines = max(len(report.splitlines()) for report in reports)
+    flavor_lines = max(len(lines) for lines in handler.flavor_lines)
+    left = len(game_state.combat_state) if game_state.combat_state else 0
+    return elapsed_ms / len(reports), most_lines, flavor_lines, left
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark large multi-side battles.")
+    parser.add_argument("--participants", type=int, nargs="+", default=[50, 200, 1000], help="Combatants including the player.")
+    parser.add_argument("--turns", type=int, default=10, help="Player turns (about one round each) to play.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.turns} player turns")
+    print(f"{'participants':>13}{'ms/round':>10}{'report lines':>14}{'flavor lines':>14}{'still fighting':>16}")
+    print("-" * 67)
+    for participants in args.participants:
+        ms_per_round, most_lines, flavor_lines, left = run_battle(participants, args.turns)
+        print(f"{participants:>13}{ms_per_round:>10.2f}{most_lines:>14}{flavor_lines:>14}{left:>16}")
+
+if __name__ == "__main__":
+    main()
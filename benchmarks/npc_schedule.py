@@ -0,0 +1,63 @@
+# benchmarks/npc_schedule.py
+"""
+Compares the cost of a game hour of NPC simulation as the world grows: the
+old pass over every NPC in every location against the level-of-detail
+NPCScheduler, which only simulates NPCs near the player and wakes distant
+ones for their scheduled moves.
+
+Run from the project root:
+    python -m benchmarks.npc_schedule [--sizes 100 1000 5000] [--hours 48]
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.world_fixtures import build_large_world
+from event_executor import execute_npc_schedules
+from npc_scheduler import NPCScheduler
+
+def build_world(num_locations: int, npcs_per_location: int, scheduled_every: int):
+    game_state, world = build_large_world(num_locations, npcs_per_location=npcs_per_location, items_per_location=0)
+    for i, location in enumerate(world.locations.values()):
+        neighbor = f"generated_location_{i + 1 if i + 1 < num_locations else i - 1}"
+        for n, character in enumerate(location.characters):
+            character.hp = character.max_hp // 2
+            if (i * npcs_per_location + n) % scheduled_every == 0:
+                # Works next door by day, comes home at night.
+                character.schedule = {"08:00": neighbor, "18:00": location.id}
+    return game_state, world
+
+def run(sizes, hours: int, npcs_per_location: int, scheduled_every: int):
+    print(f"{'locations':>10}{'npcs':>8}{'scan us/hour':>15}{'scheduler us/hour':>20}")
+    print("-" * 53)
+    for size in sizes:
+        game_state, world = build_world(size, npcs_per_location, scheduled_every)
+        start = time.perf_counter()
+        for hour in range(1, hours + 1):
+            game_state.minutes_elapsed = hour * 60
+            execute_npc_schedules(game_state, world)
+        scan_us = (time.perf_counter() - start) * 1e6 / hours
+
+        game_state, world = build_world(size, npcs_per_location, scheduled_every)
+        scheduler = NPCScheduler()
+        scheduler.advance(game_state, world, 0, 0)
+        start = time.perf_counter()
+        for hour in range(1, hours + 1):
+            game_state.minutes_elapsed = hour * 60
+            scheduler.advance(game_state, world, hour - 1, hour)
+        scheduler_us = (time.perf_counter() - start) * 1e6 / hours
+
+        print(f"{size:>10}{size * npcs_per_location:>8}{scan_us:>15.1f}{scheduler_us:>20.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-hour NPC simulation against world size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="Location counts.")
+    parser.add_argument("--hours", type=int, default=48, help="Game hours to simulate.")
+    parser.add_argument("--npcs", type=int, default=5, help="NPCs per location.")
+    parser.add_argument("--scheduled-every", type=int, default=10, help="One NPC in this many has a daily schedule.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.hours, args.npcs, args.scheduled_every)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/quest_events.py
+"""
+Compares per-turn quest tracking cost as the quest log grows: the old scan
+over every objective of every quest against the event-indexed QuestManager.
+
+Run from the project root:
+    python -m benchmarks.quest_events [--sizes 10 100 1000] [--turns 2000]
+"""
+import argparse
+import logging
+import time
+
+from definitions.entities import Character
+from definitions.quests import Objective, Quest
+from game_events import GameEvent, ITEM_ACQUIRED, LOCATION_ENTERED, NPC_DEFEATED, OBJECTIVE_EVENT_TYPES, normalize_target
+from game_state import GameState
+from managers.quest_manager import QuestManager
+
+class SilentDisplay:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def build_state(num_quests: int) -> GameState:
+    player = Character(name="Arion", description="A determined adventurer.", stats={"strength": 16})
+    game_state = GameState(player=player, current_location_id="generated_location_0")
+    for q in range(num_quests):
+        objectives = [
+            Objective(id=f"q{q}_item", description="Find it.", type="acquire_item", target=f"relic {q}"),
+            Objective(id=f"q{q}_kill", description="Defeat them.", type="kill_target", target=f"Bandit {q}"),
+            Objective(id=f"q{q}_reach", description="Go there.", type="reach_location", target=f"generated_location_{q}"),
+        ]
+        game_state.quest_log[f"quest_{q}"] = Quest(id=f"quest_{q}", name=f"Quest {q}", description="", objectives=objectives)
+    return game_state
+
+def legacy_scan(game_state: GameState, events):
+    # What every turn cost before: visit each objective of each active quest.
+    for event in events:
+        for quest in game_state.quest_log.values():
+            if quest.status != "active":
+                continue
+            for objective in quest.objectives:
+                if objective.is_complete:
+                    continue
+                if OBJECTIVE_EVENT_TYPES.get(objective.type) == event.type and normalize_target(objective.target) == normalize_target(event.target):
+                    objective.current_count += 1
+
+def turn_events(step: int):
+    # Mostly events no quest is waiting for, as in normal play.
+    return [
+        GameEvent(ITEM_ACQUIRED, f"a trinket #{step}"),
+        GameEvent(LOCATION_ENTERED, f"somewhere_{step}"),
+        GameEvent(NPC_DEFEATED, f"Rat {step}"),
+    ]
+
+def run(sizes, turns: int):
+    print(f"{'quests':>8}{'scan us/turn':>15}{'indexed us/turn':>18}")
+    print("-" * 41)
+    display = SilentDisplay()
+    for size in sizes:
+        game_state = build_state(size)
+        start = time.perf_counter()
+        for step in range(turns):
+            legacy_scan(game_state, turn_events(step))
+        scan_us = (time.perf_counter() - start) * 1e6 / turns
+
+        game_state = build_state(size)
+        manager = QuestManager()
+        manager.process_events(game_state, turn_events(-1), display)
+        start = time.perf_counter()
+        for step in range(turns):
+            manager.process_events(game_state, turn_events(step), display)
+        indexed_us = (time.perf_counter() - start) * 1e6 / turns
+
+        print(f"{size:>8}{scan_us:>15.1f}{indexed_us:>18.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quest objective tracking against quest log size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Quest log sizes.")
+    parser.add_argument("--turns", type=int, default=2000, help="Turns per measurement, three events each.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.turns)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/replay_session.py
+"""
+Replays a recorded turn-journal session as a performance fixture. The turns
+run with their recorded RNG seeds and AI responses, so no model is called and
+the timings reflect only the game's own code.
+
+Run from the project root:
+    python -m benchmarks.replay_session [session.jsonl] [--repeat 3]
+Without a path, the most recent session in TURN_JOURNAL_DIR is used.
+"""
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from ai_manager import AIManager
+from config import TURN_JOURNAL_DIR
+from main import create_intent_handlers, create_managers, replay_session
+from turn_journal import load_session
+
+def run(session_file: Path, repeat: int):
+    _, turns, _ = load_session(session_file)
+    recorded_ms = sum(turn.get("duration_ms", 0) for turn in turns)
+    llm_calls = sum(len(turn["llm_responses"]) for turn in turns)
+    print(f"Session: {session_file.name} ({len(turns)} turns, {llm_calls} recorded AI responses)")
+    print(f"Recorded play time spent in turns: {recorded_ms:.1f} ms")
+
+    ai_manager = AIManager()
+    best = float("inf")
+    for _ in range(repeat):
+        managers = create_managers()
+        intent_handlers = create_intent_handlers(managers)
+        start = time.perf_counter()
+        replay_session(session_file, ai_manager, intent_handlers, managers)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    print(f"Replay (best of {repeat}): {best:.1f} ms total, {best / max(1, len(turns)):.2f} ms/turn")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a turn-journal session and time it.")
+    parser.add_argument("session", nargs="?", help="Path to a session-*.jsonl file.")
+    parser.add_argument("--repeat", type=int, default=3, help="Replays to run; the best time is reported.")
+    args = parser.parse_args()
+
+    if args.session:
+        session_file = Path(args.session)
+    else:
+        sessions = sorted(Path(TURN_JOURNAL_DIR).glob("session-*.jsonl"))
+        if not sessions:
+            parser.error(f"No sessions found in '{TURN_JOURNAL_DIR}'.")
+        session_file = sessions[-1]
+
+    logging.disable(logging.CRITICAL)
+    run(session_file, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/reputation.py
+"""
+Times reputation changes as the number of factions grows. Each faction has a
+handful of allies and rivals, so every change spreads through one row of the
+affinity matrix; level lookups are served from the cached levels.
+
+Run from the project root:
+    python -m benchmarks.reputation [--sizes 10 100 1000] [--events 5000]
+"""
+import argparse
+import logging
+import random
+import time
+
+from definitions.entities import Character
+from definitions.factions import Faction, FactionRegistry
+from game_state import GameState
+from managers.reputation_manager import ReputationManager
+
+class SilentDisplay:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def build_registry(num_factions: int, relations_per_faction: int) -> FactionRegistry:
+    rng = random.Random(7)
+    ids = [f"faction_{i}" for i in range(num_factions)]
+    registry = FactionRegistry()
+    for faction_id in ids:
+        others = rng.sample(ids, min(relations_per_faction, num_factions - 1) + 1)
+        relations = {other: rng.choice((0.5, 0.25, -0.25, -0.5)) for other in others if other != faction_id}
+        registry.register(Faction(id=faction_id, name=faction_id, intent_effects={"attack": -20, "give_item": 5}, relations=relations))
+    registry.build_matrix()
+    return registry
+
+def run(sizes, events: int, relations: int):
+    print(f"{'factions':>10}{'us/event':>10}{'us/level lookup':>18}")
+    print("-" * 38)
+    display = SilentDisplay()
+    for size in sizes:
+        registry = build_registry(size, relations)
+        manager = ReputationManager(registry)
+        game_state = GameState(player=Character(name="Arion", description="An adventurer.", stats={}), current_location_id="nowhere")
+        members = [Character(name=f"Member {i}", description="", stats={}, faction=faction_id) for i, faction_id in enumerate(registry.ids)]
+        rng = random.Random(11)
+        picks = [(rng.choice(("attack", "give_item")), rng.choice(members)) for _ in range(events)]
+
+        start = time.perf_counter()
+        for intent, target in picks:
+            manager.process_event(game_state, intent, display, target=target)
+        event_us = (time.perf_counter() - start) * 1e6 / events
+        game_state.drain_events()
+
+        start = time.perf_counter()
+        for _, target in picks:
+            manager.get_reputation_level(game_state, target.faction)
+        lookup_us = (time.perf_counter() - start) * 1e6 / events
+
+        print(f"{size:>10}{event_us:>10.1f}{lookup_us:>18.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reputation propagation against faction count.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Faction counts.")
+    parser.add_argument("--events", type=int, default=5000, help="Reputation events per measurement.")
+    parser.add_argument("--relations", type=int, default=6, help="Allies and rivals per faction.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.events, args.relations)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/save_codecs.py
+"""
+Compares save body size, encode time and decode time for every save codec,
+against the legacy json.dumps(indent=4) snapshot.
+
+Run from the project root:
+    python -m benchmarks.save_codecs [--sizes 50 200 1000] [--repeat 5]
+"""
+import argparse
+import json
+import logging
+import time
+
+from benchmarks.world_fixtures import build_large_world
+from save_codecs import CODECS, decode_save, orjson
+
+def time_best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run(sizes, repeat: int):
+    print(f"JSON backend: {'orjson' if orjson is not None else 'stdlib json'}")
+    print(f"{'locations':>10}{'codec':>10}{'size KB':>12}{'encode ms':>12}{'decode ms':>12}")
+    print("-" * 56)
+    for size in sizes:
+        game_state, world = build_large_world(size)
+        data = {"snapshot_id": "bench", "game_state": game_state.to_dict(compact=True), "game_world": world.to_dict(compact=True)}
+
+        legacy = json.dumps(data, indent=4).encode("utf-8")
+        encode_ms = time_best(lambda: json.dumps(data, indent=4).encode("utf-8"), repeat)
+        decode_ms = time_best(lambda: json.loads(legacy), repeat)
+        print(f"{size:>10}{'legacy':>10}{len(legacy) / 1024:>12.1f}{encode_ms:>12.2f}{decode_ms:>12.2f}")
+
+        for name, codec in CODECS.items():
+            payload = codec.encode(data)
+            assert decode_save(payload) == data
+            encode_ms = time_best(lambda: codec.encode(data), repeat)
+            decode_ms = time_best(lambda: decode_save(payload), repeat)
+            print(f"{size:>10}{name:>10}{len(payload) / 1024:>12.1f}{encode_ms:>12.2f}{decode_ms:>12.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark save codecs by size, encode time and decode time.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="World sizes in locations.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best time is reported.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.repeat)
+
+if __name__ == "__main__":
+    main()
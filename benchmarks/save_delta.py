@@ -0,0 +1,67 @@
+# benchmarks/save_delta.py
+"""
+Compares the legacy full-dump save (whole GameState and GameWorld through
+json.dump(indent=4) every time) with the snapshot + journal delta save.
+
+Run from the project root:
+    python -m benchmarks.save_delta [--sizes 50 200 1000] [--saves 20]
+"""
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.world_fixtures import build_large_world
+from persistence import PersistenceManager
+
+def legacy_full_save(game_state, world, file_path: Path):
+    with open(file_path, 'w') as f:
+        json.dump({"game_state": game_state.to_dict(), "game_world": world.to_dict()}, f, indent=4)
+
+def mutate_one_location(game_state, world, step: int):
+    location = world.locations[f"generated_location_{step % len(world.locations)}"]
+    npc = location.characters[0]
+    npc.memory.append(f"The player passed by on turn {step}.")
+    game_state.mark_changed(npc)
+    game_state.turn_count += 1
+    game_state.end_turn()
+
+def run(sizes, saves: int):
+    print(f"{'locations':>10}{'full dump ms/save':>20}{'delta ms/save':>16}{'load ms':>10}")
+    print("-" * 56)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            game_state, world = build_large_world(size)
+
+            start = time.perf_counter()
+            for step in range(saves):
+                mutate_one_location(game_state, world, step)
+                legacy_full_save(game_state, world, Path(tmp) / "legacy.json")
+            full_ms = (time.perf_counter() - start) * 1000 / saves
+
+            manager = PersistenceManager(tmp, compaction_threshold=saves + 1)
+            manager.save_game(game_state, world, "delta")
+            start = time.perf_counter()
+            for step in range(saves):
+                mutate_one_location(game_state, world, step)
+                manager.save_game(game_state, world, "delta")
+            delta_ms = (time.perf_counter() - start) * 1000 / saves
+
+            start = time.perf_counter()
+            manager.load_game("delta")
+            load_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{size:>10}{full_ms:>20.2f}{delta_ms:>16.2f}{load_ms:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-dump saves against journal delta saves.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="World sizes in locations.")
+    parser.add_argument("--saves", type=int, default=20, help="Saves per measurement, one changed location each.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.saves)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/timers.py
+"""
+Measures what a turn's timer check costs as the number of pending timers
+grows: GameTimers only visits the buckets that came due, against a scan
+that checks every timer's due time each turn. Each turn advances the game
+clock by a few minutes; every --rest-every turns the player rests for
+eight hours in one pass_time jump.
+
+Run from the project root:
+    python -m benchmarks.timers [--sizes 1000 10000 100000] [--turns 500]
+"""
+import argparse
+import logging
+import random
+import time
+
+from timers import GameTimers, MINUTES
+
+def scan_advance(pending, now):
+    due = [timer for timer in pending if timer[0] <= now]
+    pending[:] = [timer for timer in pending if timer[0] > now]
+    return due
+
+def run(sizes, turns: int, rest_every: int, seed: int):
+    print(f"{'timers':>10}{'scan us/turn':>15}{'wheel us/turn':>16}{'fired':>10}")
+    print("-" * 51)
+    for size in sizes:
+        rng = random.Random(seed)
+        delays = [rng.randint(1, 60 * 24 * 30) for _ in range(size)]
+        steps = [480 if turn % rest_every == 0 else 5 for turn in range(1, turns + 1)]
+
+        pending = [(480 + delay, i) for i, delay in enumerate(delays)]
+        now = 480
+        start = time.perf_counter()
+        for step in steps:
+            now += step
+            scan_advance(pending, now)
+        scan_us = (time.perf_counter() - start) * 1e6 / turns
+
+        timers = GameTimers(minutes=480)
+        for delay in delays:
+            timers.schedule(MINUTES, 480, delay, "benchmark")
+        now, fired = 480, 0
+        start = time.perf_counter()
+        for step in steps:
+            now += step
+            fired += len(timers.advance(MINUTES, now))
+        wheel_us = (time.perf_counter() - start) * 1e6 / turns
+
+        print(f"{size:>10}{scan_us:>15.1f}{wheel_us:>16.1f}{fired:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn timer expiry against the number of pending timers.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Pending timer counts.")
+    parser.add_argument("--turns", type=int, default=500, help="Turns to simulate.")
+    parser.add_argument("--rest-every", type=int, default=50, help="Every this many turns the player rests for 8 hours.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the timer delays.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.turns, args.rest_every, args.seed)
+
+if __name__ == "__main__":
+    main()
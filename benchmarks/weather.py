@@ -0,0 +1,58 @@
+# benchmarks/weather.py
+"""
+Measures the local weather simulation as the world grows: building the
+regions once, computing a new game hour for every region, and the per-turn
+refresh of the player's weather, which is served from the hour cache.
+
+Run from the project root:
+    python -m benchmarks.weather [--sizes 100 1000 10000] [--hours 240]
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.world_fixtures import build_large_world
+from managers.weather_manager import WeatherManager
+
+def run(sizes, hours: int, turns_per_hour: int, seed: int):
+    print(f"{'locations':>10}{'regions':>9}{'build ms':>10}{'us/hour':>10}{'us/turn':>10}{'changes':>9}")
+    print("-" * 58)
+    for size in sizes:
+        game_state, world = build_large_world(size, npcs_per_location=0, items_per_location=0)
+        game_state.weather = {"seed": seed}
+        manager = WeatherManager()
+
+        start = time.perf_counter()
+        manager.refresh(game_state, world)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        changes = 0
+        hour_seconds = turn_seconds = 0.0
+        for hour in range(1, hours + 1):
+            game_state.minutes_elapsed = hour * 60
+            version = game_state.version
+            start = time.perf_counter()
+            manager.update_weather(game_state, world)
+            hour_seconds += time.perf_counter() - start
+            changes += game_state.version != version
+            start = time.perf_counter()
+            for _ in range(turns_per_hour):
+                manager.refresh(game_state, world)
+            turn_seconds += time.perf_counter() - start
+
+        hour_us = hour_seconds * 1e6 / hours
+        turn_us = turn_seconds * 1e6 / (hours * turns_per_hour)
+        print(f"{size:>10}{len(manager.model.region_ids):>9}{build_ms:>10.1f}{hour_us:>10.1f}{turn_us:>10.1f}{changes:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the regional weather simulation against world size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Location counts.")
+    parser.add_argument("--hours", type=int, default=240, help="Game hours to simulate.")
+    parser.add_argument("--turns-per-hour", type=int, default=12, help="Player turns per game hour.")
+    parser.add_argument("--seed", type=int, default=7, help="Weather seed.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    run(args.sizes, args.hours, args.turns_per_hour, args.seed)
+
+if __name__ == "__main__":
+    main()
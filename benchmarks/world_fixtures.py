@@ -0,0 +1,40 @@
+# benchmarks/world_fixtures.py
+"""Synthetic worlds for the benchmarks, sized well past the hand-written data."""
+import random
+from typing import Tuple
+
+from definitions.entities import Character, Item
+from definitions.world_objects import Interactable, Location
+from game_state import GameState, GameWorld
+
+def build_large_world(num_locations: int, npcs_per_location: int = 3, items_per_location: int = 4, seed: int = 7) -> Tuple[GameState, GameWorld]:
+    rng = random.Random(seed)
+    locations = {}
+    for i in range(num_locations):
+        loc_id = f"generated_location_{i}"
+        characters = [
+            Character(
+                name=f"Villager {i}-{n}",
+                description="A weathered local who has seen a few too many adventurers pass through.",
+                stats={"strength": rng.randint(8, 16), "dexterity": rng.randint(8, 16), "intelligence": rng.randint(8, 16)},
+                memory=[f"Saw a stranger on day {d}." for d in range(rng.randint(0, 5))],
+                personality_tags=["curious", "talkative"],
+                faction="townsfolk",
+            )
+            for n in range(npcs_per_location)
+        ]
+        items = [Item.from_template("healing_potion") if k % 2 else Item(name=f"a trinket #{k}", description="A small carved token.", value=k) for k in range(items_per_location)]
+        exits = {f"the road to location {j}": f"generated_location_{j}" for j in (i - 1, i + 1) if 0 <= j < num_locations}
+        locations[loc_id] = Location(
+            id=loc_id,
+            name=f"Generated Location {i}",
+            description="A procedurally generated place with muddy paths and crooked fences.",
+            characters=characters,
+            items=items,
+            interactables=[Interactable(id=f"chest_{i}", name="old chest", description="A battered chest.", state={"locked": False})],
+            exits=exits,
+        )
+    world = GameWorld(locations=locations)
+    player = Character(name="Arion", description="A determined adventurer.", stats={"strength": 16, "dexterity": 12, "intelligence": 14})
+    game_state = GameState(player=player, current_location_id="generated_location_0")
+    return game_state, world
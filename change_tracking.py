@@ -0,0 +1,164 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Set, Tuple, TYPE_CHECKING
+
+from definitions.entities import Character
+from definitions.quests import Quest
+from definitions.world_objects import Interactable, Location
+
+if TYPE_CHECKING:
+    from game_state import GameState, GameWorld
+
+@dataclass
+class ChangeSet:
+    """Everything that was modified during one turn, keyed by entity id (characters by name)."""
+    turn: int = 0
+    characters: Set[str] = field(default_factory=set)
+    locations: Set[str] = field(default_factory=set)
+    interactables: Set[str] = field(default_factory=set)
+    quests: Set[str] = field(default_factory=set)
+    game_state: bool = False
+
+    def is_empty(self) -> bool:
+        return not (self.characters or self.locations or self.interactables or self.quests or self.game_state)
+
+    def merge(self, other: "ChangeSet"):
+        self.turn = max(self.turn, other.turn)
+        self.characters |= other.characters
+        self.locations |= other.locations
+        self.interactables |= other.interactables
+        self.quests |= other.quests
+        self.game_state = self.game_state or other.game_state
+
+    def to_dict(self):
+        return {
+            "turn": self.turn,
+            "characters": sorted(self.characters),
+            "locations": sorted(self.locations),
+            "interactables": sorted(self.interactables),
+            "quests": sorted(self.quests),
+            "game_state": self.game_state,
+        }
+
+
+ChangeListener = Callable[[ChangeSet], None]
+
+class ChangeTracker:
+    """
+    Collects the entities modified during the current turn.
+
+    Handlers call mark() (usually via GameState.mark_changed) whenever they
+    mutate an entity. That bumps the entity's version counter, which caches can
+    compare against, and records it in the pending ChangeSet. At the end of
+    the turn, end_turn() hands the ChangeSet to every subscriber (see
+    ChangedLocations, used by the savers) and starts a fresh one.
+    """
+
+    def __init__(self):
+        self.pending = ChangeSet()
+        self._subscribers: List[ChangeListener] = []
+
+    def subscribe(self, listener: ChangeListener):
+        if listener not in self._subscribers:
+            self._subscribers.append(listener)
+
+    def unsubscribe(self, listener: ChangeListener):
+        if listener in self._subscribers:
+            self._subscribers.remove(listener)
+
+    def mark(self, entity: Any):
+        if isinstance(entity, Character):
+            self.pending.characters.add(entity.name)
+        elif isinstance(entity, Location):
+            self.pending.locations.add(entity.id)
+        elif isinstance(entity, Interactable):
+            self.pending.interactables.add(entity.id)
+        elif isinstance(entity, Quest):
+            self.pending.quests.add(entity.id)
+        else:
+            logging.warning(f"ChangeTracker cannot track entity of type '{type(entity).__name__}'.")
+            return
+        entity.version += 1
+
+    def end_turn(self, turn: int) -> ChangeSet:
+        change_set = self.pending
+        change_set.turn = turn
+        self.pending = ChangeSet(turn=turn)
+        if not change_set.is_empty():
+            for listener in list(self._subscribers):
+                try:
+                    listener(change_set)
+                except Exception as e:
+                    logging.error(f"Change listener {listener} failed for turn {turn}. Error: {e}", exc_info=True)
+        return change_set
+
+
+class ChangedLocations:
+    """
+    Follows one game's ChangeTracker and answers which locations changed since
+    the last take(), so savers do not have to compare every location.
+
+    A changed character, interactable or quest counts against the location
+    that held it when that location was last taken (or first seen). Moving a
+    character marks both locations, so that index stays current. An undo that
+    swaps in new Location objects (GameWorld.revision) counts as a change to
+    every loaded location.
+    """
+
+    def __init__(self, game_state: "GameState", world: "GameWorld"):
+        self.game_state = game_state
+        self._tracker = game_state.changes
+        self._world_revision = world.revision
+        self._pending = ChangeSet()
+        # (kind, id) -> ids of the locations holding it, and the reverse.
+        self._owners: Dict[Tuple[str, str], Set[str]] = {}
+        self._contents: Dict[str, List[Tuple[str, str]]] = {}
+        self._index_new_locations(world)
+        self._tracker.subscribe(self._collect)
+
+    def _collect(self, change_set: ChangeSet):
+        self._pending.merge(change_set)
+
+    def close(self):
+        self._tracker.unsubscribe(self._collect)
+
+    def take(self, world: "GameWorld") -> Set[str]:
+        """The ids of the locations changed since the previous call."""
+        changes, self._pending = self._pending, ChangeSet()
+        # Marks made outside a turn (meta commands) have not been published yet.
+        changes.merge(self._tracker.pending)
+
+        if self._world_revision != world.revision:
+            self._world_revision = world.revision
+            self._owners, self._contents = {}, {}
+            self._index_new_locations(world)
+            return set(self._contents)
+
+        self._index_new_locations(world)
+        changed = set(changes.locations)
+        for kind, ids in (("character", changes.characters), ("interactable", changes.interactables), ("quest", changes.quests)):
+            for entity_id in ids:
+                changed |= self._owners.get((kind, entity_id), set())
+        for loc_id in changed:
+            location = world.get_location(loc_id)
+            if location:
+                self._index(loc_id, location)
+        return changed
+
+    def _index_new_locations(self, world: "GameWorld"):
+        # Lazily loaded or generated locations are indexed when they first show up.
+        if len(self._contents) == world.loaded_location_count():
+            return
+        for loc_id, location in world.loaded_locations():
+            if loc_id not in self._contents:
+                self._index(loc_id, location)
+
+    def _index(self, loc_id: str, location: Location):
+        for key in self._contents.get(loc_id, ()):
+            self._owners.get(key, set()).discard(loc_id)
+        contents = [("character", c.name) for c in location.characters]
+        contents += [("interactable", i.id) for i in location.interactables]
+        contents += [("quest", q.id) for q in location.quests]
+        for key in contents:
+            self._owners.setdefault(key, set()).add(loc_id)
+        self._contents[loc_id] = contents
@@ -0,0 +1,178 @@
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from definitions.entities import Character
+
+if TYPE_CHECKING:
+    from combat_tactics import TacticalAction
+
+# The side of the player and anyone fighting with them, and the default side of hostile NPCs.
+PLAYER_SIDE = "player"
+HOSTILE_SIDE = "hostile"
+
+@dataclass(order=True)
+class InitiativeEntry:
+    sort_key: Tuple[int, int]
+    character: Character = field(compare=False)
+    side: str = field(default=HOSTILE_SIDE, compare=False)
+    removed: bool = field(default=False, compare=False)
+
+    @property
+    def initiative(self) -> int:
+        return -self.sort_key[0]
+
+class CombatEncounter:
+    """
+    The fight in progress, holding direct references to its participants.
+
+    Turn order is an initiative heap for the current round: the next actor is
+    popped in O(log n), and a character who joins mid-round is pushed into it
+    if their initiative comes after the current actor. Removing a participant
+    (defeat or flight) is O(1); their heap entry is skipped when reached.
+
+    Every participant fights for a side. Anyone on another side is an enemy,
+    so a raid can pit bandits against the town guard with the player on the
+    guard's side. By default the player is on PLAYER_SIDE, hostile NPCs on
+    HOSTILE_SIDE and anyone else with the player. Participant counts are kept
+    per side, so checking for victory does not scan the participants.
+
+    to_dict()/from_dict() use the {"participants", "turn_index",
+    "round_count"} shape that combat_state had as a plain dict, plus a
+    "sides" map of name -> side; saves without it get the default sides.
+    """
+
+    def __init__(self, player: Character, round_count: int = 1):
+        self.player = player
+        self.round_count = round_count
+        self.current: Optional[InitiativeEntry] = None
+        self._entries: Dict[int, InitiativeEntry] = {}
+        self._queue: List[InitiativeEntry] = []
+        self._sequence = itertools.count()
+        self._side_counts: Counter = Counter()
+        # The NPCs' plans for round planned_round, keyed by id(character) like the entries.
+        self.plans: Dict[int, 'TacticalAction'] = {}
+        self.planned_round: Optional[int] = None
+
+    def __contains__(self, character: object) -> bool:
+        return id(character) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def includes_name(self, name: str) -> bool:
+        return any(entry.character.name == name for entry in self._entries.values())
+
+    @property
+    def living_opponents(self) -> int:
+        """Participants still fighting against the player's side."""
+        return len(self._entries) - self._side_counts[self.side_of(self.player) or PLAYER_SIDE]
+
+    @property
+    def sides(self) -> List[str]:
+        return [side for side, count in self._side_counts.items() if count > 0]
+
+    def side_of(self, character: Character) -> Optional[str]:
+        entry = self._entries.get(id(character))
+        return entry.side if entry else None
+
+    def enemies_of(self, character: Character) -> List[Character]:
+        """Participants on any other side than `character`."""
+        side = self.side_of(character)
+        return [entry.character for entry in self._entries.values() if entry.side != side]
+
+    def default_side(self, character: Character) -> str:
+        if character is self.player or not character.is_hostile:
+            return PLAYER_SIDE
+        return HOSTILE_SIDE
+
+    @property
+    def current_actor(self) -> Optional[Character]:
+        return self.current.character if self.current else None
+
+    @property
+    def participants(self) -> List[Character]:
+        """Participants in initiative order."""
+        return [entry.character for entry in sorted(self._entries.values())]
+
+    def add(self, character: Character, initiative: int, side: Optional[str] = None):
+        if character in self:
+            return
+        entry = InitiativeEntry(sort_key=(-initiative, next(self._sequence)), character=character, side=side or self.default_side(character))
+        self._entries[id(character)] = entry
+        self._side_counts[entry.side] += 1
+        if self.current is not None and self.current < entry:
+            # Still to act this round.
+            heapq.heappush(self._queue, entry)
+
+    def remove(self, character: Character) -> bool:
+        entry = self._entries.pop(id(character), None)
+        if entry is None:
+            logging.warning(f"Tried to remove combat participant '{character.name}' who was already removed.")
+            return False
+        entry.removed = True
+        self._side_counts[entry.side] -= 1
+        return True
+
+    def start(self, first_actor: Optional[Character] = None):
+        """Begins round one. A character who opens the fight (the player, by attacking) has already used their turn."""
+        self.current = self._entries.get(id(first_actor)) if first_actor is not None else None
+        self._queue = [entry for entry in self._entries.values() if entry is not self.current]
+        heapq.heapify(self._queue)
+
+    def advance(self) -> Tuple[Optional[Character], bool]:
+        """Moves to the next living participant. Returns them, and whether a new round started."""
+        new_round = False
+        while True:
+            if not self._queue:
+                if not self._entries or new_round:
+                    self.current = None
+                    return None, new_round
+                self.round_count += 1
+                new_round = True
+                self._queue = list(self._entries.values())
+                heapq.heapify(self._queue)
+            entry = heapq.heappop(self._queue)
+            if entry.removed:
+                continue
+            if entry.character.hp <= 0:
+                self.remove(entry.character)
+                continue
+            self.current = entry
+            return entry.character, new_round
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self._entries.values())
+        turn_index = ordered.index(self.current) if self.current in ordered else len(ordered)
+        return {
+            "participants": [entry.character.name for entry in ordered],
+            "turn_index": turn_index,
+            "round_count": self.round_count,
+            "sides": {entry.character.name: entry.side for entry in ordered},
+        }
+
+    @classmethod
+    def from_dict(cls, combat_data: Dict[str, Any], player: Character, resolve: Callable[[str], Optional[Character]]) -> "CombatEncounter":
+        """Rebuilds an encounter from its saved shape. Names are resolved to characters with `resolve`."""
+        encounter = cls(player=player, round_count=combat_data.get("round_count", 1))
+        names = combat_data.get("participants", [])
+        sides = combat_data.get("sides", {})
+        # Only the order was saved, so initiative is rebuilt from each participant's position.
+        for position, name in enumerate(names):
+            character = player if name == player.name else resolve(name)
+            if character is None:
+                logging.warning(f"Combat participant '{name}' could not be found; leaving them out of the fight.")
+                continue
+            encounter.add(character, len(names) - position, side=sides.get(name))
+
+        turn_index = combat_data.get("turn_index", 0)
+        ordered = sorted(encounter._entries.values())
+        remaining = [entry for entry in ordered if names.index(entry.character.name) > turn_index]
+        current = next((entry for entry in ordered if names.index(entry.character.name) == turn_index), None)
+        encounter.current = current
+        encounter._queue = remaining
+        heapq.heapify(encounter._queue)
+        return encounter
@@ -0,0 +1,89 @@
+from typing import List, Optional, Tuple
+
+from config import COMBAT_LOG_MAX_LINES
+
+class CombatLog:
+    """
+    What happened during one stretch of combat, rendered for narration.
+
+    Lines about the player (their attacks, attacks on them) and notes such as
+    round headers are always shown. When a big fight produces more lines than
+    max_lines, the remaining NPC-versus-NPC exchanges are folded into a few
+    summary lines (hits, damage, who fell, fled or joined), so the text handed
+    to narration stays the same size however many combatants there are.
+    """
+
+    def __init__(self, max_lines: int = COMBAT_LOG_MAX_LINES):
+        self.max_lines = max_lines
+        # (text, always shown, from an NPC's turn)
+        self._lines: List[Tuple[str, bool, bool]] = []
+        self.attacks = 0
+        self.hits = 0
+        self.damage = 0
+        self._folded_attacks = 0
+        self._folded_hits = 0
+        self._folded_damage = 0
+        self.defeated: List[str] = []
+        self.fled: List[str] = []
+        self.joined: List[str] = []
+        self.healed: List[str] = []
+        self.waited: List[str] = []
+
+    def note(self, text: Optional[str]):
+        if text:
+            self._lines.append((text, True, False))
+
+    def attack(self, text: str, hit: bool, damage: int, defeated: Optional[str] = None, involves_player: bool = False, by_npc: bool = True):
+        self.attacks += 1
+        self.hits += hit
+        self.damage += damage
+        if defeated:
+            self.defeated.append(defeated)
+        self._lines.append((text, involves_player, by_npc))
+        if not involves_player:
+            self._folded_attacks += 1
+            self._folded_hits += hit
+            self._folded_damage += damage
+
+    def event(self, kind: str, names: List[str], text: str, involves_player: bool = False):
+        """A non-attack action by an NPC: kind is "fled", "joined", "healed" or "waited"."""
+        getattr(self, kind).extend(names)
+        self._lines.append((text, involves_player, True))
+
+    def npc_lines(self) -> List[str]:
+        """What the NPCs did on their turns, for flavor text. Folded like render() past max_lines."""
+        lines = [(text, always) for text, always, by_npc in self._lines if by_npc]
+        if len(lines) <= self.max_lines:
+            return [text for text, _ in lines]
+        # NPC-versus-NPC exchanges fold into the summary; the latest attacks on the player are kept.
+        summary = self._summary_lines()
+        room = max(0, self.max_lines - len(summary))
+        kept = [text for text, always in lines if always]
+        return (kept[max(0, len(kept) - room):] if room else []) + summary
+
+    def render(self) -> str:
+        if len(self._lines) <= self.max_lines:
+            return "\n".join(text for text, _, _ in self._lines)
+
+        summary = self._summary_lines()
+        kept = [text for text, always, _ in self._lines if always]
+        room = max(1, self.max_lines - len(summary))
+        if len(kept) > room:
+            # Keep the start (how the exchange opened) and the end (what happens next).
+            head = kept[:room // 2]
+            tail_count = room - len(head) - 1
+            tail = kept[-tail_count:] if tail_count > 0 else []
+            kept = head + [f"... ({len(kept) - len(head) - len(tail)} more exchanges) ..."] + tail
+        return "\n".join(kept[:-1] + summary + kept[-1:]) if kept else "\n".join(summary)
+
+    def _summary_lines(self) -> List[str]:
+        lines = []
+        if self._folded_attacks:
+            misses = self._folded_attacks - self._folded_hits
+            lines.append(f"Across the melee, {self._folded_hits} blows land for {self._folded_damage} damage in total and {misses} miss.")
+        for label, names in (("Fallen", self.defeated), ("Fled", self.fled), ("Joined the fight", self.joined), ("Healed", self.healed), ("Hesitated", self.waited)):
+            if names:
+                shown = ", ".join(names[:5])
+                more = f" and {len(names) - 5} more" if len(names) > 5 else ""
+                lines.append(f"{label}: {shown}{more}.")
+        return lines
@@ -0,0 +1,174 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from definitions.entities import Character, Item
+
+if TYPE_CHECKING:
+    from combat_encounter import CombatEncounter
+    from game_state import GameState, GameWorld
+
+# Health fraction under which an NPC starts to consider healing or fleeing.
+WOUNDED_THRESHOLD = 0.35
+# Health fraction under which an NPC with a healing item considers using it.
+HEAL_THRESHOLD = WOUNDED_THRESHOLD * 1.5
+# How many allies one call for help can bring into the fight.
+MAX_REINFORCEMENTS = 2
+
+BRAVE_TAGS = frozenset({"brave", "fearless", "loyal", "dutiful", "berserker"})
+COWARD_TAGS = frozenset({"coward", "cowardly", "timid", "nervous"})
+AGGRESSIVE_TAGS = frozenset({"aggressive", "cruel", "bloodthirsty", "berserker"})
+LEADER_TAGS = frozenset({"leader", "commander", "captain"})
+
+def attack_score(tags: Set[str], reputation: int) -> float:
+    # A faction that likes the player fights half-heartedly; one that hates them fights harder.
+    return 0.5 + (0.2 if AGGRESSIVE_TAGS & tags else 0.0) - max(-0.2, min(0.2, reputation / 100))
+
+def heal_score(health):
+    """For a health fraction, or a NumPy array of them (see simulation.combat_simulator)."""
+    return 1.0 - health
+
+def flee_score(health, tags: Set[str], outnumbered: bool, reputation: int):
+    """For a health fraction, or a NumPy array of them. A faction that likes the player gives up sooner."""
+    score = (1.0 - health) * (1.3 if COWARD_TAGS & tags else 0.8)
+    return score + (0.15 if outnumbered else 0.0) + max(0.0, min(0.2, reputation / 100))
+
+@dataclass
+class TacticalAction:
+    action: str  # "attack", "flee", "heal", "call_for_help" or "wait"
+    target: Optional[Character] = None
+    item: Optional[Item] = None
+    destination_id: Optional[str] = None
+    allies: Tuple[Character, ...] = ()
+    score: float = 0.0
+
+class CombatTactics:
+    """
+    Chooses what each NPC in a fight does this round, with utility scores
+    instead of a model call. An NPC weighs attacking (and whom), drinking a
+    healing item, fleeing through an exit and calling same-faction allies
+    from the room or next door, based on its health, personality tags, its
+    faction and the player's reputation with that faction.
+
+    NPCs fight whoever is on another side of the encounter. plan_round()
+    looks at the location once, picks targets once per side and scores every
+    NPC of the round in a single pass, so planning stays linear in the number
+    of participants. The combat loop then carries out each plan on that NPC's
+    turn (re-targeting if its target has already fallen).
+    """
+
+    def __init__(self):
+        # Per side, this round's enemies from most to least threatening, for re-targeting.
+        self._fallbacks: Dict[Optional[str], Deque[Character]] = {}
+
+    def plan_round(self, encounter: 'CombatEncounter', game_state: 'GameState', world: 'GameWorld') -> Dict[int, TacticalAction]:
+        self._fallbacks = {}
+        location = game_state.get_current_location(world)
+        participants = encounter.participants
+        npcs = [p for p in participants if p is not game_state.player]
+        side_counts: Dict[Optional[str], int] = {}
+        for p in participants:
+            side = encounter.side_of(p)
+            side_counts[side] = side_counts.get(side, 0) + 1
+        # (enemies, target picked for aggressive / other NPCs) per side, built the first time the side is planned.
+        targets_by_side: Dict[Optional[str], Tuple[List[Character], Dict[bool, Optional[Character]]]] = {}
+
+        exits: List[str] = []
+        bystanders_by_faction: Dict[str, List[Character]] = {}
+        if location:
+            exits = [loc_id for loc_id in location.exits.values() if world.get_location(loc_id)]
+            for char in location.characters:
+                if char not in encounter and char.faction and char.hp > 0:
+                    bystanders_by_faction.setdefault(char.faction, []).append(char)
+            for loc_id in exits:
+                neighbour = world.get_location(loc_id)
+                for char in neighbour.characters if neighbour else ():
+                    if char.faction and char.hp > 0:
+                        bystanders_by_faction.setdefault(char.faction, []).append(char)
+
+        plans: Dict[int, TacticalAction] = {}
+        for npc in npcs:
+            side = encounter.side_of(npc)
+            if side not in targets_by_side:
+                targets_by_side[side] = ([p for p in participants if encounter.side_of(p) != side], {})
+            enemies, picks = targets_by_side[side]
+            aggressive = bool(AGGRESSIVE_TAGS.intersection(npc.personality_tags))
+            if aggressive not in picks:
+                picks[aggressive] = self.choose_target(npc, enemies)
+            allies = side_counts[side]
+            plan = self._choose(npc, game_state, picks[aggressive], allies, len(participants) - allies, exits, bystanders_by_faction)
+            if plan.action == "call_for_help":
+                # Each ally answers one call.
+                called = {id(ally) for ally in plan.allies}
+                bystanders_by_faction[npc.faction] = [c for c in bystanders_by_faction[npc.faction] if id(c) not in called]
+            plans[id(npc)] = plan
+        logging.info(f"Planned round {encounter.round_count} for {len(plans)} NPCs.")
+        return plans
+
+    def choose_target(self, npc: Character, enemies: List[Character]) -> Optional[Character]:
+        living = [e for e in enemies if e.hp > 0]
+        if not living:
+            return None
+        if AGGRESSIVE_TAGS.intersection(npc.personality_tags):
+            # Go for the kill.
+            return min(living, key=lambda e: e.hp)
+        # Otherwise, the most threatening foe.
+        return max(living, key=self._threat)
+
+    def fallback_target(self, encounter: 'CombatEncounter', npc: Character) -> Optional[Character]:
+        """The next enemy for an NPC whose target has fallen or fled, in amortized O(1) per call."""
+        side = encounter.side_of(npc)
+        queue = self._fallbacks.get(side)
+        for attempt in range(2):
+            if queue is None or (attempt and not queue):
+                # Built on first use, and rebuilt once if it runs dry (someone may have joined since).
+                queue = deque(sorted(encounter.enemies_of(npc), key=self._threat, reverse=True))
+                self._fallbacks[side] = queue
+            while queue and (queue[0].hp <= 0 or queue[0] not in encounter):
+                queue.popleft()
+            if queue:
+                return queue[0]
+        return None
+
+    @staticmethod
+    def _threat(enemy: Character) -> int:
+        return enemy.get_total_attack_bonus() + (enemy.stats.get("strength", 10) - 10) // 2
+
+    def _choose(self, npc: Character, game_state: 'GameState', target: Optional[Character], side_size: int, enemy_count: int,
+                exits: List[str], bystanders_by_faction: Dict[str, List[Character]]) -> TacticalAction:
+        tags = set(npc.personality_tags)
+        health = npc.hp / npc.max_hp if npc.max_hp else 0.0
+        brave = bool(BRAVE_TAGS & tags)
+        reputation = game_state.reputation.get(npc.faction, 0) if npc.faction else 0
+
+        options: List[TacticalAction] = []
+
+        if target:
+            options.append(TacticalAction("attack", target=target, score=attack_score(tags, reputation)))
+
+        if health < HEAL_THRESHOLD:
+            potion = self._find_healing_item(npc)
+            if potion:
+                options.append(TacticalAction("heal", item=potion, score=heal_score(health)))
+
+        if exits and health < WOUNDED_THRESHOLD and not brave:
+            score = flee_score(health, tags, side_size < enemy_count, reputation)
+            options.append(TacticalAction("flee", destination_id=exits[0], score=score))
+
+        allies = bystanders_by_faction.get(npc.faction, []) if npc.faction else []
+        if allies and (health < 0.6 or LEADER_TAGS & tags):
+            called = tuple(allies[:MAX_REINFORCEMENTS])
+            help_score = 0.6 + (0.2 if LEADER_TAGS & tags else 0.0) + (0.1 if side_size < enemy_count else 0.0)
+            options.append(TacticalAction("call_for_help", allies=called, score=help_score))
+
+        if not options:
+            return TacticalAction("wait")
+        return max(options, key=lambda option: option.score)
+
+    @staticmethod
+    def _find_healing_item(npc: Character) -> Optional[Item]:
+        for item, _ in npc.inventory.stacks():
+            if item.use_effect.get("op") == "heal" and item.use_effect.get("amount", 0) > 0:
+                return item
+        return None
@@ -22,4 +22,82 @@ OLLAMA_MODEL = "llama3:8b"
 
 # The number of seconds to wait for a response from the Ollama API before giving up.
 # We are keeping the longer timeout as it's a good general robustness improvement.
-OLLAMA_TIMEOUT = 45
\ No newline at end of file
+OLLAMA_TIMEOUT = 45
+
+# --- Save Configuration ---
+# Saves after the first one only append the locations that changed to a journal
+# next to the save file. Once the journal holds this many entries the save is
+# compacted back into a single full snapshot.
+SAVE_JOURNAL_COMPACTION_THRESHOLD = 25
+
+# --- Autosave Configuration ---
+# The autosave snapshot is taken at the end of every Nth turn and written on a
+# background thread, so the player never waits on disk I/O.
+AUTOSAVE_ENABLED = True
+AUTOSAVE_SLOT = "autosave"
+AUTOSAVE_INTERVAL_TURNS = 5
+# How many previous autosaves to keep as <slot>.json.bak1 ... .bakN
+AUTOSAVE_BACKUPS = 3
+
+# --- Save Backend ---
+# "json" keeps one JSON snapshot (+ journal) per slot. "sqlite" stores every
+# slot in saves/saves.db and loads locations on demand.
+SAVE_BACKEND = "json"
+
+# Encoding for JSON-backend snapshots: "json" (plain), "zlib" or "lzma".
+# Older saves are detected by their header and load regardless of this setting.
+SAVE_CODEC = "zlib"
+
+# --- Turn Journal ---
+# Every turn (input, intent, RNG seed, result, changes and raw AI responses) is
+# appended to a per-session journal. After a crash the session is rebuilt by
+# replaying it without calling the model.
+TURN_JOURNAL_ENABLED = True
+TURN_JOURNAL_DIR = "saves/turn_journal"
+TURN_JOURNAL_KEEP_SESSIONS = 5
+
+# --- AI Cassette ---
+# "passthrough" calls the model as usual. "record" also stores every response in
+# the cassette, keyed by a hash of the prompt. "replay" serves responses from the
+# cassette without calling the model, after AI_CASSETTE_LATENCY seconds, and
+# writes prompts it could not match to <cassette>.unmatched.json on exit.
+AI_CASSETTE_MODE = "passthrough"
+AI_CASSETTE_PATH = "cassettes/session.json"
+AI_CASSETTE_LATENCY = 0.0
+
+# --- Undo ---
+# How many turns 'undo [n]' can rewind. Set to 0 to disable the undo history.
+UNDO_HISTORY_TURNS = 10
+
+# --- Combat ---
+# NPC combat actions are chosen by local tactics rules. When enabled, one extra
+# model call per round turns the NPCs' actions into a line of flavour text.
+COMBAT_FLAVOR_TEXT_ENABLED = False
+
+# Longest combat report handed to narration. Past this, NPC-versus-NPC
+# exchanges are summarized; lines involving the player are always kept.
+COMBAT_LOG_MAX_LINES = 12
+
+# --- Quest Offers ---
+# When the player enters a location, offers from its quest givers (NPCs with
+# available_quest_ids or a quest-giver tag) are generated and validated in the
+# background, so asking for work and accepting it need no model round trip.
+QUEST_OFFER_PREFETCH = True
+QUEST_OFFER_WORKERS = 1
+
+# --- NPC Simulation ---
+# NPCs within this many exits of the player are simulated hour by hour. Farther
+# NPCs only wake for their scheduled moves and are caught up in one step when
+# the player comes near.
+NPC_SIM_RADIUS = 1
+# Hit points an injured NPC recovers per in-game hour.
+NPC_REGEN_HP_PER_HOUR = 2
+
+# --- Weather ---
+# Weather is simulated locally, per region of locations within this many exits
+# of each other, and handed to the AI as context; it costs no model calls.
+WEATHER_REGION_RADIUS = 2
+# Game hours of computed weather kept in memory.
+WEATHER_CACHE_HOURS = 48
+# Fixed seed for the weather of new games; None draws a new one for each game.
+WEATHER_SEED = None
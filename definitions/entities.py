@@ -1,7 +1,15 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+import logging
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
-@dataclass
+from definitions.shared_values import EMPTY_DICT, EMPTY_TUPLE, freeze_dict, intern_optional, intern_tuple
+from definitions.item_templates import TEMPLATE_FIELDS, item_templates
+from definitions.inventory import Inventory
+
+def _freeze_for_key(values: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, repr(v)) for k, v in values.items()))
+
+@dataclass(slots=True)
 class Item:
     name: str
     description: str
@@ -9,41 +17,114 @@ class Item:
     value: int = 0
     
     equipment_slot: Optional[str] = None
-    stat_bonuses: Dict[str, int] = field(default_factory=dict)
+    stat_bonuses: Dict[str, int] = EMPTY_DICT
 
-    use_effect: Dict[str, Any] = field(default_factory=dict)
+    use_effect: Dict[str, Any] = EMPTY_DICT
     damage_dice: Optional[str] = None
     damage_type: Optional[str] = None
     unlocks_id: Optional[str] = None
     owner: Optional[str] = None
+    template_id: Optional[str] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def __post_init__(self):
+        # Items are read-only after creation apart from their owner, so the
+        # small repeated strings are interned and the dicts frozen (and shared
+        # when empty) instead of every dropped item carrying its own copies.
+        self.name = intern_optional(self.name)
+        self.category = intern_optional(self.category)
+        self.equipment_slot = intern_optional(self.equipment_slot)
+        self.damage_dice = intern_optional(self.damage_dice)
+        self.damage_type = intern_optional(self.damage_type)
+        self.unlocks_id = intern_optional(self.unlocks_id)
+        self.owner = intern_optional(self.owner)
+        self.template_id = intern_optional(self.template_id)
+        self.stat_bonuses = freeze_dict(self.stat_bonuses)
+        self.use_effect = freeze_dict(self.use_effect)
+
+    @classmethod
+    def from_template(cls, template_id: str, **overrides: Any) -> "Item":
+        template = item_templates.get(template_id)
+        if not template:
+            raise KeyError(f"Unknown item template '{template_id}'")
+        values = template.field_values()
+        values.update(overrides)
+        return cls(template_id=template_id, **values)
+
+    @classmethod
+    def from_dict(cls, item_data: Dict[str, Any]) -> "Item":
+        """Builds an Item from either the compact template form or the legacy inline form."""
+        template_id = item_data.get("template_id")
+        if template_id and item_templates.get(template_id):
+            overrides = {k: v for k, v in item_data.items() if k != "template_id"}
+            return cls.from_template(template_id, **overrides)
+        if template_id:
+            # The compact form only stores overrides, so fill in what the missing template would have.
+            logging.warning(f"Unknown item template '{template_id}'; building the item from its saved fields.")
+        known = {f.name for f in fields(cls)}
+        unknown = item_data.keys() - known
+        if unknown:
+            logging.warning(f"Ignoring unknown item fields {sorted(unknown)} in {item_data}.")
+        values = {k: v for k, v in item_data.items() if k in known}
+        values.setdefault("name", template_id.replace("_", " ") if template_id else "unknown item")
+        values.setdefault("description", "")
+        return cls(**values)
+
+    def stack_key(self) -> Tuple[Any, ...]:
+        """Identity used to stack items in an Inventory: two items stack when every field matches."""
+        return (
+            self.template_id, self.name, self.description, self.category, self.value,
+            self.equipment_slot, _freeze_for_key(self.stat_bonuses), _freeze_for_key(self.use_effect),
+            self.damage_dice, self.damage_type, self.unlocks_id, self.owner,
+        )
+
+    def get_overrides(self) -> Dict[str, Any]:
+        """Returns the fields that differ from this item's template (all fields if it has none)."""
+        template = item_templates.get(self.template_id) if self.template_id else None
+        if not template:
+            return self.to_dict()
+
+        overrides = {}
+        for name in TEMPLATE_FIELDS:
+            value = getattr(self, name)
+            if value != getattr(template, name):
+                overrides[name] = dict(value) if isinstance(value, dict) else value
+        if self.owner is not None:
+            overrides["owner"] = self.owner
+        return overrides
+
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
+        if compact and self.template_id and item_templates.get(self.template_id):
+            return {"template_id": self.template_id, **self.get_overrides()}
+
+        item_dict = {
             "name": self.name,
             "description": self.description,
             "category": self.category,
             "value": self.value,
             "equipment_slot": self.equipment_slot,
-            "stat_bonuses": self.stat_bonuses,
-            "use_effect": self.use_effect,
+            "stat_bonuses": dict(self.stat_bonuses),
+            "use_effect": dict(self.use_effect),
             "damage_dice": self.damage_dice,
             "damage_type": self.damage_type,
             "unlocks_id": self.unlocks_id,
             "owner": self.owner,
         }
+        if self.template_id:
+            item_dict["template_id"] = self.template_id
+        return item_dict
 
-@dataclass
+@dataclass(slots=True)
 class Character:
     name: str
     description: str
     stats: Dict[str, int]
-    inventory: List[Item] = field(default_factory=list)
+    inventory: Inventory = field(default_factory=Inventory)
     equipment: Dict[str, Optional[Item]] = field(default_factory=dict)
     
     mood: str = "neutral"
     memory: List[str] = field(default_factory=list)
-    personality_tags: List[str] = field(default_factory=list)
-    available_quest_ids: List[str] = field(default_factory=list)
+    personality_tags: Sequence[str] = EMPTY_TUPLE
+    available_quest_ids: Sequence[str] = EMPTY_TUPLE
     hp: int = 20
     max_hp: int = 20
     status_effects: List[str] = field(default_factory=list)
@@ -60,6 +141,46 @@ class Character:
     faction: Optional[str] = None
     schedule: Optional[Dict[str, str]] = None
     is_hidden: bool = False
+    version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.inventory, Inventory):
+            self.inventory = Inventory(self.inventory)
+        self.mood = intern_optional(self.mood)
+        self.faction = intern_optional(self.faction)
+        self.personality_tags = intern_tuple(self.personality_tags)
+        self.available_quest_ids = intern_tuple(self.available_quest_ids)
+
+    @classmethod
+    def from_dict(cls, char_data: Dict[str, Any]) -> "Character":
+        # Default HP to max_hp for backward compatibility with old saves
+        max_hp = char_data.get('max_hp', 20)
+        hp = char_data.get('hp', max_hp)
+
+        return cls(
+            name=char_data['name'],
+            description=char_data['description'],
+            stats=char_data['stats'],
+            inventory=[Item.from_dict(item) for item in char_data.get('inventory', [])],
+            equipment={slot: Item.from_dict(item) for slot, item in char_data.get('equipment', {}).items() if item},
+            mood=char_data.get('mood', 'neutral'),
+            memory=list(char_data.get('memory', [])),
+            personality_tags=char_data.get('personality_tags', []),
+            available_quest_ids=char_data.get('available_quest_ids', []),
+            hp=hp,
+            max_hp=max_hp,
+            status_effects=list(char_data.get('status_effects', [])),
+            level=char_data.get('level', 1),
+            xp=char_data.get('xp', 0),
+            xp_to_next_level=char_data.get('xp_to_next_level', 100),
+            money=char_data.get('money', 10),
+            base_armor_class=char_data.get('base_armor_class', 10),
+            base_attack_bonus=char_data.get('base_attack_bonus', 0),
+            is_hostile=char_data.get('is_hostile', False),
+            faction=char_data.get('faction'),
+            schedule=char_data.get('schedule'),
+            is_hidden=char_data.get('is_hidden', False),
+        )
 
     def get_total_armor_class(self) -> int:
         ac_bonus = 0
@@ -82,22 +203,22 @@ class Character:
         return "1d4" 
 
     def add_item_to_inventory(self, item: Item):
-        self.inventory.append(item)
+        self.inventory.add(item)
 
     def remove_item_from_inventory(self, item: Item):
         self.inventory.remove(item)
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
         return {
             "name": self.name,
             "description": self.description,
             "stats": self.stats,
-            "inventory": [item.to_dict() for item in self.inventory],
-            "equipment": {slot: item.to_dict() for slot, item in self.equipment.items() if item},
+            "inventory": [item.to_dict(compact) for item in self.inventory],
+            "equipment": {slot: item.to_dict(compact) for slot, item in self.equipment.items() if item},
             "mood": self.mood,
             "memory": self.memory,
-            "personality_tags": self.personality_tags,
-            "available_quest_ids": self.available_quest_ids,
+            "personality_tags": list(self.personality_tags),
+            "available_quest_ids": list(self.available_quest_ids),
             "hp": self.hp,
             "max_hp": self.max_hp,
             "status_effects": self.status_effects,
@@ -0,0 +1,82 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from definitions.shared_values import EMPTY_DICT, freeze_dict, intern_optional
+
+@dataclass(slots=True, frozen=True)
+class Faction:
+    id: str
+    name: str
+    # Reputation change for each player intent aimed at a member, e.g. {"attack": -50}.
+    intent_effects: Dict[str, int] = EMPTY_DICT
+    # Share of a change with this faction passed on to others: 0.5 for allies, -0.5 for rivals.
+    relations: Dict[str, float] = EMPTY_DICT
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Faction":
+        return cls(
+            id=intern_optional(data["id"]),
+            name=data.get("name", data["id"].replace("_", " ").title()),
+            intent_effects=freeze_dict(data.get("intent_effects")),
+            relations=freeze_dict(data.get("relations")),
+        )
+
+class FactionRegistry:
+    """
+    The factions loaded from data/factions, and the affinity matrix between them.
+
+    affinity[i, j] is how much of a reputation change with faction i also
+    applies to faction j (the diagonal is 1), so one row spreads an action to
+    every allied and rival faction at once. Relations are one-directional as
+    written in the data.
+    """
+
+    def __init__(self, factions_dir: str = "data/factions"):
+        self.factions_path = Path(factions_dir)
+        self.factions: Dict[str, Faction] = {}
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.affinity = np.eye(0)
+
+    def load(self, factions_dir: Optional[str] = None):
+        if factions_dir is not None:
+            self.factions_path = Path(factions_dir)
+
+        if not self.factions_path.is_dir():
+            logging.warning(f"Faction directory '{self.factions_path}' does not exist. No factions loaded.")
+        else:
+            for faction_file in sorted(self.factions_path.glob("*.json")):
+                try:
+                    with open(faction_file, 'r') as f:
+                        entries = json.load(f)
+                    for entry in entries:
+                        self.register(Faction.from_dict(entry))
+                except (IOError, json.JSONDecodeError, KeyError, TypeError) as e:
+                    logging.error(f"Failed to load factions from '{faction_file.name}'. Error: {e}")
+
+        self.build_matrix()
+        logging.info(f"Loaded {len(self.factions)} factions from '{self.factions_path}'.")
+
+    def register(self, faction: Faction):
+        self.factions[faction.id] = faction
+
+    def build_matrix(self):
+        self.ids = list(self.factions)
+        self.index = {faction_id: i for i, faction_id in enumerate(self.ids)}
+        self.affinity = np.eye(len(self.ids))
+        for faction in self.factions.values():
+            row = self.index[faction.id]
+            for other_id, share in faction.relations.items():
+                column = self.index.get(other_id)
+                if column is None:
+                    logging.warning(f"Faction '{faction.id}' has a relation with unknown faction '{other_id}'.")
+                elif column != row:
+                    self.affinity[row, column] = share
+
+    def get(self, faction_id: str) -> Optional[Faction]:
+        return self.factions.get(faction_id)
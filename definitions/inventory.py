@@ -0,0 +1,121 @@
+import dataclasses
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from definitions.entities import Item
+
+StackKey = Tuple[Any, ...]
+
+class Inventory:
+    """
+    A character's carried items, grouped into quantity stacks.
+
+    Identical items (same stack_key) share one stack holding a representative
+    Item and a count, lookups by exact name go through a name index, and the
+    total value is kept up to date as items come and go.
+
+    Iterating an Inventory yields one Item per unit carried, in the order the
+    stacks were first added, so code written against the old plain list keeps
+    working unchanged.
+    """
+
+    __slots__ = ("_stacks", "_name_index", "_total_value", "_count")
+
+    def __init__(self, items: Optional[Iterable['Item']] = None):
+        self._stacks: Dict[StackKey, List[Any]] = {}
+        self._name_index: Dict[str, List[StackKey]] = {}
+        self._total_value = 0
+        self._count = 0
+        if items:
+            for item in items:
+                self.add(item)
+
+    def add(self, item: 'Item', quantity: int = 1):
+        key = item.stack_key()
+        stack = self._stacks.get(key)
+        if stack:
+            stack[1] += quantity
+        else:
+            self._stacks[key] = [item, quantity]
+            self._name_index.setdefault(item.name.lower(), []).append(key)
+        self._total_value += item.value * quantity
+        self._count += quantity
+
+    def remove(self, item: 'Item', quantity: int = 1):
+        """Removes ``quantity`` units of ``item``. Raises ValueError if they are not carried, like list.remove."""
+        key = self._find_stack_key(item)
+        if key is None or self._stacks[key][1] < quantity:
+            raise ValueError(f"Inventory does not contain {quantity} x '{item.name}'")
+
+        stack = self._stacks[key]
+        stack[1] -= quantity
+        self._total_value -= stack[0].value * quantity
+        self._count -= quantity
+
+        if stack[1] == 0:
+            del self._stacks[key]
+            name_keys = self._name_index[stack[0].name.lower()]
+            name_keys.remove(key)
+            if not name_keys:
+                del self._name_index[stack[0].name.lower()]
+        elif stack[0] is item:
+            # The caller now owns this object (equipped, dropped, given away),
+            # so the stack keeps an independent copy for the remaining units.
+            stack[0] = dataclasses.replace(item)
+
+    def _find_stack_key(self, item: 'Item') -> Optional[StackKey]:
+        key = item.stack_key()
+        if key in self._stacks:
+            return key
+        # The item may have been modified since it was stacked.
+        for stack_key, (stacked_item, _) in self._stacks.items():
+            if stacked_item is item:
+                return stack_key
+        return None
+
+    def find(self, name: str) -> Optional['Item']:
+        """Finds a carried item by exact name, falling back to a substring match like the old list scan."""
+        name_lower = name.lower()
+        keys = self._name_index.get(name_lower)
+        if keys:
+            return self._stacks[keys[0]][0]
+        for item, _ in self._stacks.values():
+            if name_lower in item.name.lower():
+                return item
+        return None
+
+    def quantity_of(self, item: 'Item') -> int:
+        key = self._find_stack_key(item)
+        return self._stacks[key][1] if key is not None else 0
+
+    def stacks(self) -> Iterator[Tuple['Item', int]]:
+        for item, quantity in self._stacks.values():
+            yield item, quantity
+
+    @property
+    def total_value(self) -> int:
+        return self._total_value
+
+    def __iter__(self) -> Iterator['Item']:
+        for item, quantity in list(self._stacks.values()):
+            for _ in range(quantity):
+                yield item
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __contains__(self, item: object) -> bool:
+        return hasattr(item, "stack_key") and self._find_stack_key(item) is not None  # type: ignore[arg-type]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Inventory):
+            return list(self.stacks()) == list(other.stacks())
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Inventory({[f'{item.name} x{qty}' for item, qty in self.stacks()]})"
@@ -0,0 +1,102 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from definitions.shared_values import EMPTY_DICT, freeze_dict, intern_optional
+
+# The Item fields that are owned by a template. Anything else on an Item
+# (currently only "owner") is always per-instance state.
+TEMPLATE_FIELDS = (
+    "name",
+    "description",
+    "category",
+    "value",
+    "equipment_slot",
+    "stat_bonuses",
+    "use_effect",
+    "damage_dice",
+    "damage_type",
+    "unlocks_id",
+)
+
+@dataclass(slots=True, frozen=True)
+class ItemTemplate:
+    id: str
+    name: str
+    description: str
+    category: str = "misc"
+    value: int = 0
+    equipment_slot: Optional[str] = None
+    stat_bonuses: Dict[str, int] = EMPTY_DICT
+    use_effect: Dict[str, Any] = EMPTY_DICT
+    damage_dice: Optional[str] = None
+    damage_type: Optional[str] = None
+    unlocks_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ItemTemplate":
+        return cls(
+            id=intern_optional(data["id"]),
+            name=intern_optional(data["name"]),
+            description=intern_optional(data["description"]),
+            category=intern_optional(data.get("category", "misc")),
+            value=data.get("value", 0),
+            equipment_slot=intern_optional(data.get("equipment_slot")),
+            stat_bonuses=freeze_dict(data.get("stat_bonuses")),
+            use_effect=freeze_dict(data.get("use_effect")),
+            damage_dice=intern_optional(data.get("damage_dice")),
+            damage_type=intern_optional(data.get("damage_type")),
+            unlocks_id=intern_optional(data.get("unlocks_id")),
+        )
+
+    def field_values(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in TEMPLATE_FIELDS}
+
+
+class ItemTemplateRegistry:
+    """
+    Holds the shared item definitions loaded from data/items.
+
+    Items created from a template point at the template's (interned, frozen)
+    values instead of holding their own copies, so fifty healing potions share
+    one description string and one use_effect dict. Saves store such items as
+    a template id plus the handful of fields that differ from the template.
+    """
+
+    def __init__(self, templates_dir: str = "data/items"):
+        self.templates_path = Path(templates_dir)
+        self.templates: Dict[str, ItemTemplate] = {}
+        self._loaded = False
+
+    def load(self, templates_dir: Optional[str] = None):
+        if templates_dir is not None:
+            self.templates_path = Path(templates_dir)
+        self._loaded = True
+
+        if not self.templates_path.is_dir():
+            logging.warning(f"Item template directory '{self.templates_path}' does not exist. No templates loaded.")
+            return
+
+        for template_file in sorted(self.templates_path.glob("*.json")):
+            try:
+                with open(template_file, 'r') as f:
+                    entries = json.load(f)
+                for entry in entries:
+                    self.register(ItemTemplate.from_dict(entry))
+            except (IOError, json.JSONDecodeError, KeyError, TypeError) as e:
+                logging.error(f"Failed to load item templates from '{template_file.name}'. Error: {e}")
+
+        logging.info(f"Loaded {len(self.templates)} item templates from '{self.templates_path}'.")
+
+    def register(self, template: ItemTemplate):
+        self.templates[template.id] = template
+
+    def get(self, template_id: str) -> Optional[ItemTemplate]:
+        if not self._loaded:
+            self.load()
+        return self.templates.get(template_id)
+
+
+item_templates = ItemTemplateRegistry()
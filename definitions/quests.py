@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 
-@dataclass
+from definitions.shared_values import EMPTY_DICT, EMPTY_TUPLE, freeze_dict, intern_optional
+
+@dataclass(slots=True)
 class Objective:
     id: str
     description: str
@@ -10,8 +12,13 @@ class Objective:
     required_count: int = 1
     current_count: int = 0
     is_complete: bool = False
-    details: Dict[str, Any] = field(default_factory=dict)
-    
+    details: Dict[str, Any] = EMPTY_DICT
+
+    def __post_init__(self):
+        self.type = intern_optional(self.type)
+        self.target = intern_optional(self.target)
+        self.details = freeze_dict(self.details)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -21,21 +28,47 @@ class Objective:
             "required_count": self.required_count,
             "current_count": self.current_count,
             "is_complete": self.is_complete,
-            "details": self.details,
+            "details": dict(self.details),
         }
         
-@dataclass
+@dataclass(slots=True)
 class Quest:
     id: str
     name: str
     description: str
     status: str = "active" 
-    objectives: List[Objective] = field(default_factory=list)
+    objectives: Sequence[Objective] = EMPTY_TUPLE
     
     # --- NEW FIELDS ---
     required_stat: Optional[str] = None
     required_dc: int = 0
     # --- END NEW FIELDS ---
+    # Quest chains: {"quests": [ids completed], "reputation": {faction: minimum}, "level": n, "items": [names held]}
+    prerequisites: Dict[str, Any] = EMPTY_DICT
+    # World mutations (see event_executor) applied when the quest is accepted or completed.
+    on_accept: Sequence[Dict[str, Any]] = EMPTY_TUPLE
+    on_complete: Sequence[Dict[str, Any]] = EMPTY_TUPLE
+    version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.status = intern_optional(self.status)
+        self.required_stat = intern_optional(self.required_stat)
+        self.prerequisites = freeze_dict(self.prerequisites)
+
+    @classmethod
+    def from_dict(cls, quest_data: Dict[str, Any]) -> "Quest":
+        return cls(
+            id=quest_data['id'],
+            name=quest_data['name'],
+            description=quest_data['description'],
+            status=quest_data.get('status', 'active'),
+            objectives=[Objective(**obj_data) for obj_data in quest_data.get('objectives', [])],
+            required_stat=quest_data.get('required_stat'),
+            required_dc=quest_data.get('required_dc', 0),
+            prerequisites=quest_data.get('prerequisites', {}),
+            on_accept=quest_data.get('on_accept', []),
+            on_complete=quest_data.get('on_complete', []),
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -46,4 +79,7 @@ class Quest:
             "objectives": [obj.to_dict() for obj in self.objectives],
             "required_stat": self.required_stat,
             "required_dc": self.required_dc,
+            "prerequisites": dict(self.prerequisites),
+            "on_accept": list(self.on_accept),
+            "on_complete": list(self.on_complete),
         }
\ No newline at end of file
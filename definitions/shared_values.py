@@ -0,0 +1,64 @@
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class FrozenDict(dict):
+    """A read-only dict used for default and template-backed entity fields.
+
+    Instances can safely be shared between many entities because every mutating
+    method raises. It is still a real ``dict`` subclass, so ``json.dumps`` and
+    ``.get`` lookups behave exactly as they did for the plain dicts it replaces.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any):
+        raise TypeError("FrozenDict is read-only; copy it with dict() before modifying.")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+    __ior__ = _readonly
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(tuple(sorted(self.items())))
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenDict":
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+EMPTY_DICT: FrozenDict = FrozenDict()
+EMPTY_TUPLE: Tuple[Any, ...] = ()
+
+
+def intern_optional(value: Any) -> Any:
+    """Interns ``value`` if it is a string, otherwise returns it unchanged."""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+def freeze_dict(value: Optional[Dict[str, Any]]) -> FrozenDict:
+    """Returns a shared empty FrozenDict for empty input, or a frozen copy otherwise."""
+    if not value:
+        return EMPTY_DICT
+    if isinstance(value, FrozenDict):
+        return value
+    return FrozenDict(value)
+
+
+def intern_tuple(values: Optional[Iterable[Any]]) -> Tuple[Any, ...]:
+    """Converts a list of strings into a tuple of interned strings."""
+    if not values:
+        return EMPTY_TUPLE
+    return tuple(intern_optional(v) for v in values)
@@ -1,16 +1,24 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
 
 from definitions.entities import Character, Item
 from definitions.quests import Quest
+from definitions.shared_values import EMPTY_TUPLE, intern_optional
 
-@dataclass
+ContentVersion = Tuple[Any, ...]
+
+@dataclass(slots=True)
 class Interactable:
     id: str
     name: str
     description: str
     state: Dict[str, Any] = field(default_factory=dict)
-    
+    version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.id = intern_optional(self.id)
+        self.name = intern_optional(self.name)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -19,7 +27,7 @@ class Interactable:
             "state": self.state
         }
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     id: str
     name: str
@@ -28,7 +36,11 @@ class Location:
     items: List[Item] = field(default_factory=list)
     interactables: List[Interactable] = field(default_factory=list)
     exits: Dict[str, str] = field(default_factory=dict)
-    quests: List[Quest] = field(default_factory=list)
+    quests: Sequence[Quest] = EMPTY_TUPLE
+    version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.id = intern_optional(self.id)
 
     def remove_item(self, item: Item):
         self.items.remove(item)
@@ -39,6 +51,35 @@ class Location:
     def remove_character(self, character: Character):
         self.characters.remove(character)
         
+    @classmethod
+    def from_dict(cls, loc_data: Dict[str, Any]) -> "Location":
+        return cls(
+            id=loc_data['id'],
+            name=loc_data['name'],
+            description=loc_data['description'],
+            characters=[Character.from_dict(char) for char in loc_data.get('characters', [])],
+            items=[Item.from_dict(item) for item in loc_data.get('items', [])],
+            interactables=[Interactable(**i) for i in loc_data.get('interactables', [])],
+            exits=dict(loc_data.get('exits', {})),
+            quests=[Quest.from_dict(q) for q in loc_data.get('quests', [])],
+        )
+
+    def content_version(self) -> ContentVersion:
+        """
+        A value that changes whenever this location or anything it holds changes; compare it with ==.
+
+        Each entity is paired with its own version (a sum of versions could not tell "an NPC left and the
+        location was bumped" from "nothing happened"), and the entities themselves are kept rather than
+        their id()s, so a stored value never matches a new object that reuses a freed address.
+        """
+        return (
+            self.version,
+            tuple((c, c.version) for c in self.characters),
+            tuple(self.items),
+            tuple((i, i.version) for i in self.interactables),
+            tuple((q, q.version) for q in self.quests),
+        )
+
     def get_quest_by_id(self, quest_id: str) -> Quest | None:
         """Finds a quest in this location by its ID."""
         for quest in self.quests:
@@ -46,13 +87,13 @@ class Location:
                 return quest
         return None
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
         return {
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "characters": [char.to_dict() for char in self.characters],
-            "items": [item.to_dict() for item in self.items],
+            "characters": [char.to_dict(compact) for char in self.characters],
+            "items": [item.to_dict(compact) for item in self.items],
             "interactables": [i.to_dict() for i in self.interactables],
             "exits": self.exits,
             "quests": [q.to_dict() for q in self.quests]
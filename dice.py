@@ -0,0 +1,195 @@
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Short stat names accepted in dice expressions, e.g. "1d20+dex".
+STAT_ALIASES = {
+    "str": "strength",
+    "dex": "dexterity",
+    "con": "constitution",
+    "int": "intelligence",
+    "wis": "wisdom",
+    "cha": "charisma",
+}
+
+# How many uniform draws a stream pulls from its generator at a time.
+DRAW_BATCH_SIZE = 512
+# Exploding dice stop re-rolling after this many extra dice.
+MAX_EXPLOSIONS = 20
+
+_TERM_RE = re.compile(r"([+-])?(?:(\d*)d(\d+)(!|adv|dis)?|(\d+)|([a-z_]+))")
+
+def stat_modifier(stat_value: int) -> int:
+    return (stat_value - 10) // 2
+
+@dataclass(frozen=True)
+class DiceTerm:
+    sign: int
+    count: int
+    sides: int
+    mode: str = ""  # "", "!" (exploding), "adv" or "dis"
+
+@dataclass(frozen=True)
+class RollResult:
+    total: int
+    rolls: Tuple[int, ...]
+    modifier: int
+
+class DiceExpression:
+    """
+    A parsed dice expression such as "2d6+3", "1d20+dex", "d20adv+str" or
+    "3d6!". Terms are dice (NdM, with an optional ! for exploding dice, or
+    adv/dis to roll each die twice and keep the higher/lower result), integer
+    constants and stat names, which add that stat's modifier.
+    """
+    __slots__ = ("source", "dice", "constant", "stats", "_plain_dice")
+
+    def __init__(self, source: str, dice: Tuple[DiceTerm, ...], constant: int, stats: Tuple[Tuple[int, str], ...]):
+        self.source = source
+        self.dice = dice
+        self.constant = constant
+        self.stats = stats
+        # (sign, sides) per die when no die explodes or rolls twice, so total() can skip the general path.
+        self._plain_dice: Optional[Tuple[Tuple[int, int], ...]] = None
+        if not any(term.mode for term in dice):
+            self._plain_dice = tuple((term.sign, term.sides) for term in dice for _ in range(term.count))
+
+    def modifier(self, stats: Optional[Mapping[str, int]] = None) -> int:
+        total = self.constant
+        for sign, stat_name in self.stats:
+            total += sign * stat_modifier((stats or {}).get(stat_name, 10))
+        return total
+
+    def total(self, stream: "DiceStream", stats: Optional[Mapping[str, int]] = None) -> int:
+        if self._plain_dice is None:
+            return self.roll(stream, stats).total
+        total = self.modifier(stats) if self.stats else self.constant
+        draw = stream.draw
+        for sign, sides in self._plain_dice:
+            total += sign * (int(draw() * sides) + 1)
+        return total
+
+    def roll(self, stream: "DiceStream", stats: Optional[Mapping[str, int]] = None) -> RollResult:
+        rolls: List[int] = []
+        total = 0
+        for term in self.dice:
+            for _ in range(term.count):
+                value = stream.die(term.sides)
+                if term.mode == "adv":
+                    value = max(value, stream.die(term.sides))
+                elif term.mode == "dis":
+                    value = min(value, stream.die(term.sides))
+                elif term.mode == "!":
+                    face = value
+                    explosions = 0
+                    while face == term.sides and term.sides > 1 and explosions < MAX_EXPLOSIONS:
+                        face = stream.die(term.sides)
+                        value += face
+                        explosions += 1
+                rolls.append(value)
+                total += term.sign * value
+        modifier = self.modifier(stats)
+        return RollResult(total=total + modifier, rolls=tuple(rolls), modifier=modifier)
+
+    def __repr__(self) -> str:
+        return f"DiceExpression({self.source!r})"
+
+@lru_cache(maxsize=512)
+def compile_dice(expression: str) -> DiceExpression:
+    """Parses a dice expression once; later calls with the same string return the cached result."""
+    text = expression.replace(" ", "").lower()
+    dice: List[DiceTerm] = []
+    stats: List[Tuple[int, str]] = []
+    constant = 0
+    position = 0
+    while position < len(text):
+        match = _TERM_RE.match(text, position)
+        if not match or match.end() == position or (position > 0 and not match.group(1)):
+            raise ValueError(f"Invalid dice expression '{expression}' at position {position}.")
+        sign = -1 if match.group(1) == "-" else 1
+        count, sides, mode, number, stat_name = match.group(2, 3, 4, 5, 6)
+        if sides is not None:
+            if int(sides) < 1:
+                raise ValueError(f"Invalid dice expression '{expression}': dice need at least one side.")
+            dice.append(DiceTerm(sign=sign, count=int(count) if count else 1, sides=int(sides), mode=mode or ""))
+        elif number is not None:
+            constant += sign * int(number)
+        else:
+            stats.append((sign, STAT_ALIASES.get(stat_name, stat_name)))
+        position = match.end()
+    if not dice and not stats and not text:
+        raise ValueError("Empty dice expression.")
+    return DiceExpression(expression, tuple(dice), constant, tuple(stats))
+
+class DiceStream:
+    """A seeded source of die faces that draws uniform numbers from NumPy in batches."""
+    __slots__ = ("_generator", "_next")
+
+    def __init__(self, seed_sequence: np.random.SeedSequence):
+        self._generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self._next = iter(()).__next__
+
+    def draw(self) -> float:
+        """A uniform float in [0, 1)."""
+        try:
+            return self._next()
+        except StopIteration:
+            self._next = iter(self._generator.random(DRAW_BATCH_SIZE).tolist()).__next__
+            return self._next()
+
+    def die(self, sides: int) -> int:
+        return int(self.draw() * sides) + 1
+
+    def faces(self, sides: int, shape: Tuple[int, ...]) -> np.ndarray:
+        """Many die faces at once, straight from the generator, for simulation loops."""
+        return self._generator.integers(1, sides + 1, size=shape)
+
+class DiceRoller:
+    """
+    Rolls dice expressions on named, independently seeded streams ("combat",
+    "checks", ...). Every stream is derived from one session seed, so
+    reseeding with a recorded seed reproduces every roll, e.g. when a turn is
+    replayed from the turn journal.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = 0
+        self._streams: Dict[str, DiceStream] = {}
+        self.reseed(seed)
+
+    def reseed(self, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self._streams = {}
+
+    def stream(self, name: str) -> DiceStream:
+        dice_stream = self._streams.get(name)
+        if dice_stream is None:
+            # crc32 rather than hash(), which is randomized per process for strings.
+            dice_stream = DiceStream(np.random.SeedSequence([self.seed, zlib.crc32(name.encode("utf-8"))]))
+            self._streams[name] = dice_stream
+        return dice_stream
+
+    def roll(self, expression: str, stats: Optional[Mapping[str, int]] = None, stream: str = "general") -> int:
+        return compile_dice(expression).total(self.stream(stream), stats)
+
+    def roll_many(self, expression: str, count: int, stats: Optional[Mapping[str, int]] = None, stream: str = "general") -> np.ndarray:
+        """Totals of `count` independent rolls of an expression without exploding or adv/dis dice, as an array."""
+        compiled = compile_dice(expression)
+        if any(term.mode for term in compiled.dice):
+            raise ValueError(f"roll_many does not support exploding or advantage dice ('{expression}').")
+        dice_stream = self.stream(stream)
+        totals = np.full(count, compiled.modifier(stats), dtype=np.int64)
+        for term in compiled.dice:
+            totals += term.sign * dice_stream.faces(term.sides, (count, term.count)).sum(axis=1)
+        return totals
+
+    def roll_detailed(self, expression: str, stats: Optional[Mapping[str, int]] = None, stream: str = "general") -> RollResult:
+        return compile_dice(expression).roll(self.stream(stream), stats)
+
+# The session's dice roller. run_turn reseeds it with each turn's recorded seed.
+dice = DiceRoller()
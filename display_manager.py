@@ -1,5 +1,6 @@
 import logging
-from typing import Optional, TYPE_CHECKING
+import time
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from definitions.entities import Character
@@ -99,6 +100,22 @@ class DisplayManager:
                     print(f"    {status_marker} {objective.description}")
         self._print_footer()
 
+    def show_save_summaries(self, saves: List[Dict[str, Any]]):
+        self._print_header("Saved Games")
+        if not saves:
+            print("There are no saved games.")
+        for meta in saves:
+            saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta.get("saved_at", 0)))
+            if "player_name" not in meta:
+                print(f"  {meta['slot']:<16} (saved {saved_at})")
+                continue
+            minutes = meta.get("minutes_elapsed", 0)
+            clock = f"day {minutes // 1440 + 1}, {(minutes // 60) % 24:02d}:{minutes % 60:02d}"
+            print(f"  {meta['slot']:<16} {meta['player_name']} (level {meta.get('player_level', 1)}) at "
+                  f"{meta.get('current_location_name') or meta.get('current_location_id')}, "
+                  f"turn {meta.get('turn_count', 0)}, {clock} (saved {saved_at})")
+        self._print_footer()
+
     def show_help(self):
         self._print_header("Help Menu")
         print("This is a text adventure game where you type commands to interact with the world.")
@@ -110,9 +127,13 @@ class DisplayManager:
         print("  - quests/journal   : Display your active quests.")
         print("  - save <name>      : Save the game to a slot named <name>.")
         print("  - load <name>      : Load the game from slot <name>.")
+        print("  - saves            : List saved games, most recent first.")
+        print("  - delete <name>    : Delete the save in slot <name>.")
+        print("  - undo [n]         : Rewind the last turn, or the last n turns.")
         print("  - quit/exit        : Exit the game.")
         print("\nCommon in-game actions:")
         print("  - look / look at <thing>  : Observe your surroundings or something specific.")
+        print("  - travel to <place>       : Journey to a known place, however many steps away.")
         print("  - take <item>             : Pick up an item.")
         print("  - drop <item>             : Drop an item from your inventory.")
         print("  - equip <item>            : Equip an item from your inventory.")
@@ -139,4 +160,11 @@ class DisplayManager:
         self.narrate(f"[Objective Complete: {objective_description}]")
 
     def show_quest_complete(self, quest_name: str):
-        self.narrate(f"[Quest Complete: {quest_name}]")
\ No newline at end of file
+        self.narrate(f"[Quest Complete: {quest_name}]")
+
+    def show_status_tick(self, effect: str, hp_change: int):
+        verb = "recover" if hp_change > 0 else "lose"
+        self.system_message(f"[{effect.title()}: you {verb} {abs(hp_change)} HP.]")
+
+    def show_status_expired(self, effect: str):
+        self.system_message(f"[You are no longer {effect}.]")
@@ -3,6 +3,8 @@ from typing import List, Dict, Any, TYPE_CHECKING
 
 from game_state import GameState, GameWorld, Character
 from display_manager import DisplayManager
+from definitions.shared_values import intern_optional
+from status_effects import apply_status_effect, remove_status_effect
 
 if TYPE_CHECKING:
     from ai_manager import AIManager
@@ -18,17 +20,12 @@ def execute_player_mutations(game_state: GameState, mutations: List[Dict[str, An
             if op == "damage_player":
                 amount = mutation["amount"]
                 game_state.player.hp -= amount
+                game_state.mark_changed(game_state.player)
                 logging.info(f"Player took {amount} damage. New HP: {game_state.player.hp}")
             elif op == "add_player_status":
-                effect = mutation["effect"]
-                if effect not in game_state.player.status_effects:
-                    game_state.player.status_effects.append(effect)
-                    logging.info(f"Player gained status effect: {effect}")
+                apply_status_effect(game_state, game_state.player, mutation["effect"], duration=mutation.get("duration"))
             elif op == "remove_player_status":
-                effect = mutation["effect"]
-                if effect in game_state.player.status_effects:
-                    game_state.player.status_effects.remove(effect)
-                    logging.info(f"Player lost status effect: {effect}")
+                remove_status_effect(game_state, game_state.player, mutation["effect"])
         except (KeyError, TypeError) as e:
             logging.error(f"Invalid player mutation format for op '{op}'. Error: {e}. Mutation: {mutation}")
 
@@ -47,6 +44,7 @@ def execute_world_mutations(game_state: GameState, world: GameWorld, mutations:
                     if old_loc.id != new_loc.id:
                         old_loc.remove_character(char)
                         new_loc.add_character(char)
+                        game_state.mark_changed(old_loc, new_loc)
                         logging.info(f"Moved NPC '{char_name}' from '{old_loc.id}' to '{new_loc_id}'.")
             elif op == "add_character":
                 loc_id = mutation["location_id"]
@@ -55,6 +53,7 @@ def execute_world_mutations(game_state: GameState, world: GameWorld, mutations:
                     char_data = mutation["character"]
                     new_char = Character(**char_data)
                     loc.add_character(new_char)
+                    game_state.mark_changed(loc)
             elif op == "remove_character":
                 loc_id = mutation["location_id"]
                 char_name = mutation["character_name"]
@@ -63,6 +62,7 @@ def execute_world_mutations(game_state: GameState, world: GameWorld, mutations:
                     char_to_remove = next((c for c in loc.characters if c.name == char_name), None)
                     if char_to_remove:
                         loc.remove_character(char_to_remove)
+                        game_state.mark_changed(loc)
                         logging.info(f"Removed NPC '{char_name}' from location '{loc_id}'.")
             elif op == "update_location_description":
                 loc_id = mutation["location_id"]
@@ -70,21 +70,27 @@ def execute_world_mutations(game_state: GameState, world: GameWorld, mutations:
                 loc = world.get_location(loc_id)
                 if loc:
                     loc.description = new_desc
+                    game_state.mark_changed(loc)
                     logging.info(f"Updated description for location '{loc_id}'.")
             elif op == "add_exit":
                 loc_id = mutation["location_id"]
                 exit_desc = mutation["exit_description"]
                 dest_id = mutation["destination_id"]
-                loc = world.get_location(loc_id)
-                if loc:
-                    loc.exits[exit_desc] = dest_id
+                if world.add_exit(loc_id, exit_desc, dest_id):
+                    game_state.mark_changed(world.get_location(loc_id))
                     logging.info(f"Added exit from '{loc_id}' to '{dest_id}'.")
+            elif op == "set_interactable_state":
+                loc = world.get_location(mutation["location_id"])
+                target = next((i for i in loc.interactables if i.id == mutation["interactable_id"]), None) if loc else None
+                if target:
+                    target.state.update(mutation["state"])
+                    game_state.mark_changed(target)
+                    logging.info(f"Set state of '{target.id}' in '{loc.id}' to {mutation['state']}.")
             elif op == "remove_exit":
                 loc_id = mutation["location_id"]
                 exit_desc = mutation["exit_description"]
-                loc = world.get_location(loc_id)
-                if loc and exit_desc in loc.exits:
-                    del loc.exits[exit_desc]
+                if world.remove_exit(loc_id, exit_desc):
+                    game_state.mark_changed(world.get_location(loc_id))
                     logging.info(f"Removed exit '{exit_desc}' from location '{loc_id}'.")
 
         except (KeyError, TypeError) as e:
@@ -95,7 +101,7 @@ def execute_npc_schedules(game_state: GameState, world: GameWorld):
     
     mutations_to_execute = []
 
-    for location in world.locations.values():
+    for _, location in world.loaded_locations():
         for character in location.characters:
             if not character.schedule:
                 continue
@@ -127,9 +133,12 @@ def check_and_trigger_world_events(
     if new_hour > old_hour:
         logging.info(f"Time has passed into a new hour ({old_hour} -> {new_hour}). Checking for world events.")
         
-        execute_npc_schedules(game_state, world)
-
         npc_behavior_manager = managers.get("npc_behavior")
+        if npc_behavior_manager:
+            npc_behavior_manager.advance_time(game_state, world, old_hour, new_hour)
+        else:
+            execute_npc_schedules(game_state, world)
+
         if npc_behavior_manager:
             npc_mutations = npc_behavior_manager.update_behaviors(game_state, world, ai_manager)
             if npc_mutations:
@@ -170,7 +179,8 @@ def handle_npc_state_update(game_state: GameState, world: GameWorld, ai_manager:
         new_memory = npc_update_data.get("new_memory")
         if new_mood:
             logging.info(f"Updating NPC '{npc.name}' mood from '{npc.mood}' to '{new_mood}'.")
-            npc.mood = new_mood
+            npc.mood = intern_optional(new_mood)
         if new_memory:
             logging.info(f"Adding new memory to NPC '{npc.name}': '{new_memory}'")
-            npc.memory.append(new_memory)
\ No newline at end of file
+            npc.memory.append(new_memory)
+        game_state.mark_changed(npc)
\ No newline at end of file
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+ITEM_ACQUIRED = "item_acquired"
+NPC_DEFEATED = "npc_defeated"
+LOCATION_ENTERED = "location_entered"
+ITEM_GIVEN = "item_given"
+ITEM_LOST = "item_lost"  # dropped or used up
+QUEST_STARTED = "quest_started"
+QUEST_COMPLETED = "quest_completed"
+REPUTATION_CHANGED = "reputation_changed"
+LEVEL_CHANGED = "level_changed"
+INTERACTED = "interacted"  # an interactable was opened or toggled
+
+# The event that advances each type of quest objective.
+OBJECTIVE_EVENT_TYPES = {
+    "acquire_item": ITEM_ACQUIRED,
+    "kill_target": NPC_DEFEATED,
+    "reach_location": LOCATION_ENTERED,
+    "give_item": ITEM_GIVEN,
+    "interact": INTERACTED,
+}
+
+_ARTICLES = ("a ", "an ", "the ")
+
+def normalize_target(name: str) -> str:
+    """Lowercase, single-spaced and without a leading article: "The  Rusty Key" -> "rusty key"."""
+    text = " ".join(name.lower().split())
+    for article in _ARTICLES:
+        if text.startswith(article):
+            return text[len(article):]
+    return text
+
+@dataclass(frozen=True, slots=True)
+class GameEvent:
+    """Something that happened this turn that quests (and others) may care about."""
+    type: str
+    target: str  # item, NPC or interactable name, location id, quest id or faction
+    recipient: Optional[str] = None  # for item_given
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.type, normalize_target(self.target))
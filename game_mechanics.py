@@ -1,11 +1,11 @@
-import random
 import logging
 from typing import Dict
 
+from dice import dice, stat_modifier
 from game_state import Character
 
 def calculate_stat_modifier(stat_value: int) -> int:
-    return (stat_value - 10) // 2
+    return stat_modifier(stat_value)
 
 def perform_skill_check(player: Character, skill: str, dc: int) -> bool:
     skill = skill.lower()
@@ -16,7 +16,7 @@ def perform_skill_check(player: Character, skill: str, dc: int) -> bool:
         player_stat_value = 10
         
     modifier = calculate_stat_modifier(player_stat_value)
-    roll = random.randint(1, 20)
+    roll = dice.roll("1d20", stream="checks")
     total = roll + modifier
 
     logging.info(f"--- SKILL CHECK: {skill.upper()} ---")
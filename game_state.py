@@ -1,34 +1,118 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import logging
 
 from definitions.entities import Character, Item
 from definitions.world_objects import Location, Interactable
 from definitions.quests import Quest
+from world_graph import WorldGraph
+from change_tracking import ChangeTracker
+from combat_encounter import CombatEncounter
+from game_events import GameEvent
+from timers import GameTimers
 
 @dataclass
 class GameWorld:
     locations: Dict[str, Location] = field(default_factory=dict)
+    graph: WorldGraph = field(init=False, repr=False, compare=False)
+    # Bumped whenever a location object is swapped for a new one; see replace_location().
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Lazily loaded worlds expose their exits up front, so building the graph
+        # does not force every location to be loaded.
+        exit_index = getattr(self.locations, "exit_index", None)
+        if exit_index is not None:
+            self.graph = WorldGraph()
+            for loc_id, destination_ids in exit_index.items():
+                self.graph.add_node(loc_id, destination_ids)
+        else:
+            self.graph = WorldGraph(self.locations.values())
+
+    @classmethod
+    def from_dict(cls, world_data: Dict[str, Any]) -> "GameWorld":
+        return cls(locations={loc_id: Location.from_dict(loc_data) for loc_id, loc_data in world_data['locations'].items()})
 
     def get_location(self, location_id: str) -> Optional[Location]:
         return self.locations.get(location_id)
-    
+
+    def replace_location(self, location: Location):
+        """Swaps in a new object for a location, e.g. one restored by undo. Whoever keeps the old Location, its characters or quests rebuilds when `revision` changes."""
+        self.locations[location.id] = location
+        self.graph.refresh_location(location)
+        self.revision += 1
+
+    def loaded_locations(self) -> List[Tuple[str, Location]]:
+        """The locations in memory. A lazily loaded world keeps the others in the save until they are looked up."""
+        loaded_items = getattr(self.locations, "loaded_items", None)
+        return loaded_items() if loaded_items else list(self.locations.items())
+
+    def loaded_location_count(self) -> int:
+        loaded_count = getattr(self.locations, "loaded_count", None)
+        return loaded_count() if loaded_count else len(self.locations)
+
     def find_character_anywhere(self, character_name: str) -> Optional[Tuple[Character, Location]]:
-        for loc in self.locations.values():
+        name_lower = character_name.lower()
+        for _, loc in self.loaded_locations():
             for char in loc.characters:
-                if char.name.lower() == character_name.lower():
+                if char.name.lower() == name_lower:
+                    return char, loc
+        # Only the locations the save says the character is in are loaded to look.
+        character_index = getattr(self.locations, "character_index", None)
+        for loc_id in (character_index or {}).get(name_lower, ()):
+            if not self.locations.is_loaded(loc_id):
+                loc = self.locations.get(loc_id)
+                char = next((c for c in loc.characters if c.name.lower() == name_lower), None) if loc else None
+                if char:
                     return char, loc
         return None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return { "locations": {loc_id: loc.to_dict() for loc_id, loc in self.locations.items()} }
+
+    def find_location_by_name(self, name: str) -> Optional[Location]:
+        name_lower = name.lower()
+        location = self.locations.get(name_lower.replace(" ", "_"))
+        if location:
+            return location
+        names = self._location_names()
+        for loc_id, loc_name in names:
+            if loc_name.lower() == name_lower:
+                return self.locations.get(loc_id)
+        for loc_id, loc_name in names:
+            if name_lower in loc_name.lower() or name_lower in loc_id.lower():
+                return self.locations.get(loc_id)
+        return None
+
+    def _location_names(self) -> List[Tuple[str, str]]:
+        name_index = getattr(self.locations, "name_index", None)
+        if name_index is None:
+            return [(loc_id, loc.name) for loc_id, loc in self.locations.items()]
+        loaded = dict(self.loaded_locations())
+        return [(loc_id, loaded[loc_id].name if loc_id in loaded else name_index.get(loc_id, "")) for loc_id in self.locations]
+
+    def add_exit(self, location_id: str, exit_description: str, destination_id: str) -> bool:
+        loc = self.get_location(location_id)
+        if not loc:
+            return False
+        loc.exits[exit_description] = destination_id
+        self.graph.add_exit(location_id, destination_id)
+        return True
+
+    def remove_exit(self, location_id: str, exit_description: str) -> bool:
+        loc = self.get_location(location_id)
+        if not loc or exit_description not in loc.exits:
+            return False
+        del loc.exits[exit_description]
+        self.graph.refresh_location(loc)
+        return True
+
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
+        return { "locations": {loc_id: loc.to_dict(compact) for loc_id, loc in self.locations.items()} }
 
     def create_and_add_location(self, location_data: Dict[str, Any]) -> Optional[Location]:
         try:
             loc_id = location_data['id']
             
-            items = [Item(**item) for item in location_data.get('items', [])]
+            items = [Item.from_dict(item) for item in location_data.get('items', [])]
             interactables = [Interactable(**i) for i in location_data.get('interactables', [])]
             characters = []
             for char_data in location_data.get('characters', []):
@@ -64,6 +148,7 @@ class GameWorld:
                 exits=location_data.get('exits', {})
             )
             self.locations[loc_id] = new_location
+            self.graph.add_location(new_location)
             logging.info(f"Successfully created and added new location '{loc_id}' to the world.")
             return new_location
         except (KeyError, TypeError) as e:
@@ -78,9 +163,15 @@ class GameState:
     turn_count: int = 0
     minutes_elapsed: int = 480 
     quest_log: Dict[str, Quest] = field(default_factory=dict)
-    combat_state: Optional[Dict[str, Any]] = None
+    combat_state: Optional[CombatEncounter] = None
     reputation: Dict[str, int] = field(default_factory=dict)
     player_knowledge: Dict[str, Any] = field(default_factory=dict)
+    weather: Dict[str, Any] = field(default_factory=dict)
+    timers: GameTimers = field(default_factory=GameTimers, repr=False, compare=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    changes: ChangeTracker = field(default_factory=ChangeTracker, init=False, repr=False, compare=False)
+    events: List[GameEvent] = field(default_factory=list, init=False, repr=False, compare=False)
+    _dict_cache: Dict[Tuple[str, str], Tuple[Any, int, Dict[str, Any]]] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     @property
     def time_of_day(self) -> str:
@@ -97,17 +188,75 @@ class GameState:
     def get_current_location(self, world: GameWorld) -> Optional[Location]:
         return world.get_location(self.current_location_id)
 
-    def to_dict(self) -> Dict[str, Any]:
+    @classmethod
+    def from_dict(cls, state_data: Dict[str, Any], world: Optional[GameWorld] = None) -> "GameState":
+        """Builds the state from its saved form. A fight in progress needs `world` to find its participants."""
+        game_state = cls(
+            player=Character.from_dict(state_data['player']),
+            current_location_id=state_data['current_location_id'],
+            turn_count=state_data.get('turn_count', 0),
+            minutes_elapsed=state_data.get('minutes_elapsed', 480),
+            quest_log={qid: Quest.from_dict(q) for qid, q in state_data.get('quest_log', {}).items()},
+            reputation=dict(state_data.get('reputation', {})),
+            player_knowledge=dict(state_data.get('player_knowledge', {})),
+            weather=dict(state_data.get('weather', {})),
+            timers=GameTimers.from_dict(state_data.get('timers', {})),
+        )
+        combat_data = state_data.get('combat_state')
+        if combat_data:
+            if world is None:
+                logging.warning("Dropping saved combat state: no world was given to resolve its participants.")
+            else:
+                location = game_state.get_current_location(world)
+                by_name = {char.name: char for char in location.characters} if location else {}
+                game_state.combat_state = CombatEncounter.from_dict(combat_data, game_state.player, by_name.get)
+        return game_state
+
+    def mark_changed(self, *entities: Any):
+        """Records that the given entities, or the game state itself when called without arguments, changed this turn."""
+        if not entities:
+            self.version += 1
+            self.changes.pending.game_state = True
+        for entity in entities:
+            if entity is not None:
+                self.changes.mark(entity)
+
+    def emit(self, event: GameEvent):
+        """Queues a game event for the end-of-turn listeners (quest tracking, ...)."""
+        self.events.append(event)
+
+    def drain_events(self) -> List[GameEvent]:
+        events, self.events = self.events, []
+        return events
+
+    def end_turn(self):
+        """Publishes this turn's change set to the subscribers of the change tracker."""
+        return self.changes.end_turn(self.turn_count)
+
+    def _cached_to_dict(self, entity: Any, key: str) -> Dict[str, Any]:
+        # Entities are only re-serialized for the context string when their version moved.
+        cache_key = (type(entity).__name__, key)
+        version = entity.content_version() if isinstance(entity, Location) else entity.version
+        cached = self._dict_cache.get(cache_key)
+        if cached and cached[0] is entity and cached[1] == version:
+            return cached[2]
+        entity_dict = entity.to_dict()
+        self._dict_cache[cache_key] = (entity, version, entity_dict)
+        return entity_dict
+
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
         return {
-            "player": self.player.to_dict(),
+            "player": self.player.to_dict(compact),
             "current_location_id": self.current_location_id,
             "turn_count": self.turn_count,
             "time_of_day": self.time_of_day,
             "minutes_elapsed": self.minutes_elapsed,
             "quest_log": {qid: q.to_dict() for qid, q in self.quest_log.items()},
-            "combat_state": self.combat_state,
+            "combat_state": self.combat_state.to_dict() if self.combat_state else None,
             "reputation": self.reputation,
             "player_knowledge": self.player_knowledge,
+            "weather": self.weather,
+            "timers": self.timers.to_dict(),
         }
 
     def get_context_string(self, world: GameWorld) -> str:
@@ -115,12 +264,19 @@ class GameState:
         if not current_location:
             return json.dumps({"error": f"current location '{self.current_location_id}' not found in world"})
 
-        state_dict = self.to_dict()
-        state_dict["location"] = current_location.to_dict()
-        
-        player_data = state_dict.pop("player")
-        state_dict["player"] = player_data
-        
+        state_dict = {
+            "current_location_id": self.current_location_id,
+            "turn_count": self.turn_count,
+            "time_of_day": self.time_of_day,
+            "minutes_elapsed": self.minutes_elapsed,
+            "quest_log": {qid: self._cached_to_dict(q, qid) for qid, q in self.quest_log.items()},
+            "combat_state": self.combat_state.to_dict() if self.combat_state else None,
+            "reputation": self.reputation,
+            "player_knowledge": self.player_knowledge,
+            "weather": {key: value for key, value in self.weather.items() if key != "seed"} or None,
+            "location": self._cached_to_dict(current_location, current_location.id),
+            "player": self._cached_to_dict(self.player, self.player.name),
+        }
         return json.dumps(state_dict, indent=2)
 
     def find_in_location(self, name: str, world: GameWorld) -> Optional[Tuple[Any, str]]:
@@ -158,5 +314,6 @@ class GameState:
             try:
                 location.remove_item(item)
                 self.player.add_item_to_inventory(item)
+                self.mark_changed(location, self.player)
             except ValueError:
                 logging.error(f"Attempted to move item '{item.name}' that was not in location '{location.id}'.")
\ No newline at end of file
@@ -1,11 +1,24 @@
+import contextlib
+import io
 import logging
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Tuple, Optional, Dict, Any
 
 from ai_manager import AIManager
 from game_state import GameState, GameWorld
 from definitions.entities import Character
 from game_mechanics import perform_skill_check
+from dice import dice
 from persistence import PersistenceManager
+from persistence_sqlite import SQLitePersistenceManager
+from autosave import AutosaveService
+from config import AUTOSAVE_ENABLED, AUTOSAVE_INTERVAL_TURNS, SAVE_BACKEND, TURN_JOURNAL_ENABLED, UNDO_HISTORY_TURNS, WEATHER_SEED
+from change_tracking import ChangeSet
+from turn_journal import TurnJournal, load_session, new_turn_seed
+from undo_history import UndoHistory
 from action_processor import ActionProcessor
 from meta_command_handler import MetaCommandHandler
 from world_loader import WorldLoader
@@ -25,11 +38,15 @@ from display_manager import DisplayManager
 
 # Corrected imports from the new managers/ directory
 from managers.quest_manager import QuestManager
+from managers.quest_offer_manager import QuestOfferManager
+from quest_graph import QuestGraph
 from managers.progression_manager import ProgressionManager
 from managers.reputation_manager import ReputationManager
 from managers.companion_manager import CompanionManager
-from managers.npc_behavior_manager import NPCBehaviorManager
+from managers.npc_behavior_manager import NPCBehaviorManager, NPC_COOLDOWN
 from managers.weather_manager import WeatherManager
+from managers.timer_manager import TimerManager
+from status_effects import STATUS_TIMER_HANDLERS
 
 def setup_new_game() -> Tuple[GameState, GameWorld]:
     logging.info("Setting up a new game world.")
@@ -43,10 +60,101 @@ def setup_new_game() -> Tuple[GameState, GameWorld]:
         stats={"strength": 16, "dexterity": 12, "intelligence": 14},
     )
     
-    game_state = GameState(player=player, current_location_id="salty_siren_tavern")
+    weather_seed = WEATHER_SEED if WEATHER_SEED is not None else random.SystemRandom().getrandbits(32)
+    game_state = GameState(player=player, current_location_id="salty_siren_tavern", weather={"seed": weather_seed})
 
     return game_state, world
 
+@dataclass
+class TurnOutcome:
+    intent_data: Optional[Dict[str, Any]]
+    result: Optional[str]
+    changes: ChangeSet
+
+def run_turn(
+    full_input: str,
+    game_state: GameState,
+    world: GameWorld,
+    ai_manager: AIManager,
+    intent_handlers: Dict[str, Any],
+    display: DisplayManager,
+    managers: Dict[str, Any],
+    rng_seed: int
+) -> TurnOutcome:
+    """Resolves one in-game action. Everything the turn does follows from its inputs, the RNG seed and the AI responses."""
+    quest_manager = managers["quest"]
+    progression_manager = managers["progression"]
+    reputation_manager = managers["reputation"]
+
+    random.seed(rng_seed)
+    dice.reseed(rng_seed)
+    old_minutes_elapsed = game_state.minutes_elapsed
+    game_state.turn_count += 1
+    game_state.mark_changed()
+    original_location_id = game_state.current_location_id
+    
+    intent_data = ai_manager.get_player_intent(game_state, world, full_input)
+    if not intent_data or not isinstance(intent_data, dict):
+        display.show_error("The DM seems to have misunderstood you. Please try rephrasing your action.")
+        return TurnOutcome(intent_data, None, game_state.end_turn())
+
+    intent = intent_data.get("intent")
+    if not isinstance(intent, str):
+        display.show_error("The DM's intentions are unclear. Please try rephrasing your action.")
+        return TurnOutcome(intent_data, None, game_state.end_turn())
+
+    action_desc = intent_data.get("action_description", f"The player attempts: {full_input}")
+    result_string = f"Failure: The intent '{intent}' is not recognized by the game."
+
+    # Pass the display manager to the handlers
+    intent_data["display"] = display 
+
+    handler = intent_handlers.get(intent)
+    if handler:
+        result_string = handler(game_state, world, ai_manager, intent_data)
+    elif intent == "skill_check":
+        mechanics_data = ai_manager.determine_skill_check_details(game_state, world, action_desc)
+        if not mechanics_data or not mechanics_data.get("is_possible", False) or "skill" not in mechanics_data or "dc" not in mechanics_data:
+            result_string = "Failure: The DM seems confused about the rules for that."
+        else:
+            success = perform_skill_check(game_state.player, mechanics_data["skill"], mechanics_data["dc"])
+            result_string = "Success" if success else "Failure"
+            mutations_to_apply = mechanics_data.get("on_success" if success else "on_failure", [])
+            execute_player_mutations(game_state, mutations_to_apply)
+
+    # Off-screen NPCs are caught up, and the local weather read, when the player comes near them.
+    managers["npc_behavior"].catch_up_nearby(game_state, world)
+    managers["weather"].refresh(game_state, world)
+
+    if "Failure" not in result_string and "Impossible" not in result_string and not game_state.combat_state:
+         if intent != "pass_time":
+            game_state.minutes_elapsed += 5
+
+    narration = ai_manager.narrate_outcome(game_state, world, action_desc, result_string)
+    display.narrate(narration)
+    
+    handle_npc_state_update(game_state, world, ai_manager, intent_data, action_desc, narration)
+
+    if intent == "give_item" or intent == "attack":
+        target_name = intent_data.get("target")
+        target_char = game_state.find_character_in_location(target_name, world) if target_name else None
+        reputation_manager.process_event(game_state, intent, display, target=target_char)
+
+    if intent in ("move", "travel") and "Success" in result_string and game_state.current_location_id != original_location_id:
+        display.show_location(game_state.get_current_location(world))
+    
+    if intent == "look" and intent_data.get("target") is None:
+        display.show_location(game_state.get_current_location(world))
+
+    managers["timers"].advance(game_state, world, display)
+    events = game_state.drain_events()
+    quest_manager.process_events(game_state, events, display)
+    progression_manager.check_for_levelup(game_state, display)
+    # Completions and level-ups above emit events of their own.
+    managers["quest_graph"].process_events(game_state, world, events + game_state.drain_events())
+    check_and_trigger_world_events(game_state, world, ai_manager, old_minutes_elapsed, display, managers)
+    return TurnOutcome(intent_data, result_string, game_state.end_turn())
+
 def game_loop(
     game_state: GameState, 
     world: GameWorld, 
@@ -54,23 +162,25 @@ def game_loop(
     meta_handler: MetaCommandHandler,
     intent_handlers: Dict[str, Any],
     display: DisplayManager,
-    managers: Dict[str, Any]
+    managers: Dict[str, Any],
+    autosave: Optional[AutosaveService] = None,
+    turn_journal: Optional[TurnJournal] = None,
+    undo_history: Optional[UndoHistory] = None
 ):
-    # Retrieve managers from the dictionary
-    quest_manager = managers["quest"]
-    progression_manager = managers["progression"]
-    reputation_manager = managers["reputation"]
-    
     command_aliases = { "i": "inventory", "eq": "equipment", "l": "look" }
 
+    if turn_journal:
+        turn_journal.start_session(game_state, world)
+    if undo_history is not None:
+        undo_history.reset(game_state, world)
+    quest_offers: QuestOfferManager = managers["quest_offers"]
+    quest_offers.prefetch(game_state, world, ai_manager)
+
     while True:
         try:
             prompt_str = "> "
-            if game_state.combat_state:
-                if len(game_state.combat_state["participants"]) > game_state.combat_state["turn_index"]:
-                    active_char_name = game_state.combat_state["participants"][game_state.combat_state["turn_index"]]
-                    if active_char_name == game_state.player.name:
-                        prompt_str = "[COMBAT] > "
+            if game_state.combat_state and game_state.combat_state.current_actor is game_state.player:
+                prompt_str = "[COMBAT] > "
 
             full_input = input(f"\n{prompt_str}")
             if not full_input:
@@ -86,66 +196,31 @@ def game_loop(
                 if new_state is None:
                     break
                 assert new_world is not None
+                if turn_journal and (new_state is not game_state or new_world is not world):
+                    # A loaded save or an undo is a new starting point for recovery.
+                    turn_journal.start_session(new_state, new_world)
                 game_state = new_state
                 world = new_world
+                quest_offers.prefetch(game_state, world, ai_manager)
                 continue
 
-            old_minutes_elapsed = game_state.minutes_elapsed
-            game_state.turn_count += 1
-            original_location_id = game_state.current_location_id
-            
-            intent_data = ai_manager.get_player_intent(game_state, world, full_input)
-            if not intent_data or not isinstance(intent_data, dict):
-                display.show_error("The DM seems to have misunderstood you. Please try rephrasing your action.")
-                continue
-
-            intent = intent_data.get("intent")
-            if not isinstance(intent, str):
-                display.show_error("The DM's intentions are unclear. Please try rephrasing your action.")
-                continue
-
-            action_desc = intent_data.get("action_description", f"The player attempts: {full_input}")
-            result_string = f"Failure: The intent '{intent}' is not recognized by the game."
-
-            # Pass the display manager to the handlers
-            intent_data["display"] = display 
-
-            handler = intent_handlers.get(intent)
-            if handler:
-                result_string = handler(game_state, world, ai_manager, intent_data)
-            elif intent == "skill_check":
-                mechanics_data = ai_manager.determine_skill_check_details(game_state, world, action_desc)
-                if not mechanics_data or not mechanics_data.get("is_possible", False) or "skill" not in mechanics_data or "dc" not in mechanics_data:
-                    result_string = "Failure: The DM seems confused about the rules for that."
-                else:
-                    success = perform_skill_check(game_state.player, mechanics_data["skill"], mechanics_data["dc"])
-                    result_string = "Success" if success else "Failure"
-                    mutations_to_apply = mechanics_data.get("on_success" if success else "on_failure", [])
-                    execute_player_mutations(game_state, mutations_to_apply)
-
-            if "Failure" not in result_string and "Impossible" not in result_string and not game_state.combat_state:
-                 if intent != "pass_time":
-                    game_state.minutes_elapsed += 5
-
-            narration = ai_manager.narrate_outcome(game_state, world, action_desc, result_string)
-            display.narrate(narration)
-            
-            handle_npc_state_update(game_state, world, ai_manager, intent_data, action_desc, narration)
-
-            if intent == "give_item" or intent == "attack":
-                target_name = intent_data.get("target")
-                target_char = game_state.find_character_in_location(target_name, world) if target_name else None
-                reputation_manager.process_event(game_state, intent, display, target=target_char)
-
-            if intent == "move" and "Success" in result_string and game_state.current_location_id != original_location_id:
-                display.show_location(game_state.get_current_location(world))
-            
-            if intent == "look" and intent_data.get("target") is None:
-                display.show_location(game_state.get_current_location(world))
-
-            quest_manager.check_for_updates(game_state, intent, result_string, intent_data, display)
-            progression_manager.check_for_levelup(game_state, display)
-            check_and_trigger_world_events(game_state, world, ai_manager, old_minutes_elapsed, display, managers)
+            rng_seed = new_turn_seed()
+            start = time.perf_counter()
+            ai_manager.start_capture()
+            try:
+                outcome = run_turn(full_input, game_state, world, ai_manager, intent_handlers, display, managers, rng_seed)
+            finally:
+                llm_responses = ai_manager.stop_capture()
+            if turn_journal:
+                turn_journal.record_turn(
+                    game_state.turn_count, full_input, rng_seed, outcome.intent_data, outcome.result,
+                    outcome.changes.to_dict(), llm_responses, (time.perf_counter() - start) * 1000
+                )
+            if undo_history is not None:
+                undo_history.record(game_state, world)
+            if autosave:
+                autosave.on_turn_end(game_state, world)
+            quest_offers.prefetch(game_state, world, ai_manager)
 
         except KeyboardInterrupt:
             display.system_message("\nExiting game. Goodbye!")
@@ -153,43 +228,86 @@ def game_loop(
         except Exception as e:
             logging.error(f"An unexpected error occurred in the main loop: {e}", exc_info=True)
             display.system_message("\nA critical error occurred. The game must end. Please check the logs.")
-            break
+            # The turn journal is left open so the session can be recovered on the next start.
+            quest_offers.shutdown()
+            return
 
-def main():
-    logging.info("--- Gemini Dungeon Master Initializing ---")
-    
-    # Core Components
-    persistence_manager = PersistenceManager()
-    action_processor = ActionProcessor()
+    quest_offers.shutdown()
+    if turn_journal:
+        turn_journal.end_session()
+
+def replay_session(
+    session_file: Path,
+    ai_manager: AIManager,
+    intent_handlers: Dict[str, Any],
+    managers: Dict[str, Any]
+) -> Optional[Tuple[GameState, GameWorld]]:
+    """
+    Rebuilds the state at the end of a journaled session by re-running its turns
+    with the recorded RNG seeds and AI responses. No model is called and all
+    display output is discarded.
+    """
+    header, turns, _ = load_session(session_file)
+    if header is None:
+        logging.error(f"Turn journal '{session_file}' has no session header.")
+        return None
+
+    world = GameWorld.from_dict(header["game_world"])
+    game_state = GameState.from_dict(header["game_state"], world)
     display = DisplayManager()
-    meta_handler = MetaCommandHandler(persistence_manager)
+    diverged = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for turn in turns:
+            ai_manager.queue_replay(turn["llm_responses"])
+            outcome = run_turn(turn["input"], game_state, world, ai_manager, intent_handlers, display, managers, turn["rng_seed"])
+            unused_responses = ai_manager.finish_replay()
+            if outcome.result != turn["result"] or unused_responses:
+                diverged += 1
+                logging.warning(f"Replayed turn {turn['turn']} diverged from the journal (result '{outcome.result}', recorded '{turn['result']}').")
+    logging.info(f"Replayed {len(turns)} turns from '{session_file.name}' in {(time.perf_counter() - start) * 1000:.1f} ms ({diverged} diverged).")
+    return game_state, world
 
-    # Initialize Managers
-    managers = {
+def create_managers() -> Dict[str, Any]:
+    quest_graph = QuestGraph()
+    npc_behavior = NPCBehaviorManager()
+    return {
         "quest": QuestManager(),
+        "quest_graph": quest_graph,
+        "quest_offers": QuestOfferManager(quest_graph=quest_graph),
         "progression": ProgressionManager(),
         "reputation": ReputationManager(),
         "companion": CompanionManager(),
-        "npc_behavior": NPCBehaviorManager(),
-        "weather": WeatherManager()
+        "npc_behavior": npc_behavior,
+        "weather": WeatherManager(),
+        "timers": TimerManager({**STATUS_TIMER_HANDLERS, NPC_COOLDOWN: npc_behavior.on_cooldown_expired}),
     }
 
+def create_intent_handlers(managers: Dict[str, Any]) -> Dict[str, Any]:
+    def on_location_entered(game_state: GameState, world: GameWorld, ai_manager: AIManager):
+        managers["npc_behavior"].catch_up_nearby(game_state, world)
+        managers["weather"].refresh(game_state, world)
+        managers["quest_offers"].prefetch(game_state, world, ai_manager)
+
+    action_processor = ActionProcessor(entry_hooks=[on_location_entered])
+
     # Initialize Handlers that depend on Managers
-    quest_handler = QuestHandler(managers["quest"])
+    quest_handler = QuestHandler(managers["quest"], managers["quest_offers"], managers["quest_graph"])
     
     # Initialize standalone Handlers
     item_handler = ItemHandler()
     combat_handler = CombatHandler()
     interaction_handler = InteractionHandler()
-    dialogue_handler = DialogueHandler()
+    dialogue_handler = DialogueHandler(managers["quest_offers"], managers["quest_graph"])
     equipment_handler = EquipmentHandler()
     crafting_handler = CraftingHandler()
     
     # Define all intent handlers
-    intent_handlers: Dict[str, Any] = {
+    return {
         "move": action_processor.process_action,
         "take_item": action_processor.process_action,
         "pass_time": action_processor.process_action,
+        "travel": action_processor.process_action,
         "use_item": item_handler.process_item_intent,
         "drop_item": item_handler.process_item_intent,
         "give_item": item_handler.process_item_intent,
@@ -204,19 +322,51 @@ def main():
         "companion_command": managers["companion"].process_command_intent,
     }
 
+def main():
+    logging.info("--- Gemini Dungeon Master Initializing ---")
+    
+    # Core Components
+    persistence_manager = SQLitePersistenceManager() if SAVE_BACKEND == "sqlite" else PersistenceManager()
+    display = DisplayManager()
+    undo_history = UndoHistory() if UNDO_HISTORY_TURNS > 0 else None
+    # Manual saves are written by the autosave worker even when periodic autosaves are off.
+    autosave = AutosaveService(persistence_manager, interval_turns=AUTOSAVE_INTERVAL_TURNS if AUTOSAVE_ENABLED else 0)
+    meta_handler = MetaCommandHandler(persistence_manager, undo_history, autosave)
+    turn_journal = TurnJournal() if TURN_JOURNAL_ENABLED else None
+
+    managers = create_managers()
+    intent_handlers = create_intent_handlers(managers)
+
+    try:
+        ai_manager = AIManager()
+    except Exception as e:
+        logging.critical(f"Failed to initialize the AI Manager. Exiting. Error: {e}")
+        return
+
     display.system_message("\n--- Welcome to Gemini Dungeon Master ---")
     
     game_state: Optional[GameState] = None
     world: Optional[GameWorld] = None
+
+    unfinished_session = turn_journal.find_unfinished_session() if turn_journal else None
+    if unfinished_session:
+        choice = input("Your last session ended unexpectedly. Recover it? (y/n): ").lower()
+        if choice.startswith('y'):
+            recovered = replay_session(unfinished_session, ai_manager, intent_handlers, managers)
+            if recovered:
+                game_state, world = recovered
+            else:
+                display.show_error("The last session could not be recovered.")
     
-    existing_saves = persistence_manager.list_save_games()
-    if existing_saves:
-        display.system_message(f"Found existing save games: {', '.join(existing_saves)}")
-        choice = input("Type a save name to load, or type 'new' to start a new game: ").lower()
-        if choice != 'new':
-            loaded_data = persistence_manager.load_game(choice)
-            if loaded_data:
-                game_state, world = loaded_data
+    if not game_state or not world:
+        existing_saves = persistence_manager.list_save_metadata()
+        if existing_saves:
+            display.show_save_summaries(existing_saves)
+            choice = input("Type a save name to load, or type 'new' to start a new game: ").lower()
+            if choice != 'new':
+                loaded_data = persistence_manager.load_game(choice)
+                if loaded_data:
+                    game_state, world = loaded_data
 
     if not game_state or not world:
         try:
@@ -233,17 +383,13 @@ def main():
         logging.critical("FATAL: Game state or world could not be initialized.")
         display.system_message("\nA critical error prevented the game from starting. Please check logs.")
         return
-
-    try:
-        ai_manager = AIManager()
-    except Exception as e:
-        logging.critical(f"Failed to initialize the AI Manager. Exiting. Error: {e}")
-        return
     
     display.show_player_character(game_state.player)
     display.show_location(game_state.get_current_location(world))
 
-    game_loop(game_state, world, ai_manager, meta_handler, intent_handlers, display, managers)
+    game_loop(game_state, world, ai_manager, meta_handler, intent_handlers, display, managers, autosave, turn_journal, undo_history)
+
+    autosave.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,17 +1,30 @@
 import logging
 from typing import List, Dict, Any, TYPE_CHECKING, Optional
 
+from npc_scheduler import NPCScheduler
+from timers import TURNS, Timer
+
 if TYPE_CHECKING:
     from game_state import GameState, GameWorld
     from ai_manager import AIManager
     from definitions.entities import Character
     from definitions.world_objects import Location
+    from display_manager import DisplayManager
+
+NPC_COOLDOWN = "npc_cooldown"
 
 class NPCBehaviorManager:
 
-    def __init__(self):
+    def __init__(self, scheduler: Optional[NPCScheduler] = None):
         logging.info("NPCBehaviorManager initialized.")
-        self.cooldowns: Dict[str, int] = {}
+        self.scheduler = scheduler or NPCScheduler()
+
+    def advance_time(self, game_state: 'GameState', world: 'GameWorld', old_hour: int, new_hour: int):
+        """Runs NPC schedules and off-screen simulation for the hours that passed."""
+        self.scheduler.advance(game_state, world, old_hour, new_hour)
+
+    def catch_up_nearby(self, game_state: 'GameState', world: 'GameWorld'):
+        self.scheduler.catch_up_nearby(game_state, world)
 
     def update_behaviors(self, game_state: 'GameState', world: 'GameWorld', ai_manager: 'AIManager') -> List[Dict[str, Any]]:
         mutations = []
@@ -31,17 +44,17 @@ class NPCBehaviorManager:
             return mutations
 
         for character in location.characters:
-            if character.name in game_state.combat_state["participants"]:
+            if character in game_state.combat_state:
                 continue
 
-            if self._is_on_cooldown(character.name):
+            if self._is_on_cooldown(game_state, character.name):
                 continue
 
             if "coward" in character.personality_tags:
                 flee_mutation = self._flee_combat(character, location, world)
                 if flee_mutation:
                     mutations.append(flee_mutation)
-                    self.set_cooldown(character.name, game_state.turn_count, 10)
+                    self.set_cooldown(game_state, character.name, 10)
 
         return mutations
 
@@ -62,9 +75,15 @@ class NPCBehaviorManager:
             }
         return None
 
-    def _is_on_cooldown(self, character_name: str) -> bool:
-        return character_name in self.cooldowns
+    def _is_on_cooldown(self, game_state: 'GameState', character_name: str) -> bool:
+        return game_state.timers.has_key(f"cooldown:{character_name}")
+
+    def set_cooldown(self, game_state: 'GameState', character_name: str, duration: int):
+        """Keeps the NPC from reacting again for `duration` turns."""
+        game_state.timers.schedule(TURNS, game_state.turn_count, duration, NPC_COOLDOWN,
+                                   key=f"cooldown:{character_name}", data={"character_name": character_name})
+        game_state.mark_changed()
+        logging.info(f"Setting action cooldown for NPC '{character_name}' for {duration} turns.")
 
-    def set_cooldown(self, character_name: str, current_turn: int, duration: int):
-        logging.info(f"Setting action cooldown for NPC '{character_name}'.")
-        pass
\ No newline at end of file
+    def on_cooldown_expired(self, game_state: 'GameState', world: 'GameWorld', timer: Timer, firings: int, display: 'DisplayManager'):
+        logging.info(f"Action cooldown for NPC '{timer.data.get('character_name')}' expired.")
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any
 
 from definitions.entities import Character
+from game_events import GameEvent, LEVEL_CHANGED
 from game_state import GameState
 from display_manager import DisplayManager
 
@@ -13,6 +14,7 @@ class ProgressionManager:
 
         player = game_state.player
         player.xp += amount
+        game_state.mark_changed(player)
         logging.info(f"Player awarded {amount} XP. Total XP: {player.xp}")
         display.system_message(f"\n[You gained {amount} experience points!]")
 
@@ -35,6 +37,8 @@ class ProgressionManager:
             self._apply_level_up_bonuses(player)
         
         if leveled_up:
+            game_state.mark_changed(player)
+            game_state.emit(GameEvent(LEVEL_CHANGED, player.name))
             display.show_level_up(player)
 
     def _apply_level_up_bonuses(self, player: Character):
@@ -1,11 +1,25 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from definitions.quests import Quest, Objective
+from game_events import GameEvent, ITEM_ACQUIRED, ITEM_GIVEN, OBJECTIVE_EVENT_TYPES, QUEST_COMPLETED, QUEST_STARTED, normalize_target
 from game_state import GameState
 from display_manager import DisplayManager
 
 class QuestManager:
+    """
+    Starts quests and advances their objectives from game events.
+
+    Open objectives are indexed by (event type, normalized target), so an
+    event only touches the objectives waiting for it, however long the quest
+    log grows. The index follows the game state's quest log and is rebuilt
+    when a different log (a loaded save, an undo) shows up.
+    """
+
+    def __init__(self):
+        self._index: Dict[Tuple[str, str], List[Tuple[Quest, Objective]]] = {}
+        self._indexed_log: Optional[Dict[str, Quest]] = None
+        self._indexed_count = 0
 
     def start_quest(self, game_state: GameState, quest_data: Dict[str, Any], display: DisplayManager):
         quest_id = quest_data.get("id")
@@ -22,67 +36,87 @@ class QuestManager:
             objectives=objectives
         )
         
+        self._ensure_index(game_state)
         game_state.quest_log[quest_id] = new_quest
+        self._register_quest(new_quest)
+        self._indexed_count = len(game_state.quest_log)
+        game_state.mark_changed(new_quest)
+        game_state.emit(GameEvent(QUEST_STARTED, quest_id))
         logging.info(f"Quest '{new_quest.name}' started for player.")
         display.show_quest_started(new_quest.name, new_quest.description)
 
-    def check_for_updates(self, game_state: GameState, intent: str, result: str, intent_data: Dict[str, Any], display: DisplayManager):
-        if "Success" not in result and "Victory" not in result:
-            return 
+    def process_events(self, game_state: GameState, events: List[GameEvent], display: DisplayManager):
+        if not events:
+            return
+        self._ensure_index(game_state)
 
-        for quest in game_state.quest_log.values():
-            if quest.status != "active":
-                continue
-            
-            needs_completion_check = False
-            for objective in quest.objectives:
-                if objective.is_complete:
+        completed_quests: List[Quest] = []
+        for event in events:
+            for quest, objective in self._matching_objectives(event):
+                if objective.is_complete or quest.status != "active":
+                    continue
+                if objective.type == "give_item" and not self._recipient_matches(objective, event):
                     continue
-                
-                was_updated = self._check_objective(objective, intent, result, intent_data, game_state, display)
-                if was_updated:
-                    needs_completion_check = True
 
-            if needs_completion_check:
-                if all(obj.is_complete for obj in quest.objectives):
-                    self._complete_quest(quest, display)
+                objective.current_count += 1
+                game_state.mark_changed(quest)
+                if objective.current_count >= objective.required_count:
+                    objective.is_complete = True
+                    self._unregister_objective(quest, objective)
+                    logging.info(f"Quest '{objective.id}' objective completed.")
+                    display.show_objective_complete(objective.description)
+                    if quest not in completed_quests and all(obj.is_complete for obj in quest.objectives):
+                        completed_quests.append(quest)
 
-    def _check_objective(self, objective: Objective, intent: str, result: str, intent_data: Dict[str, Any], game_state: GameState, display: DisplayManager) -> bool:
-        
-        target_match = False
-
-        if objective.type == "acquire_item" and intent == "take_item":
-            item_name = intent_data.get("target")
-            if item_name and objective.target.lower() in item_name.lower():
-                target_match = True
-
-        elif objective.type == "kill_target" and result == "Victory":
-            if game_state.combat_state and objective.target in game_state.combat_state.get("participants", []):
-                 target_match = True
-
-        elif objective.type == "reach_location" and intent == "move":
-            if game_state.current_location_id == objective.target:
-                target_match = True
-
-        elif objective.type == "give_item" and intent == "give_item":
-            item_name = intent_data.get("target")
-            recipient_name = intent_data.get("recipient")
-            required_recipient = objective.details.get("recipient")
-            if (item_name and objective.target.lower() in item_name.lower() and
-                recipient_name and required_recipient and required_recipient.lower() in recipient_name.lower()):
-                 target_match = True
-
-        if target_match:
-            objective.current_count += 1
-            if objective.current_count >= objective.required_count:
-                objective.is_complete = True
-                logging.info(f"Quest '{objective.id}' objective completed.")
-                display.show_objective_complete(objective.description)
-                return True
-        
-        return False
+        for quest in completed_quests:
+            self._complete_quest(game_state, quest, display)
+
+    def _matching_objectives(self, event: GameEvent) -> List[Tuple[Quest, Objective]]:
+        event_type, target = event.key
+        matches = list(self._index.get((event_type, target), ()))
+        if event_type in (ITEM_ACQUIRED, ITEM_GIVEN):
+            # An objective may name an item by its last words ("amulet" for "mysterious silver amulet").
+            words = target.split()
+            for start in range(1, len(words)):
+                matches.extend(self._index.get((event_type, " ".join(words[start:])), ()))
+        return matches
+
+    @staticmethod
+    def _recipient_matches(objective: Objective, event: GameEvent) -> bool:
+        required = objective.details.get("recipient")
+        return bool(required and event.recipient and normalize_target(required) in normalize_target(event.recipient))
+
+    def _ensure_index(self, game_state: GameState):
+        if self._indexed_log is game_state.quest_log and self._indexed_count == len(game_state.quest_log):
+            return
+        self._index = {}
+        for quest in game_state.quest_log.values():
+            self._register_quest(quest)
+        self._indexed_log = game_state.quest_log
+        self._indexed_count = len(game_state.quest_log)
+        logging.info(f"Indexed the objectives of {len(game_state.quest_log)} quests ({len(self._index)} keys).")
+
+    def _register_quest(self, quest: Quest):
+        if quest.status != "active":
+            return
+        for objective in quest.objectives:
+            event_type = OBJECTIVE_EVENT_TYPES.get(objective.type)
+            if event_type is None:
+                logging.warning(f"Objective '{objective.id}' has unknown type '{objective.type}' and cannot be tracked.")
+                continue
+            if not objective.is_complete:
+                self._index.setdefault((event_type, normalize_target(objective.target)), []).append((quest, objective))
+
+    def _unregister_objective(self, quest: Quest, objective: Objective):
+        key = (OBJECTIVE_EVENT_TYPES[objective.type], normalize_target(objective.target))
+        entries = [entry for entry in self._index.get(key, ()) if entry[1] is not objective]
+        if entries:
+            self._index[key] = entries
+        else:
+            self._index.pop(key, None)
 
-    def _complete_quest(self, quest: Quest, display: DisplayManager):
+    def _complete_quest(self, game_state: GameState, quest: Quest, display: DisplayManager):
         quest.status = "completed"
+        game_state.emit(GameEvent(QUEST_COMPLETED, quest.id))
         logging.info(f"Quest '{quest.name}' has been completed by the player.")
         display.show_quest_complete(quest.name)
\ No newline at end of file
@@ -0,0 +1,207 @@
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from config import QUEST_OFFER_PREFETCH, QUEST_OFFER_WORKERS
+from game_events import OBJECTIVE_EVENT_TYPES
+from game_state import GameState, GameWorld, Character
+from quest_graph import QuestGraph
+
+if TYPE_CHECKING:
+    from ai_manager import AIManager
+
+QUEST_GIVER_TAGS = frozenset({"quest_giver", "quest-giver", "questgiver"})
+# Offer id for quest givers without an authored quest: the job is invented from their profile.
+OPEN_OFFER_ID = "open_offer"
+# Generation is retried this many times in total before the NPC falls back to on-demand generation.
+MAX_ATTEMPTS = 2
+
+# Quest chain data that only the game needs, left out of the outline sent to the model.
+OUTLINE_EXCLUDED_FIELDS = ("prerequisites", "on_accept", "on_complete")
+VALID_OBJECTIVE_TYPES = frozenset(OBJECTIVE_EVENT_TYPES)
+OBJECTIVE_FIELDS = ("id", "description", "type", "target", "required_count", "details")
+
+@dataclass
+class QuestOffer:
+    npc_name: str
+    offer_id: str
+    offer_text: str
+    quest_data: Dict[str, Any]
+    presented: bool = False
+
+def validate_offer(response: Any, outline: Optional[Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Checks a generated offer and returns (offer_text, quest_data) ready for QuestManager.start_quest, or None.
+
+    For an outlined (authored) quest only the offer text, name and description
+    come from the model; the objectives are the outline's, and an offer whose
+    objectives name different ids or targets is rejected, since its text would
+    promise a different job.
+    """
+    if not isinstance(response, dict):
+        return None
+    offer_text, quest = response.get("offer_text"), response.get("quest")
+    if not isinstance(offer_text, str) or not offer_text.strip() or not isinstance(quest, dict):
+        return None
+    name = quest.get("name") or (outline or {}).get("name")
+    if not isinstance(name, str) or not name:
+        return None
+
+    objectives = _validate_objectives(quest.get("objectives"))
+    if outline:
+        expected = [{key: objective[key] for key in OBJECTIVE_FIELDS if key in objective} for objective in outline.get("objectives", [])]
+        if objectives is None or [(o["id"], o["target"]) for o in objectives] != [(o["id"], o["target"]) for o in expected]:
+            return None
+        objectives = expected
+    elif not objectives:
+        return None
+
+    quest_id = outline["id"] if outline else quest.get("id")
+    if not isinstance(quest_id, str) or not quest_id:
+        quest_id = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    description = quest.get("description")
+    if not isinstance(description, str) or not description:
+        description = (outline or {}).get("description", "")
+    quest_data = {
+        "id": quest_id,
+        "name": name,
+        "description": description,
+        "objectives": objectives,
+    }
+    return offer_text.strip(), quest_data
+
+def _validate_objectives(raw: Any) -> Optional[List[Dict[str, Any]]]:
+    """The model's objectives, reduced to the fields Objective accepts, or None if any is malformed."""
+    if not isinstance(raw, list):
+        return None
+    objectives = []
+    for objective in raw:
+        if not isinstance(objective, dict) or objective.get("type") not in VALID_OBJECTIVE_TYPES:
+            return None
+        if not all(isinstance(objective.get(key), str) and objective[key] for key in ("id", "description", "target")):
+            return None
+        count = objective.get("required_count", 1)
+        if not isinstance(count, int) or count < 1:
+            return None
+        if not isinstance(objective.get("details", {}), dict):
+            return None
+        # Objective(**data) rejects unknown keys, so only the known ones are kept.
+        objectives.append({key: objective[key] for key in OBJECTIVE_FIELDS if key in objective})
+    return objectives
+
+class QuestOfferManager:
+    """
+    Generates quest offers ahead of time, on a background thread.
+
+    When the player arrives somewhere, every quest giver there gets one job
+    per offer (each of their available_quest_ids, or OPEN_OFFER_ID for NPCs
+    with only a quest-giver tag). The model writes the spoken offer and the
+    quest in one response, so what the NPC promises is what the player gets.
+    Validated offers are cached per (NPC, offer) until accepted.
+
+    Background responses are not part of any turn, so the handlers pass what
+    they use through AIManager.resolve_prefetched, which records it in the
+    turn journal (and returns the recorded value during a replay).
+    """
+
+    def __init__(self, max_workers: int = QUEST_OFFER_WORKERS, enabled: bool = QUEST_OFFER_PREFETCH, quest_graph: Optional[QuestGraph] = None):
+        self.max_workers = max_workers
+        self.quest_graph = quest_graph
+        self.enabled = enabled
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._offers: Dict[Tuple[str, str], QuestOffer] = {}
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        logging.info(f"QuestOfferManager initialized ({'enabled' if enabled else 'disabled'}, {max_workers} workers).")
+
+    @staticmethod
+    def offer_ids(npc: Character) -> List[str]:
+        if npc.available_quest_ids:
+            return list(npc.available_quest_ids)
+        if QUEST_GIVER_TAGS.intersection(npc.personality_tags):
+            return [OPEN_OFFER_ID]
+        return []
+
+    def prefetch(self, game_state: GameState, world: GameWorld, ai_manager: 'AIManager'):
+        """Queues generation for the quest givers at the player's location. Cheap when nothing is missing."""
+        if not self.enabled:
+            return
+        location = game_state.get_current_location(world)
+        if not location:
+            return
+
+        for npc in location.characters:
+            for offer_id in self.offer_ids(npc):
+                key = (npc.name, offer_id)
+                if offer_id in game_state.quest_log:
+                    continue
+                if self.quest_graph and offer_id != OPEN_OFFER_ID and not self.quest_graph.is_available(game_state, world, offer_id):
+                    continue
+                with self._lock:
+                    if key in self._offers or key in self._pending or self._attempts.get(key, 0) >= MAX_ATTEMPTS:
+                        continue
+                    self._attempts[key] = self._attempts.get(key, 0) + 1
+
+                # Everything the worker needs is copied here, on the main thread.
+                template = None
+                if offer_id != OPEN_OFFER_ID:
+                    template = self.quest_graph.template(offer_id) if self.quest_graph else location.get_quest_by_id(offer_id)
+                outline = {k: v for k, v in template.to_dict().items() if k not in OUTLINE_EXCLUDED_FIELDS} if template else None
+                profile = {
+                    "name": npc.name,
+                    "description": npc.description,
+                    "personality_tags": list(npc.personality_tags),
+                    "mood": npc.mood,
+                    "faction": npc.faction,
+                }
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="quest-offers")
+                with self._lock:
+                    self._pending[key] = self._executor.submit(self._generate, key, profile, location.name, outline, ai_manager)
+
+    def _generate(self, key: Tuple[str, str], profile: Dict[str, Any], location_name: str, outline: Optional[Dict[str, Any]], ai_manager: 'AIManager'):
+        validated = None
+        try:
+            validated = validate_offer(ai_manager.generate_quest_offer(profile, location_name, outline), outline)
+        except Exception as e:
+            logging.error(f"Quest offer generation for {key} failed. Error: {e}")
+        with self._lock:
+            self._pending.pop(key, None)
+            if validated:
+                offer_text, quest_data = validated
+                self._offers[key] = QuestOffer(npc_name=key[0], offer_id=key[1], offer_text=offer_text, quest_data=quest_data)
+                logging.info(f"Quest offer {key} is ready.")
+            else:
+                logging.warning(f"Quest offer {key} was missing or invalid (attempt {self._attempts.get(key, 0)} of {MAX_ATTEMPTS}).")
+
+    def ready_offer(self, npc: Character, offer_id: str) -> Optional[QuestOffer]:
+        with self._lock:
+            return self._offers.get((npc.name, offer_id))
+
+    def mark_presented(self, offer: QuestOffer):
+        with self._lock:
+            offer.presented = True
+
+    def presented_offer(self, npc: Character) -> Optional[QuestOffer]:
+        with self._lock:
+            return next((o for key, o in self._offers.items() if key[0] == npc.name and o.presented), None)
+
+    def consume(self, offer: QuestOffer):
+        """Drops an accepted offer from the cache."""
+        with self._lock:
+            self._offers.pop((offer.npc_name, offer.offer_id), None)
+
+    def wait_for_pending(self, timeout: Optional[float] = None):
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            future.result(timeout=timeout)
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,62 +1,84 @@
 import logging
 from typing import Dict, Any, Optional
 
+import numpy as np
+
+from definitions.factions import FactionRegistry
+from game_events import GameEvent, REPUTATION_CHANGED
 from game_state import GameState, Character
 from display_manager import DisplayManager
 
+# A score above (or at) each edge moves up one level; scores are whole numbers.
+LEVEL_EDGES = np.array([-50, -20, -5, 6, 21, 51])
+LEVEL_NAMES = ("hated", "disliked", "unfriendly", "neutral", "friendly", "trusted", "revered")
+
 class ReputationManager:
-    
-    def __init__(self):
+    """
+    Applies reputation changes from player actions, using the factions in data/factions.
+
+    A change with one faction is spread to its allies and rivals through the
+    registry's affinity matrix in one vectorized update. Scores are mirrored
+    in an array (game_state.reputation stays the saved copy) along with each
+    faction's level, and only the entries an event changed are recomputed.
+    """
+
+    def __init__(self, factions: Optional[FactionRegistry] = None):
+        if factions is None:
+            factions = FactionRegistry()
+            factions.load()
+        self.factions = factions
+        self._scores = np.zeros(len(factions.ids), dtype=np.int64)
+        self._levels = np.searchsorted(LEVEL_EDGES, self._scores, side="right")
+        self._synced_reputation: Optional[Dict[str, int]] = None
         logging.info("ReputationManager initialized.")
-        self.reputation_map = {
-            "town_guard": {
-                "give_item": 5,
-                "attack": -50,
-            },
-            "thieves_guild": {
-                "attack": -20,
-                "give_item": 2,
-            }
-        }
 
     def process_event(self, game_state: GameState, intent: str, display: DisplayManager, target: Optional[Character] = None):
         if not target or not target.faction:
             return
 
-        faction = target.faction
-        intent_effects = self.reputation_map.get(faction)
-
-        if not intent_effects:
+        faction = self.factions.get(target.faction)
+        if not faction:
             return
 
-        reputation_change = intent_effects.get(intent, 0)
+        reputation_change = faction.intent_effects.get(intent, 0)
 
         if reputation_change != 0:
-            self._adjust_reputation(game_state, faction, reputation_change, display)
+            self._adjust_reputation(game_state, faction.id, reputation_change, display)
 
     def _adjust_reputation(self, game_state: GameState, faction: str, amount: int, display: DisplayManager):
-        if faction not in game_state.reputation:
-            game_state.reputation[faction] = 0
-        
-        game_state.reputation[faction] += amount
-        
-        logging.info(f"Reputation with '{faction}' changed by {amount}. New reputation: {game_state.reputation[faction]}.")
-        display.show_reputation_change(faction, amount)
-            
-    def get_reputation_level(self, game_state: GameState, faction: str) -> str:
-        score = game_state.reputation.get(faction, 0)
-        
-        if score > 50:
-            return "revered"
-        elif score > 20:
-            return "trusted"
-        elif score > 5:
-            return "friendly"
-        elif score < -50:
-            return "hated"
-        elif score < -20:
-            return "disliked"
-        elif score < -5:
-            return "unfriendly"
+        self._sync(game_state)
+        row = self.factions.index.get(faction)
+        if row is None:
+            # Not in the data, so it has no relations to spread to.
+            game_state.reputation[faction] = game_state.reputation.get(faction, 0) + amount
+            changed = {faction: amount}
         else:
-            return "neutral"
\ No newline at end of file
+            deltas = np.rint(self.factions.affinity[row] * amount).astype(np.int64)
+            columns = np.flatnonzero(deltas)
+            self._scores[columns] += deltas[columns]
+            self._levels[columns] = np.searchsorted(LEVEL_EDGES, self._scores[columns], side="right")
+            faction_ids = [self.factions.ids[column] for column in columns.tolist()]
+            game_state.reputation.update(zip(faction_ids, self._scores[columns].tolist()))
+            changed = dict(zip(faction_ids, deltas[columns].tolist()))
+
+        game_state.mark_changed()
+        logging.info(f"Reputation with '{faction}' changed by {amount}. Changes: {changed}.")
+        for faction_id, delta in changed.items():
+            game_state.emit(GameEvent(REPUTATION_CHANGED, faction_id))
+            display.show_reputation_change(faction_id, delta)
+
+    def _sync(self, game_state: GameState):
+        # A new game, a loaded save or an undo brings its own reputation dict.
+        if self._synced_reputation is game_state.reputation:
+            return
+        self._scores = np.array([game_state.reputation.get(faction_id, 0) for faction_id in self.factions.ids], dtype=np.int64)
+        self._levels = np.searchsorted(LEVEL_EDGES, self._scores, side="right")
+        self._synced_reputation = game_state.reputation
+
+    def get_reputation_level(self, game_state: GameState, faction: str) -> str:
+        self._sync(game_state)
+        column = self.factions.index.get(faction)
+        if column is None:
+            score = game_state.reputation.get(faction, 0)
+            return LEVEL_NAMES[int(np.searchsorted(LEVEL_EDGES, score, side="right"))]
+        return LEVEL_NAMES[self._levels[column]]
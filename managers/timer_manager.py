@@ -0,0 +1,45 @@
+import logging
+from typing import Callable, Dict, TYPE_CHECKING
+
+from timers import MINUTES, TURNS, Timer
+
+if TYPE_CHECKING:
+    from game_state import GameState, GameWorld
+    from display_manager import DisplayManager
+
+TimerHandler = Callable[['GameState', 'GameWorld', Timer, int, 'DisplayManager'], None]
+
+class TimerManager:
+    """
+    Fires the game's timers (status effects, NPC cooldowns, ...) once per turn.
+
+    The timers live in game_state.timers so they are saved with the game;
+    this dispatches the ones that came due to the handler registered for
+    their kind. A handler gets how many times a periodic timer fired, so a
+    long rest is one call per timer rather than one per minute.
+    """
+
+    def __init__(self, handlers: Dict[str, TimerHandler] = None):
+        self.handlers: Dict[str, TimerHandler] = dict(handlers or {})
+        logging.info("TimerManager initialized.")
+
+    def register(self, kind: str, handler: TimerHandler):
+        self.handlers[kind] = handler
+
+    def advance(self, game_state: 'GameState', world: 'GameWorld', display: 'DisplayManager'):
+        for clock, now in ((MINUTES, game_state.minutes_elapsed), (TURNS, game_state.turn_count)):
+            fired = game_state.timers.advance(clock, now)
+            if not fired:
+                continue
+            game_state.mark_changed()
+            for timer, firings in fired:
+                if timer.cancelled:
+                    continue  # cancelled by a handler earlier in this batch
+                handler = self.handlers.get(timer.kind)
+                if handler is None:
+                    logging.warning(f"No handler for timer {timer.id} of kind '{timer.kind}'.")
+                    continue
+                try:
+                    handler(game_state, world, timer, firings, display)
+                except Exception as e:
+                    logging.error(f"Timer handler for '{timer.kind}' failed on timer {timer.id}: {e}", exc_info=True)
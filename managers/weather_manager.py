@@ -1,6 +1,57 @@
+import logging
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from weather import WeatherModel
+
+if TYPE_CHECKING:
+    from game_state import GameState, GameWorld
+    from ai_manager import AIManager
+
 class WeatherManager:
+    """
+    Keeps the weather in game_state.weather, where the AI sees it as context.
+
+    The weather comes from a local WeatherModel seeded by the game, so it costs
+    no model calls. The context is only rewritten when the weather class at
+    the player's location changes (or the player walks into another region).
+    """
+
     def __init__(self):
-        pass
+        self.model: Optional[WeatherModel] = None
+        logging.info("WeatherManager initialized.")
+
+    def update_weather(self, game_state: 'GameState', world: 'GameWorld', ai_manager: Optional['AIManager'] = None) -> List[Dict[str, Any]]:
+        """Hourly update. The weather lives in the context, so there are no world mutations to return."""
+        model = self._model(game_state)
+        hour = game_state.minutes_elapsed // 60
+        previous = model.snapshot(world, hour - 1)
+        current = model.snapshot(world, hour)
+        changed = int(np.count_nonzero(previous.condition != current.condition))
+        if changed:
+            logging.info(f"Weather changed in {changed} of {len(model.region_ids)} regions at hour {hour}.")
+        self.refresh(game_state, world)
+        return []
+
+    def refresh(self, game_state: 'GameState', world: 'GameWorld'):
+        """Brings the weather at the player's location into the context. Cheap when nothing changed."""
+        model = self._model(game_state)
+        region = model.region(world, game_state.current_location_id)
+        if region is None:
+            return
+        weather = model.snapshot(world, game_state.minutes_elapsed // 60).describe(region)
+        weather["region"] = model.region_ids[region]
+        current = {key: value for key, value in game_state.weather.items() if key not in ("seed", "temperature_c")}
+        if current == {key: value for key, value in weather.items() if key != "temperature_c"}:
+            return
+        game_state.weather = {"seed": model.seed, **weather}
+        game_state.mark_changed()
+        logging.info(f"Weather at '{game_state.current_location_id}' is now {weather['condition']}, {weather['temperature']}, {weather['wind']}.")
 
-    def update_weather(self, *args, **kwargs):
-        return []
\ No newline at end of file
+    def _model(self, game_state: 'GameState') -> WeatherModel:
+        # Saves from before the weather was simulated have no seed; they all share seed 0.
+        seed = game_state.weather.get("seed", 0)
+        if self.model is None or self.model.seed != seed:
+            self.model = WeatherModel(seed)
+        return self.model
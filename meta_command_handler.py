@@ -2,17 +2,23 @@ import logging
 from typing import List, Optional, Tuple
 
 from game_state import GameState, GameWorld, Character, Item
+from autosave import AutosaveService
 from persistence import PersistenceManager
 from game_mechanics import calculate_stat_modifier
 from display_manager import DisplayManager
+from undo_history import UndoHistory
 
 class MetaCommandHandler:
-    def __init__(self, persistence_manager: PersistenceManager):
+    def __init__(self, persistence_manager: PersistenceManager, undo_history: Optional[UndoHistory] = None, save_service: Optional[AutosaveService] = None):
         self.persistence_manager = persistence_manager
+        self.undo_history = undo_history
+        # Writes manual saves on the autosave worker, so they never race an autosave.
+        self.save_service = save_service
         
-        self.no_arg_commands = {"quit", "exit", "inventory", "i", "stats", "character", "quests", "journal", "equipment", "eq", "help"}
-        self.arg_commands = {"save", "load"}
-        self.all_commands = self.no_arg_commands.union(self.arg_commands)
+        self.no_arg_commands = {"quit", "exit", "inventory", "i", "stats", "character", "quests", "journal", "equipment", "eq", "help", "saves"}
+        self.arg_commands = {"save", "load", "delete"}
+        self.optional_arg_commands = {"undo"}
+        self.all_commands = self.no_arg_commands | self.arg_commands | self.optional_arg_commands
 
     def handle_command(self, full_input: str, game_state: GameState, world: GameWorld, display: DisplayManager) -> Tuple[bool, Optional[GameState], Optional[GameWorld]]:
         command_parts = full_input.lower().split()
@@ -24,6 +30,9 @@ class MetaCommandHandler:
         if command in self.no_arg_commands and len(command_parts) > 1:
             return False, game_state, world
         
+        if command in self.optional_arg_commands and (len(command_parts) > 2 or (len(command_parts) == 2 and not command_parts[1].isdigit())):
+            return False, game_state, world
+
         if command in self.arg_commands and len(command_parts) == 1:
             display.system_message(f"Usage: {command} <name>")
             return True, game_state, world
@@ -40,11 +49,28 @@ class MetaCommandHandler:
             loaded_data = self._handle_load(command_parts, display)
             if loaded_data:
                 game_state, world = loaded_data
+                if self.undo_history is not None:
+                    self.undo_history.reset(game_state, world)
                 display.system_message(f"Game loaded from slot '{command_parts[1]}'.")
                 display.show_location(game_state.get_current_location(world))
                 return True, game_state, world
             return True, game_state, world
 
+        elif command == "undo":
+            restored_state = self._handle_undo(command_parts, world, display)
+            if restored_state:
+                display.show_location(restored_state.get_current_location(world))
+                return True, restored_state, world
+            return True, game_state, world
+
+        elif command == "delete":
+            self._handle_delete(command_parts, display)
+            return True, game_state, world
+
+        elif command == "saves":
+            display.show_save_summaries(self.persistence_manager.list_save_metadata())
+            return True, game_state, world
+
         elif command in ["inventory", "i"]:
             display.show_inventory(game_state.player)
             return True, game_state, world
@@ -73,13 +99,38 @@ class MetaCommandHandler:
     def _handle_save(self, command_parts: List[str], game_state: GameState, world: GameWorld, display: DisplayManager):
         if len(command_parts) > 1:
             slot_name = command_parts[1]
-            if self.persistence_manager.save_game(game_state, world, slot_name):
+            if self.save_service:
+                saved = self.save_service.submit_save(game_state, world, slot_name).result()
+            else:
+                saved = self.persistence_manager.save_game(game_state, world, slot_name)
+            if saved:
                 display.system_message(f"Game saved to slot '{slot_name}'.")
             else:
                 display.show_error("Failed to save the game.")
         else:
             display.system_message("Usage: save <slot_name>")
             
+    def _handle_undo(self, command_parts: List[str], world: GameWorld, display: DisplayManager) -> Optional[GameState]:
+        if self.undo_history is None:
+            display.show_error("Undo is not available.")
+            return None
+        turns = int(command_parts[1]) if len(command_parts) == 2 else 1
+        available = len(self.undo_history)
+        if turns < 1 or turns > available:
+            display.show_error(f"You can undo between 1 and {available} turns right now.")
+            return None
+        restored_state = self.undo_history.undo(world, turns)
+        if restored_state:
+            display.system_message(f"Rewound {turns} turn{'s' if turns != 1 else ''}.")
+        return restored_state
+
+    def _handle_delete(self, command_parts: List[str], display: DisplayManager):
+        slot_name = command_parts[1]
+        if self.persistence_manager.delete_game(slot_name):
+            display.system_message(f"Deleted save slot '{slot_name}'.")
+        else:
+            display.show_error(f"No save found in slot '{slot_name}'.")
+
     def _handle_load(self, command_parts: List[str], display: DisplayManager) -> Optional[Tuple[GameState, GameWorld]]:
         if len(command_parts) > 1:
             slot_name = command_parts[1]
@@ -0,0 +1,217 @@
+import heapq
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import NPC_REGEN_HP_PER_HOUR, NPC_SIM_RADIUS
+from definitions.entities import Character
+from definitions.world_objects import Location
+from game_state import GameState, GameWorld
+
+def schedule_hours(character: Character) -> List[Tuple[int, str]]:
+    """The NPC's schedule as sorted (hour of day, location id) pairs; "08:00" -> 8."""
+    hours = []
+    for time_of_day, location_id in (character.schedule or {}).items():
+        try:
+            hours.append((int(time_of_day.split(":")[0]) % 24, location_id))
+        except ValueError:
+            logging.warning(f"NPC '{character.name}' has an invalid schedule time '{time_of_day}'.")
+    return sorted(hours)
+
+def next_wake_hour(hours: List[Tuple[int, str]], after_hour: int) -> Optional[Tuple[int, str]]:
+    """The first absolute game hour after after_hour with a schedule entry, and where it sends the NPC."""
+    best = None
+    for hour_of_day, location_id in hours:
+        delta = (hour_of_day - after_hour) % 24 or 24
+        if best is None or delta < best[0] - after_hour:
+            best = (after_hour + delta, location_id)
+    return best
+
+@dataclass
+class _NPCState:
+    """What the scheduler knows about one NPC. Kept per Character object, since NPC names need not be unique."""
+    character: Character
+    location_id: str
+    simulated_hour: int
+    next_wake: Optional[int] = None
+
+class NPCScheduler:
+    """
+    Level-of-detail simulation of the NPCs in the world.
+
+    NPCs within NPC_SIM_RADIUS exits of the player are simulated every game
+    hour. Everyone else is left alone: scheduled moves are kept in a heap of
+    wake-ups, so an hour only touches the NPCs due to move, and the rest of a
+    distant NPC's simulation (recovering hit points, ...) is applied in one
+    aggregate step when it wakes or when the player comes near. The cost of
+    an hour follows the NPCs near the player and the wake-ups due, not the
+    size of the world.
+
+    The scheduler is runtime state: a new world, or an undo that replaces
+    locations (GameWorld.revision), starts it afresh from the NPCs in the world.
+    """
+
+    def __init__(self, radius: int = NPC_SIM_RADIUS, regen_per_hour: int = NPC_REGEN_HP_PER_HOUR):
+        self.radius = radius
+        self.regen_per_hour = regen_per_hour
+        # (wake hour, sequence, destination id, character)
+        self._wakeups: List[Tuple[int, int, str, Character]] = []
+        # Keyed by id(character); _state() checks the entry still belongs to that object.
+        self._npcs: Dict[int, _NPCState] = {}
+        self._sequence = 0
+        self._world: Optional[GameWorld] = None
+        self._world_revision = 0
+        self._known_locations: Set[str] = set()
+        self._near: Set[str] = set()
+        self._near_center: Optional[str] = None
+
+    def advance(self, game_state: GameState, world: GameWorld, old_hour: int, new_hour: int):
+        """Simulates the hours after old_hour up to and including new_hour."""
+        self._ensure(world, old_hour)
+        self._refresh_near(game_state, world, old_hour)
+        moved = 0
+        for hour in range(old_hour + 1, new_hour + 1):
+            while self._wakeups and self._wakeups[0][0] <= hour:
+                wake_hour, _, destination_id, character = heapq.heappop(self._wakeups)
+                state = self._state(character)
+                if not state or state.next_wake != wake_hour:
+                    continue  # superseded
+                moved += self._wake(game_state, world, state, destination_id, hour)
+            for location_id in self._near:
+                location = world.get_location(location_id)
+                if location:
+                    for character in location.characters:
+                        self._catch_up(game_state, character, location_id, hour)
+        logging.info(f"Simulated hours {old_hour + 1}-{new_hour}: {moved} scheduled moves, {len(self._near)} nearby locations.")
+
+    def catch_up_nearby(self, game_state: GameState, world: GameWorld):
+        """Brings the NPCs around the player up to date after the player moves. Cheap when they haven't."""
+        hour = game_state.minutes_elapsed // 60
+        self._ensure(world, hour)
+        self._refresh_near(game_state, world, hour)
+
+    def _refresh_near(self, game_state: GameState, world: GameWorld, hour: int):
+        if self._near_center == game_state.current_location_id:
+            return
+        self._near = self._nearby_locations(world, game_state.current_location_id)
+        self._near_center = game_state.current_location_id
+        for location_id in self._near:
+            location = world.get_location(location_id)
+            if location:
+                for character in location.characters:
+                    self._catch_up(game_state, character, location_id, hour)
+
+    def _wake(self, game_state: GameState, world: GameWorld, state: _NPCState, destination_id: str, hour: int) -> int:
+        character = state.character
+        name = character.name
+        location = self._find(world, state)
+        if not location:
+            del self._npcs[id(character)]
+            return 0
+        self._schedule(state, hour)
+        self._catch_up(game_state, character, location.id, hour)
+        if location.id == destination_id or (game_state.combat_state and character in game_state.combat_state):
+            return 0
+        destination = world.get_location(destination_id)
+        if not destination:
+            logging.warning(f"NPC '{name}' is scheduled to move to unknown location '{destination_id}'.")
+            return 0
+
+        # NPCs walk their route one exit per hour. Without a known route they still arrive directly.
+        route = world.graph.shortest_path(location.id, destination_id)
+        next_stop = world.get_location(route[1]) if route and len(route) > 2 else None
+        if next_stop:
+            if state.next_wake is None or state.next_wake > hour + 1:
+                # The next leg supersedes the scheduled wake-up, which is pushed again when the NPC wakes.
+                self._push_wake(state, hour + 1, destination_id)
+            destination = next_stop
+        location.remove_character(character)
+        destination.add_character(character)
+        state.location_id = destination.id
+        game_state.mark_changed(location, destination)
+        logging.info(f"NPC '{name}' moved on schedule from '{location.id}' to '{destination.id}' (heading for '{destination_id}').")
+        return 1
+
+    def _catch_up(self, game_state: GameState, character: Character, location_id: str, hour: int):
+        """Applies the hours since the NPC was last simulated, in one step."""
+        state = self._state(character)
+        if state is None:
+            # Arrived from somewhere the scheduler has not registered yet.
+            self._register(character, location_id, hour)
+            return
+        state.location_id = location_id
+        last, state.simulated_hour = state.simulated_hour, hour
+        hours = hour - last
+        if hours <= 0 or character.hp <= 0 or character.hp >= character.max_hp:
+            return
+        if game_state.combat_state and character in game_state.combat_state:
+            return
+        character.hp = min(character.max_hp, character.hp + hours * self.regen_per_hour)
+        game_state.mark_changed(character)
+
+    def _state(self, character: Character) -> Optional[_NPCState]:
+        state = self._npcs.get(id(character))
+        return state if state is not None and state.character is character else None
+
+    def _register(self, character: Character, location_id: str, hour: int):
+        state = _NPCState(character, location_id, hour)
+        self._npcs[id(character)] = state
+        if character.schedule:
+            self._schedule(state, hour)
+
+    def _schedule(self, state: _NPCState, after_hour: int):
+        wake = next_wake_hour(schedule_hours(state.character), after_hour)
+        state.next_wake = None
+        if wake:
+            self._push_wake(state, *wake)
+
+    def _push_wake(self, state: _NPCState, hour: int, destination_id: str):
+        state.next_wake = hour
+        self._sequence += 1
+        heapq.heappush(self._wakeups, (hour, self._sequence, destination_id, state.character))
+
+    def _find(self, world: GameWorld, state: _NPCState) -> Optional[Location]:
+        character = state.character
+        location = world.get_location(state.location_id)
+        if location and any(c is character for c in location.characters):
+            return location
+        # Moved by something else (a world event, fleeing combat) or gone. Only loaded
+        # locations can hold this object, and another NPC may share its name.
+        for location_id, location in world.loaded_locations():
+            if any(c is character for c in location.characters):
+                state.location_id = location_id
+                return location
+        return None
+
+    def _ensure(self, world: GameWorld, hour: int):
+        if self._world is not world or self._world_revision != world.revision:
+            self._wakeups = []
+            self._npcs = {}
+            self._known_locations = set()
+            self._near_center = None
+            self._world = world
+            self._world_revision = world.revision
+        if len(self._known_locations) != world.loaded_location_count():
+            # Register the schedules in locations not seen yet (a new world, generated or lazily loaded locations).
+            for location_id, location in world.loaded_locations():
+                if location_id in self._known_locations:
+                    continue
+                for character in location.characters:
+                    if self._state(character) is None:
+                        self._register(character, location_id, hour)
+                self._known_locations.add(location_id)
+            self._near_center = None
+
+    def _nearby_locations(self, world: GameWorld, center_id: str) -> Set[str]:
+        near = {center_id}
+        frontier = deque([(center_id, 0)])
+        while frontier:
+            location_id, distance = frontier.popleft()
+            if distance == self.radius:
+                continue
+            for neighbor in world.graph.neighbors(location_id):
+                if neighbor not in near and neighbor in world.locations:
+                    near.add(neighbor)
+                    frontier.append((neighbor, distance + 1))
+        return near
@@ -1,37 +1,346 @@
 import json
 import logging
+import lzma
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from game_state import GameState, GameWorld, Character, Item, Location
+from change_tracking import ChangedLocations
+from config import SAVE_CODEC, SAVE_JOURNAL_COMPACTION_THRESHOLD
+from game_state import GameState, GameWorld
+from save_codecs import SaveCodec, decode_save, dumps_bytes, get_codec
+
+def _rotate_backups(file_path: Path, backups: int):
+    """Shifts <file>.bak1..bakN up by one and copies the current file to .bak1, leaving the file itself in place."""
+    oldest = file_path.with_name(f"{file_path.name}.bak{backups}")
+    oldest.unlink(missing_ok=True)
+    for index in range(backups - 1, 0, -1):
+        backup = file_path.with_name(f"{file_path.name}.bak{index}")
+        if backup.exists():
+            os.replace(backup, file_path.with_name(f"{file_path.name}.bak{index + 1}"))
+    if file_path.exists():
+        newest = file_path.with_name(f"{file_path.name}.bak1")
+        try:
+            # A hard link shares the data, and the later rename over file_path leaves it pointing at the old save.
+            os.link(file_path, newest)
+        except OSError:
+            shutil.copy2(file_path, newest)
+
+def atomic_write_bytes(file_path: Path, payload: bytes, backups: int = 0):
+    """
+    Writes ``payload`` to ``file_path`` so that readers only ever see the old or
+    the new file: the data goes to a temp file in the same directory, is
+    fsynced, and is then renamed over the target. Optionally keeps ``backups``
+    rotated copies of previous versions; they are made without moving the
+    target, so a crash at any point still leaves a complete save file.
+    """
+    fd, temp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if backups > 0:
+            _rotate_backups(file_path, backups)
+        os.replace(temp_name, file_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(file_path.parent, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def build_save_metadata(slot_name: str, game_state: GameState, world: GameWorld) -> Dict[str, Any]:
+    """The small summary record shown when listing saves."""
+    current_location = world.locations.get(game_state.current_location_id)
+    return {
+        "slot": slot_name,
+        "turn_count": game_state.turn_count,
+        "minutes_elapsed": game_state.minutes_elapsed,
+        "current_location_id": game_state.current_location_id,
+        "current_location_name": current_location.name if current_location else None,
+        "player_name": game_state.player.name,
+        "player_level": game_state.player.level,
+        "saved_at": time.time(),
+    }
+
+@dataclass
+class _SlotTracking:
+    """What a slot's snapshot plus journal currently contain for the live game objects."""
+    game_state: GameState
+    world: GameWorld
+    snapshot_id: str
+    # The locations changed since the last snapshot or delta was taken.
+    changes: ChangedLocations
+    journal_entries: int = 0
 
 class PersistenceManager:
-    def __init__(self, save_directory: str = "saves"):
+    """
+    Saves are a base snapshot (<slot>.json) plus an append-only journal of
+    deltas (<slot>.journal.jsonl). The first save of a game into a slot writes
+    the snapshot; later saves only append the game state and the locations
+    the turn ChangeSets report changed since the previous save, so their cost
+    follows the size of the change rather than the size of the world. Loading replays the
+    journal over the snapshot, and the journal is folded back into a fresh
+    snapshot once it grows past SAVE_JOURNAL_COMPACTION_THRESHOLD entries.
+
+    Snapshots are written with the configured SaveCodec (plain or compressed
+    JSON). Loading detects the codec from the file header, so slots written
+    with any codec, including old pretty-printed saves, stay loadable.
+
+    Every save also writes a small <slot>.meta.json sidecar and updates the
+    directory-wide index.json, so listing slots never opens a save body. A
+    missing or damaged index is rebuilt from the sidecars.
+    """
+
+    def __init__(
+        self,
+        save_directory: str = "saves",
+        compaction_threshold: int = SAVE_JOURNAL_COMPACTION_THRESHOLD,
+        codec: str = SAVE_CODEC,
+    ):
         self.save_path = Path(save_directory)
         self.save_path.mkdir(parents=True, exist_ok=True)
+        self.compaction_threshold = compaction_threshold
+        self.codec: SaveCodec = get_codec(codec)
+        self._tracking: Dict[str, _SlotTracking] = {}
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        # The autosave worker saves from its own thread.
+        self._index_lock = threading.Lock()
+        self._slot_locks: Dict[str, threading.RLock] = {}
+        self._slot_locks_guard = threading.Lock()
         logging.info(f"PersistenceManager initialized. Save directory: '{self.save_path.resolve()}'")
 
+    def _slot_lock(self, slot_name: str) -> threading.RLock:
+        """Serializes everything that reads or replaces one slot's files and tracking."""
+        with self._slot_locks_guard:
+            return self._slot_locks.setdefault(slot_name, threading.RLock())
+
     def get_save_file_path(self, slot_name: str) -> Path:
         return self.save_path / f"{slot_name}.json"
 
+    def get_journal_file_path(self, slot_name: str) -> Path:
+        return self.save_path / f"{slot_name}.journal.jsonl"
+
+    def get_metadata_file_path(self, slot_name: str) -> Path:
+        return self.save_path / f"{slot_name}.meta.json"
+
+    def get_index_file_path(self) -> Path:
+        return self.save_path / "index.json"
+
     def list_save_games(self) -> List[str]:
-        return [p.stem for p in self.save_path.glob("*.json")]
+        return [meta["slot"] for meta in self.list_save_metadata()]
+
+    def list_save_metadata(self) -> List[Dict[str, Any]]:
+        """Returns the metadata of every slot, most recently saved first."""
+        with self._index_lock:
+            entries = list(self._load_index().values())
+        return sorted(entries, key=lambda meta: meta.get("saved_at", 0), reverse=True)
+
+    def get_save_metadata(self, slot_name: str) -> Optional[Dict[str, Any]]:
+        with self._index_lock:
+            return self._load_index().get(slot_name)
+
+    def delete_game(self, slot_name: str) -> bool:
+        with self._slot_lock(slot_name):
+            file_path = self.get_save_file_path(slot_name)
+            existed = file_path.exists()
+            try:
+                file_path.unlink(missing_ok=True)
+                self.get_journal_file_path(slot_name).unlink(missing_ok=True)
+                self.get_metadata_file_path(slot_name).unlink(missing_ok=True)
+                for backup in self.save_path.glob(f"{slot_name}.json.bak*"):
+                    backup.unlink()
+                with self._index_lock:
+                    index = self._load_index()
+                    existed = index.pop(slot_name, None) is not None or existed
+                    self._write_index(index)
+            except IOError as e:
+                logging.error(f"Failed to delete save slot '{slot_name}'. Error: {e}")
+                return False
+            self._set_tracking(slot_name, None)
+        logging.info(f"Deleted save slot '{slot_name}'.")
+        return existed
+
+    def _record_metadata(self, metadata: Dict[str, Any]):
+        slot_name = metadata["slot"]
+        metadata = {**metadata, "codec": self.codec.name}
+        atomic_write_bytes(self.get_metadata_file_path(slot_name), json.dumps(metadata).encode("utf-8"))
+        with self._index_lock:
+            index = self._load_index()
+            index[slot_name] = metadata
+            self._write_index(index)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            try:
+                with open(self.get_index_file_path(), 'r') as f:
+                    self._index = json.load(f)["slots"]
+            except (IOError, json.JSONDecodeError, KeyError, TypeError):
+                self._index = self._rebuild_index()
+                self._write_index(self._index)
+        return self._index
+
+    def _rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        logging.info(f"Rebuilding save index in '{self.save_path}'...")
+        index = {}
+        for file_path in self.save_path.glob("*.json"):
+            slot_name = file_path.name[:-len(".json")]
+            if file_path.name == "index.json" or slot_name.endswith(".meta"):
+                continue
+            try:
+                with open(self.get_metadata_file_path(slot_name), 'r') as f:
+                    index[slot_name] = json.load(f)
+            except (IOError, json.JSONDecodeError):
+                # Saves from before sidecars existed are listed by name only.
+                index[slot_name] = {"slot": slot_name, "saved_at": file_path.stat().st_mtime}
+        return index
+
+    def _write_index(self, index: Dict[str, Dict[str, Any]]):
+        atomic_write_bytes(self.get_index_file_path(), json.dumps({"slots": index}).encode("utf-8"))
 
     def save_game(self, game_state: GameState, world: GameWorld, slot_name: str) -> bool:
-        file_path = self.get_save_file_path(slot_name)
-        logging.info(f"Attempting to save game to '{file_path}'...")
+        write = self.prepare_save(game_state, world, slot_name)
+        return write() if write else False
+
+    def prepare_save(self, game_state: GameState, world: GameWorld, slot_name: str) -> Optional[Callable[[], bool]]:
+        """
+        Serializes a save of the live game on the calling thread and returns the
+        function that writes it, or None if the game could not be serialized.
+        The writer touches no game objects, so the autosave worker can run it
+        while the game moves on.
+        """
+        # The autosave worker may replace this slot's snapshot (and drop its tracking) at any moment.
+        with self._slot_lock(slot_name):
+            tracking = self._tracking.get(slot_name)
+            can_append = (
+                tracking is not None
+                and tracking.game_state is game_state
+                and tracking.world is world
+                and tracking.journal_entries < self.compaction_threshold
+                and self.get_save_file_path(slot_name).exists()
+            )
+            try:
+                if can_append:
+                    assert tracking is not None
+                    return self._prepare_delta(game_state, world, slot_name, tracking)
+                return self._prepare_snapshot(game_state, world, slot_name)
+            except TypeError as e:
+                logging.error(f"Failed to serialize the game for slot '{slot_name}'. Error: {e}")
+                return None
+
+    def compact(self, game_state: GameState, world: GameWorld, slot_name: str) -> bool:
+        """Folds the journal into a fresh full snapshot."""
         try:
-            full_save_data = {
-                "game_state": game_state.to_dict(),
-                "game_world": world.to_dict()
-            }
-            with open(file_path, 'w') as f:
-                json.dump(full_save_data, f, indent=4)
-            logging.info(f"Game successfully saved to slot '{slot_name}'.")
-            return True
-        except (IOError, TypeError) as e:
-            logging.error(f"Failed to save game to slot '{slot_name}'. Error: {e}")
+            write = self._prepare_snapshot(game_state, world, slot_name)
+        except TypeError as e:
+            logging.error(f"Failed to serialize the game for slot '{slot_name}'. Error: {e}")
             return False
+        return write()
+
+    def _prepare_snapshot(self, game_state: GameState, world: GameWorld, slot_name: str) -> Callable[[], bool]:
+        snapshot_id = uuid.uuid4().hex
+        raw_json = dumps_bytes({
+            "snapshot_id": snapshot_id,
+            "game_state": game_state.to_dict(compact=True),
+            "game_world": world.to_dict(compact=True)
+        })
+        # Changes are collected from the moment the game was serialized.
+        new_tracking = _SlotTracking(game_state=game_state, world=world, snapshot_id=snapshot_id, changes=ChangedLocations(game_state, world))
+        metadata = build_save_metadata(slot_name, game_state, world)
+
+        def write() -> bool:
+            file_path = self.get_save_file_path(slot_name)
+            logging.info(f"Attempting to save full snapshot to '{file_path}'...")
+            with self._slot_lock(slot_name):
+                try:
+                    atomic_write_bytes(file_path, self.codec.encode_raw(raw_json))
+                    # Journal entries are tagged with the snapshot they apply to, so a stale
+                    # journal left behind by a crash right here is ignored on load.
+                    self.get_journal_file_path(slot_name).unlink(missing_ok=True)
+                    self._set_tracking(slot_name, new_tracking)
+                    self._record_metadata(metadata)
+                    logging.info(f"Game successfully saved to slot '{slot_name}'.")
+                    return True
+                except IOError as e:
+                    logging.error(f"Failed to save game to slot '{slot_name}'. Error: {e}")
+                    new_tracking.changes.close()
+                    return False
+        return write
+
+    def write_snapshot_text(self, slot_name: str, snapshot_text: str, backups: int = 0, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Atomically writes an already-serialized full snapshot, as produced by the autosave service."""
+        file_path = self.get_save_file_path(slot_name)
+        with self._slot_lock(slot_name):
+            try:
+                atomic_write_bytes(file_path, self.codec.encode_raw(snapshot_text.encode("utf-8")), backups=backups)
+                self.get_journal_file_path(slot_name).unlink(missing_ok=True)
+                self._set_tracking(slot_name, None)
+                self._record_metadata(metadata or {"slot": slot_name, "saved_at": time.time()})
+                return True
+            except IOError as e:
+                logging.error(f"Failed to write snapshot for slot '{slot_name}'. Error: {e}")
+                return False
+
+    def _prepare_delta(self, game_state: GameState, world: GameWorld, slot_name: str, tracking: _SlotTracking) -> Callable[[], bool]:
+        changed_locations = {loc_id: world.locations[loc_id] for loc_id in tracking.changes.take(world) if loc_id in world.locations}
+        delta = {
+            "snapshot_id": tracking.snapshot_id,
+            "game_state": game_state.to_dict(compact=True),
+            "locations": {loc_id: loc.to_dict(compact=True) for loc_id, loc in changed_locations.items()},
+        }
+        line = json.dumps(delta, separators=(",", ":")) + "\n"
+        metadata = build_save_metadata(slot_name, game_state, world)
+
+        def write() -> bool:
+            journal_path = self.get_journal_file_path(slot_name)
+            logging.info(f"Appending delta with {len(changed_locations)} changed locations to '{journal_path}'...")
+            with self._slot_lock(slot_name):
+                if self._tracking.get(slot_name) is not tracking:
+                    logging.error(f"Failed to append save delta for slot '{slot_name}': the slot was rewritten after the delta was taken.")
+                    return False
+                try:
+                    with open(journal_path, 'a') as f:
+                        f.write(line)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    tracking.journal_entries += 1
+                    self._record_metadata(metadata)
+                    logging.info(f"Game successfully saved to slot '{slot_name}' (journal entry {tracking.journal_entries}).")
+                    return True
+                except IOError as e:
+                    logging.error(f"Failed to append save delta for slot '{slot_name}'. Error: {e}")
+                    # The changes this delta carried are no longer pending, so the next save writes a full snapshot.
+                    self._set_tracking(slot_name, None)
+                    return False
+        return write
+
+    def _track(self, slot_name: str, game_state: GameState, world: GameWorld, snapshot_id: str, journal_entries: int = 0):
+        self._set_tracking(slot_name, _SlotTracking(
+            game_state=game_state,
+            world=world,
+            snapshot_id=snapshot_id,
+            changes=ChangedLocations(game_state, world),
+            journal_entries=journal_entries,
+        ))
+
+    def _set_tracking(self, slot_name: str, tracking: Optional[_SlotTracking]):
+        old = self._tracking.pop(slot_name, None)
+        if old and old is not tracking:
+            old.changes.close()
+        if tracking:
+            self._tracking[slot_name] = tracking
 
     def load_game(self, slot_name: str) -> Optional[Tuple[GameState, GameWorld]]:
         file_path = self.get_save_file_path(slot_name)
@@ -41,60 +350,49 @@ class PersistenceManager:
 
         logging.info(f"Attempting to load game from '{file_path}'...")
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-
-            world_data = data['game_world']
-            rebuilt_locations = {}
-            for loc_id, loc_data in world_data['locations'].items():
-                rebuilt_locations[loc_id] = self._rebuild_location(loc_data)
-            
-            world = GameWorld(locations=rebuilt_locations)
-
-            state_data = data['game_state']
-            player = self._rebuild_character(state_data['player'])
-            
-            game_state = GameState(
-                player=player,
-                current_location_id=state_data['current_location_id'],
-                turn_count=state_data.get('turn_count', 0),
-                minutes_elapsed=state_data.get('minutes_elapsed', 480)
-            )
-            
-            logging.info(f"Game successfully loaded from slot '{slot_name}'.")
+            # The snapshot and the journal are read, and a torn journal trimmed, as one unit.
+            with self._slot_lock(slot_name):
+                with open(file_path, 'rb') as f:
+                    data = decode_save(f.read())
+
+                journal_entries = self._replay_journal(slot_name, data)
+
+                world = GameWorld.from_dict(data['game_world'])
+                game_state = GameState.from_dict(data['game_state'], world)
+                self._track(slot_name, game_state, world, data.get('snapshot_id', ''), journal_entries)
+
+            logging.info(f"Game successfully loaded from slot '{slot_name}' ({journal_entries} journal entries replayed).")
             return game_state, world
 
-        except (IOError, json.JSONDecodeError, KeyError, TypeError) as e:
+        except (IOError, ValueError, KeyError, TypeError, zlib.error, lzma.LZMAError) as e:
             logging.error(f"Failed to load game from '{file_path}'. File may be corrupt. Error: {e}")
             return None
-    
-    def _rebuild_character(self, char_data: dict) -> Character:
-        inventory = [Item(**item) for item in char_data.get('inventory', [])]
-        
-        # Default HP to max_hp for backward compatibility with old saves
-        max_hp = char_data.get('max_hp', 20)
-        hp = char_data.get('hp', max_hp)
-
-        return Character(
-            name=char_data['name'],
-            description=char_data['description'],
-            stats=char_data['stats'],
-            inventory=inventory,
-            mood=char_data.get('mood', 'neutral'),
-            memory=char_data.get('memory', []),
-            hp=hp,
-            max_hp=max_hp,
-            status_effects=char_data.get('status_effects', [])
-        )
-
-    def _rebuild_location(self, loc_data: dict) -> Location:
-        items = [Item(**item) for item in loc_data.get('items', [])]
-        characters = [self._rebuild_character(char) for char in loc_data.get('characters', [])]
-        return Location(
-            id=loc_data['id'],
-            name=loc_data['name'],
-            description=loc_data['description'],
-            characters=characters,
-            items=items,
-            exits=loc_data.get('exits', {})
-        )
\ No newline at end of file
+
+    def _replay_journal(self, slot_name: str, data: Dict[str, Any]) -> int:
+        journal_path = self.get_journal_file_path(slot_name)
+        if not journal_path.exists():
+            return 0
+
+        entries = 0
+        good_lines = []
+        with open(journal_path, 'r') as f:
+            lines = f.readlines()
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                delta = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash during an append can only damage the final line. Drop it so
+                # that the next append does not get glued onto the torn entry.
+                logging.warning(f"Discarding unreadable journal entry {line_number} in '{journal_path}'.")
+                atomic_write_bytes(journal_path, "".join(good_lines).encode("utf-8"))
+                break
+            if delta.get('snapshot_id') != data.get('snapshot_id'):
+                logging.warning(f"Skipping journal entry {line_number} in '{journal_path}': it belongs to a different snapshot.")
+                continue
+            data['game_state'] = delta['game_state']
+            data['game_world']['locations'].update(delta.get('locations', {}))
+            good_lines.append(line)
+            entries += 1
+        return entries
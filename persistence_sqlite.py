@@ -0,0 +1,512 @@
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import MutableMapping
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from change_tracking import ChangedLocations
+from game_state import GameState, GameWorld, Character, Location
+from persistence import PersistenceManager
+
+PLAYER_OWNER = "@player"
+GROUND = -1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    slot TEXT PRIMARY KEY,
+    snapshot_id TEXT NOT NULL,
+    turn_count INTEGER NOT NULL,
+    minutes_elapsed INTEGER NOT NULL,
+    current_location_id TEXT NOT NULL,
+    current_location_name TEXT,
+    player_name TEXT NOT NULL,
+    player_level INTEGER NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS game_state (
+    slot TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS locations (
+    slot TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    exits TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (slot, location_id)
+);
+CREATE TABLE IF NOT EXISTS characters (
+    slot TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (slot, location_id, position)
+);
+CREATE TABLE IF NOT EXISTS items (
+    slot TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    holder INTEGER NOT NULL,
+    container TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (slot, location_id, holder, container, position)
+);
+CREATE TABLE IF NOT EXISTS quests (
+    slot TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    quest_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (slot, owner, position)
+);
+"""
+
+class LazyLocationMap(MutableMapping):
+    """
+    A GameWorld.locations mapping whose locations are only read from the
+    database the first time they are looked up. Iterating the map lists every
+    saved location id; reading a value loads just that location, so code that
+    walks the world should use GameWorld.loaded_locations() (and the name and
+    character indexes) rather than values() or items().
+    """
+
+    def __init__(
+        self,
+        exit_index: Dict[str, List[str]],
+        loader: Callable[[str], Optional[Location]],
+        name_index: Optional[Dict[str, str]] = None,
+        character_index: Optional[Dict[str, List[str]]] = None,
+        source_slot: Optional[str] = None,
+    ):
+        self.exit_index = exit_index
+        # Location names, and the locations each character (by lowercased name) was saved in.
+        self.name_index = name_index or {}
+        self.character_index = character_index or {}
+        # The slot still holding the rows of the locations that were never loaded.
+        self.source_slot = source_slot
+        self.load_listeners: List[Callable[[Location], None]] = []
+        self._loader = loader
+        self._loaded: Dict[str, Location] = {}
+        self._unloaded = set(exit_index)
+
+    def __getitem__(self, loc_id: str) -> Location:
+        location = self._loaded.get(loc_id)
+        if location is not None:
+            return location
+        if loc_id not in self._unloaded:
+            raise KeyError(loc_id)
+        location = self._loader(loc_id)
+        self._unloaded.discard(loc_id)
+        if location is None:
+            raise KeyError(loc_id)
+        self._loaded[loc_id] = location
+        for listener in list(self.load_listeners):
+            listener(location)
+        return location
+
+    def __setitem__(self, loc_id: str, location: Location):
+        self._unloaded.discard(loc_id)
+        self._loaded[loc_id] = location
+
+    def __delitem__(self, loc_id: str):
+        if loc_id in self._unloaded:
+            self._unloaded.discard(loc_id)
+        else:
+            del self._loaded[loc_id]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._loaded)
+        yield from list(self._unloaded)
+
+    def __len__(self) -> int:
+        return len(self._loaded) + len(self._unloaded)
+
+    def __contains__(self, loc_id: object) -> bool:
+        return loc_id in self._loaded or loc_id in self._unloaded
+
+    def loaded_items(self) -> List[Tuple[str, Location]]:
+        return list(self._loaded.items())
+
+    def loaded_count(self) -> int:
+        return len(self._loaded)
+
+    def is_loaded(self, loc_id: str) -> bool:
+        return loc_id in self._loaded
+
+    def unloaded_ids(self) -> List[str]:
+        return list(self._unloaded)
+
+
+@dataclass
+class _SlotTracking:
+    game_state: GameState
+    world: GameWorld
+    # The locations changed since the slot was last written.
+    changes: ChangedLocations
+
+
+class SQLitePersistenceManager:
+    """
+    A drop-in alternative to PersistenceManager that keeps every slot in one
+    SQLite database (WAL mode) with separate tables for the game state,
+    locations, characters, items and quests.
+
+    Saves are batched into a single transaction and, within a session, only
+    rewrite the locations the turn ChangeSets report changed. Loads read the game
+    state and each location's exits up front, and pull a location's rows in
+    only when the game first asks for it. Slot metadata lives in its own table,
+    so listing saves never touches world rows.
+    """
+
+    def __init__(self, save_directory: str = "saves", db_name: str = "saves.db"):
+        self.save_path = Path(save_directory)
+        self.save_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.save_path / db_name
+        self._tracking: Dict[str, _SlotTracking] = {}
+        self._slot_locks: Dict[str, threading.RLock] = {}
+        self._slot_locks_guard = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+        logging.info(f"SQLitePersistenceManager initialized. Database: '{self.db_path.resolve()}'")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps this safe to call from
+        # the autosave worker thread as well as the game loop.
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _slot_lock(self, slot_name: str) -> threading.RLock:
+        """Serializes everything that reads or replaces one slot's rows and tracking."""
+        with self._slot_locks_guard:
+            return self._slot_locks.setdefault(slot_name, threading.RLock())
+
+    def _set_tracking(self, slot_name: str, tracking: Optional[_SlotTracking]):
+        old = self._tracking.pop(slot_name, None)
+        if old and old is not tracking:
+            old.changes.close()
+        if tracking:
+            self._tracking[slot_name] = tracking
+
+    def get_save_file_path(self, slot_name: str) -> Path:
+        return self.db_path
+
+    def list_save_games(self) -> List[str]:
+        return [meta["slot"] for meta in self.list_save_metadata()]
+
+    def list_save_metadata(self) -> List[Dict[str, Any]]:
+        """Returns the metadata row of every slot, most recently saved first."""
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM saves ORDER BY saved_at DESC").fetchall()
+        return [dict(row) for row in rows]
+
+    def get_save_metadata(self, slot_name: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM saves WHERE slot = ?", (slot_name,)).fetchone()
+        return dict(row) if row else None
+
+    def save_game(self, game_state: GameState, world: GameWorld, slot_name: str) -> bool:
+        write = self.prepare_save(game_state, world, slot_name)
+        return write() if write else False
+
+    def prepare_save(self, game_state: GameState, world: GameWorld, slot_name: str) -> Optional[Callable[[], bool]]:
+        """Serializes a save on the calling thread and returns the function that writes it; see PersistenceManager.prepare_save."""
+        # The autosave worker may replace this slot (and drop its tracking) at any moment.
+        with self._slot_lock(slot_name):
+            tracking = self._tracking.get(slot_name)
+            incremental = tracking is not None and tracking.game_state is game_state and tracking.world is world
+
+            unloaded = None
+            if isinstance(world.locations, LazyLocationMap):
+                # Locations that were never loaded cannot have changed; a full save copies their rows over.
+                candidates = world.locations.loaded_items()
+                if not incremental:
+                    unloaded = (world.locations.source_slot, world.locations.unloaded_ids())
+            else:
+                candidates = list(world.locations.items())
+
+            if incremental:
+                assert tracking is not None
+                changed_ids = tracking.changes.take(world)
+                changed = [(loc_id, loc) for loc_id, loc in candidates if loc_id in changed_ids]
+                new_tracking = tracking
+            else:
+                changed = candidates
+                # Changes are collected from the moment the game was serialized.
+                new_tracking = _SlotTracking(game_state=game_state, world=world, changes=ChangedLocations(game_state, world))
+
+            try:
+                state_data = game_state.to_dict(compact=True)
+                location_rows = [location.to_dict(compact=True) for _, location in changed]
+            except TypeError as e:
+                logging.error(f"Failed to serialize the game for slot '{slot_name}'. Error: {e}")
+                if not incremental:
+                    new_tracking.changes.close()
+                return None
+            current_location = world.locations.get(game_state.current_location_id)
+
+        def write() -> bool:
+            logging.info(f"Attempting to save game to slot '{slot_name}' in '{self.db_path}'...")
+            with self._slot_lock(slot_name):
+                if incremental and self._tracking.get(slot_name) is not tracking:
+                    logging.error(f"Failed to save game to slot '{slot_name}': the slot was rewritten after the save was taken.")
+                    return False
+                try:
+                    with closing(self._connect()) as conn:
+                        with conn:
+                            if not incremental:
+                                self._clear_slot(conn, slot_name, unloaded)
+                            self._write_state_dict(conn, slot_name, state_data, current_location)
+                            for loc_data in location_rows:
+                                self._write_location(conn, slot_name, loc_data)
+                except sqlite3.Error as e:
+                    logging.error(f"Failed to save game to slot '{slot_name}'. Error: {e}")
+                    # The changes this save carried are no longer pending, so the next save is a full one.
+                    new_tracking.changes.close()
+                    self._set_tracking(slot_name, None)
+                    return False
+
+                self._set_tracking(slot_name, new_tracking)
+                logging.info(f"Game successfully saved to slot '{slot_name}' ({len(location_rows)} locations written).")
+                return True
+        return write
+
+    def write_snapshot_text(self, slot_name: str, snapshot_text: str, backups: int = 0, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Stores an already-serialized full snapshot, as produced by the autosave service. Metadata is derived from the snapshot itself."""
+        with self._slot_lock(slot_name):
+            try:
+                data = json.loads(snapshot_text)
+                self._import_snapshot(slot_name, data)
+                self._set_tracking(slot_name, None)
+                return True
+            except (json.JSONDecodeError, KeyError, sqlite3.Error) as e:
+                logging.error(f"Failed to write snapshot for slot '{slot_name}'. Error: {e}")
+                return False
+
+    def delete_game(self, slot_name: str) -> bool:
+        with self._slot_lock(slot_name):
+            with closing(self._connect()) as conn:
+                with conn:
+                    self._delete_slot_rows(conn, slot_name)
+                    deleted = conn.execute("DELETE FROM saves WHERE slot = ?", (slot_name,)).rowcount
+            self._set_tracking(slot_name, None)
+            return deleted > 0
+
+    def load_game(self, slot_name: str) -> Optional[Tuple[GameState, GameWorld]]:
+        logging.info(f"Attempting to load game from slot '{slot_name}' in '{self.db_path}'...")
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT data FROM game_state WHERE slot = ?", (slot_name,)).fetchone()
+                if not row:
+                    logging.warning(f"No save found for slot '{slot_name}'.")
+                    return None
+                state_data = json.loads(row[0])
+                state_data["player"] = self._read_character(conn, slot_name, PLAYER_OWNER, 0)
+                state_data["quest_log"] = {q["id"]: q for q in self._read_quests(conn, slot_name, PLAYER_OWNER)}
+                exit_index, name_index = {}, {}
+                for loc_id, exits, name in conn.execute(
+                        "SELECT location_id, exits, json_extract(data, '$.name') FROM locations WHERE slot = ?", (slot_name,)):
+                    exit_index[loc_id] = list(json.loads(exits).values())
+                    name_index[loc_id] = name or ""
+                character_index: Dict[str, List[str]] = {}
+                for loc_id, name in conn.execute(
+                        "SELECT location_id, name FROM characters WHERE slot = ? AND location_id != ?", (slot_name, PLAYER_OWNER)):
+                    character_index.setdefault(name.lower(), []).append(loc_id)
+
+            locations = LazyLocationMap(
+                exit_index, lambda loc_id: self._load_location(slot_name, loc_id),
+                name_index=name_index, character_index=character_index, source_slot=slot_name,
+            )
+            world = GameWorld(locations=locations)  # type: ignore[arg-type]
+            game_state = GameState.from_dict(state_data, world)
+            with self._slot_lock(slot_name):
+                self._set_tracking(slot_name, _SlotTracking(game_state=game_state, world=world, changes=ChangedLocations(game_state, world)))
+            logging.info(f"Game successfully loaded from slot '{slot_name}' ({len(exit_index)} locations available on demand).")
+            return game_state, world
+        except (sqlite3.Error, json.JSONDecodeError, KeyError, TypeError) as e:
+            logging.error(f"Failed to load game from slot '{slot_name}'. Error: {e}")
+            return None
+
+    def _load_location(self, slot_name: str, loc_id: str) -> Optional[Location]:
+        logging.info(f"Loading location '{loc_id}' from slot '{slot_name}' on demand.")
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT data FROM locations WHERE slot = ? AND location_id = ?", (slot_name, loc_id)).fetchone()
+            if not row:
+                return None
+            loc_data = json.loads(row[0])
+            positions = [p for (p,) in conn.execute(
+                "SELECT position FROM characters WHERE slot = ? AND location_id = ? ORDER BY position", (slot_name, loc_id))]
+            loc_data["characters"] = [self._read_character(conn, slot_name, loc_id, p) for p in positions]
+            loc_data["items"] = self._read_items(conn, slot_name, loc_id, GROUND, "ground")
+            loc_data["quests"] = self._read_quests(conn, slot_name, loc_id)
+
+        return Location.from_dict(loc_data)
+
+    def _read_character(self, conn: sqlite3.Connection, slot_name: str, loc_id: str, position: int) -> Dict[str, Any]:
+        row = conn.execute(
+            "SELECT data FROM characters WHERE slot = ? AND location_id = ? AND position = ?", (slot_name, loc_id, position)
+        ).fetchone()
+        char_data = json.loads(row[0])
+        char_data["inventory"] = self._read_items(conn, slot_name, loc_id, position, "inventory")
+        char_data["equipment"] = {
+            container.split(":", 1)[1]: json.loads(data)
+            for container, data in conn.execute(
+                "SELECT container, data FROM items WHERE slot = ? AND location_id = ? AND holder = ? AND container LIKE 'equipment:%'",
+                (slot_name, loc_id, position))
+        }
+        return char_data
+
+    def _read_items(self, conn: sqlite3.Connection, slot_name: str, loc_id: str, holder: int, container: str) -> List[Dict[str, Any]]:
+        return [json.loads(data) for (data,) in conn.execute(
+            "SELECT data FROM items WHERE slot = ? AND location_id = ? AND holder = ? AND container = ? ORDER BY position",
+            (slot_name, loc_id, holder, container))]
+
+    def _read_quests(self, conn: sqlite3.Connection, slot_name: str, owner: str) -> List[Dict[str, Any]]:
+        return [json.loads(data) for (data,) in conn.execute(
+            "SELECT data FROM quests WHERE slot = ? AND owner = ? ORDER BY position", (slot_name, owner))]
+
+    def _delete_slot_rows(self, conn: sqlite3.Connection, slot_name: str):
+        for table in ("game_state", "locations", "characters", "items", "quests"):
+            conn.execute(f"DELETE FROM {table} WHERE slot = ?", (slot_name,))
+
+    def _clear_slot(self, conn: sqlite3.Connection, slot_name: str, unloaded: Optional[Tuple[Optional[str], List[str]]]):
+        """
+        Empties a slot for a full save. `unloaded` names the slot and ids of locations that were never
+        loaded from it: their rows are kept when saving back into that slot, and copied over otherwise.
+        """
+        if unloaded and unloaded[0] == slot_name:
+            keep = set(unloaded[1])
+            stale = [loc_id for (loc_id,) in conn.execute("SELECT location_id FROM locations WHERE slot = ?", (slot_name,)) if loc_id not in keep]
+            for loc_id in stale:
+                self._delete_owner_rows(conn, slot_name, loc_id)
+            return
+        self._delete_slot_rows(conn, slot_name)
+        if unloaded and unloaded[0] and unloaded[1]:
+            rows = [(slot_name, unloaded[0], loc_id) for loc_id in unloaded[1]]
+            conn.executemany("INSERT INTO locations SELECT ?, location_id, exits, data FROM locations WHERE slot = ? AND location_id = ?", rows)
+            conn.executemany("INSERT INTO characters SELECT ?, location_id, position, name, data FROM characters WHERE slot = ? AND location_id = ?", rows)
+            conn.executemany("INSERT INTO items SELECT ?, location_id, holder, container, position, data FROM items WHERE slot = ? AND location_id = ?", rows)
+            conn.executemany("INSERT INTO quests SELECT ?, owner, position, quest_id, data FROM quests WHERE slot = ? AND owner = ?", rows)
+
+    def _delete_owner_rows(self, conn: sqlite3.Connection, slot_name: str, loc_id: str):
+        conn.execute("DELETE FROM locations WHERE slot = ? AND location_id = ?", (slot_name, loc_id))
+        conn.execute("DELETE FROM characters WHERE slot = ? AND location_id = ?", (slot_name, loc_id))
+        conn.execute("DELETE FROM items WHERE slot = ? AND location_id = ?", (slot_name, loc_id))
+        conn.execute("DELETE FROM quests WHERE slot = ? AND owner = ?", (slot_name, loc_id))
+
+    def _write_state_dict(self, conn: sqlite3.Connection, slot_name: str, state_data: Dict[str, Any], current_location: Optional[Location]):
+        state_rows = {k: v for k, v in state_data.items() if k not in ("player", "quest_log")}
+        player_data = state_data["player"]
+
+        conn.execute("INSERT OR REPLACE INTO game_state (slot, data) VALUES (?, ?)", (slot_name, json.dumps(state_rows)))
+        self._delete_owner_rows(conn, slot_name, PLAYER_OWNER)
+        self._write_characters(conn, slot_name, PLAYER_OWNER, [player_data])
+        self._write_quests(conn, slot_name, PLAYER_OWNER, list(state_data.get("quest_log", {}).values()))
+        conn.execute(
+            "INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                slot_name,
+                uuid.uuid4().hex,
+                state_data.get("turn_count", 0),
+                state_data.get("minutes_elapsed", 480),
+                state_data["current_location_id"],
+                current_location.name if current_location else None,
+                player_data["name"],
+                player_data.get("level", 1),
+                time.time(),
+            ),
+        )
+
+    def _write_location(self, conn: sqlite3.Connection, slot_name: str, loc_data: Dict[str, Any]):
+        loc_id = loc_data["id"]
+        self._delete_owner_rows(conn, slot_name, loc_id)
+        base = {k: v for k, v in loc_data.items() if k not in ("characters", "items", "quests")}
+        conn.execute(
+            "INSERT INTO locations (slot, location_id, exits, data) VALUES (?, ?, ?, ?)",
+            (slot_name, loc_id, json.dumps(loc_data.get("exits", {})), json.dumps(base)),
+        )
+        self._write_characters(conn, slot_name, loc_id, loc_data.get("characters", []))
+        conn.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, 'ground', ?, ?)",
+            [(slot_name, loc_id, GROUND, i, json.dumps(item)) for i, item in enumerate(loc_data.get("items", []))],
+        )
+        self._write_quests(conn, slot_name, loc_id, loc_data.get("quests", []))
+
+    def _write_characters(self, conn: sqlite3.Connection, slot_name: str, loc_id: str, characters: List[Dict[str, Any]]):
+        char_rows, item_rows = [], []
+        for position, char_data in enumerate(characters):
+            base = {k: v for k, v in char_data.items() if k not in ("inventory", "equipment")}
+            char_rows.append((slot_name, loc_id, position, char_data["name"], json.dumps(base)))
+            for i, item in enumerate(char_data.get("inventory", [])):
+                item_rows.append((slot_name, loc_id, position, "inventory", i, json.dumps(item)))
+            for equip_slot, item in char_data.get("equipment", {}).items():
+                item_rows.append((slot_name, loc_id, position, f"equipment:{equip_slot}", 0, json.dumps(item)))
+        conn.executemany("INSERT INTO characters VALUES (?, ?, ?, ?, ?)", char_rows)
+        conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)", item_rows)
+
+    def _write_quests(self, conn: sqlite3.Connection, slot_name: str, owner: str, quests: List[Dict[str, Any]]):
+        conn.executemany(
+            "INSERT INTO quests VALUES (?, ?, ?, ?, ?)",
+            [(slot_name, owner, i, q["id"], json.dumps(q)) for i, q in enumerate(quests)],
+        )
+
+    def _import_snapshot(self, slot_name: str, data: Dict[str, Any]):
+        locations = data["game_world"]["locations"]
+        current = locations.get(data["game_state"]["current_location_id"])
+        # Snapshots of a lazily loaded world list the locations still only in the slot they came from.
+        unloaded = data["game_world"].get("unloaded")
+        with closing(self._connect()) as conn:
+            with conn:
+                self._clear_slot(conn, slot_name, (unloaded["slot"], unloaded["location_ids"]) if unloaded else None)
+                self._write_state_dict(conn, slot_name, data["game_state"], Location.from_dict(current) if current else None)
+                for loc_data in locations.values():
+                    self._write_location(conn, slot_name, loc_data)
+
+
+def import_json_save(json_manager: PersistenceManager, sqlite_manager: SQLitePersistenceManager, slot_name: str) -> bool:
+    """Copies a JSON save slot (snapshot plus journal) into the SQLite store."""
+    loaded = json_manager.load_game(slot_name)
+    if not loaded:
+        return False
+    game_state, world = loaded
+    return sqlite_manager.save_game(game_state, world, slot_name)
+
+def export_json_save(sqlite_manager: SQLitePersistenceManager, json_manager: PersistenceManager, slot_name: str) -> bool:
+    """Writes a SQLite save slot out as a full JSON snapshot."""
+    loaded = sqlite_manager.load_game(slot_name)
+    if not loaded:
+        return False
+    game_state, world = loaded
+    return json_manager.save_game(game_state, world, slot_name)
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate save slots between the JSON and SQLite save formats.")
+    parser.add_argument("direction", choices=["import", "export"], help="'import' copies JSON -> SQLite, 'export' copies SQLite -> JSON.")
+    parser.add_argument("slots", nargs="*", help="Slots to migrate. Defaults to every slot in the source store.")
+    parser.add_argument("--save-dir", default="saves", help="Directory holding the saves.")
+    args = parser.parse_args()
+
+    json_manager = PersistenceManager(args.save_dir)
+    sqlite_manager = SQLitePersistenceManager(args.save_dir)
+    if args.direction == "import":
+        slots = args.slots or json_manager.list_save_games()
+        migrate = lambda slot: import_json_save(json_manager, sqlite_manager, slot)
+    else:
+        slots = args.slots or sqlite_manager.list_save_games()
+        migrate = lambda slot: export_json_save(sqlite_manager, json_manager, slot)
+
+    for slot in slots:
+        print(f"{args.direction} '{slot}': {'ok' if migrate(slot) else 'FAILED'}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 # prompts/__init__.py
 from .inference import INFERENCE_PROMPT
 from .mechanics import MECHANICS_PROMPT
-from .narration import NARRATION_PROMPT, NPC_STATE_UPDATE_PROMPT, DIALOGUE_GENERATION_PROMPT
+from .narration import NARRATION_PROMPT, NPC_STATE_UPDATE_PROMPT, DIALOGUE_GENERATION_PROMPT, COMBAT_FLAVOR_PROMPT
 from .world_building import LOCATION_GENERATION_PROMPT, WORLD_EVENT_PROMPT
-from .quest import QUEST_GENERATION_PROMPT
+from .quest import QUEST_GENERATION_PROMPT, QUEST_OFFER_PROMPT
 
 __all__ = [
     "INFERENCE_PROMPT",
@@ -11,7 +11,9 @@ __all__ = [
     "NARRATION_PROMPT",
     "NPC_STATE_UPDATE_PROMPT",
     "DIALOGUE_GENERATION_PROMPT",
+    "COMBAT_FLAVOR_PROMPT",
     "LOCATION_GENERATION_PROMPT",
     "WORLD_EVENT_PROMPT",
-    "QUEST_GENERATION_PROMPT"
+    "QUEST_GENERATION_PROMPT",
+    "QUEST_OFFER_PROMPT"
 ]
\ No newline at end of file
@@ -18,6 +18,7 @@ You are the rules engine for a text-based RPG. Your job is to determine if a pla
 
 **Mutation Operations:**
 - `op`: "damage_player", "add_player_status"
+- "add_player_status" may give a "duration" in game minutes; "poisoned", "bleeding" and "regenerating" wear off on their own.
 
 **Example (Possible Action):**
 Action: "The player tries to disarm a poison dart trap on a chest."
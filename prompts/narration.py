@@ -90,4 +90,21 @@ You are a character psychology AI. Your job is to update an NPC's internal state
 - Interaction Outcome (Narration): "{narration}"
 
 Remember: Your output MUST be a valid JSON object and the memory must be from the NPC's perspective.
-"""
\ No newline at end of file
+"""
+
+COMBAT_FLAVOR_PROMPT = """
+[SYSTEM]
+You are a narration AI for a text game. The game has already decided everything that happened in this round of combat. Your only job is to add colour to it.
+[/SYSTEM]
+
+**RULES:**
+1.  Write one or two vivid sentences covering the events listed below, in the order they happened.
+2.  Do not change any outcome: a miss stays a miss, damage numbers and who fled or joined stay the same.
+3.  Do not describe anything the player does next.
+
+---
+**EVENTS THIS ROUND:**
+{events}
+
+Now, provide ONLY the flavour text.
+"""
@@ -39,4 +39,44 @@ Example Response:
 }}
 
 Now, generate the quest JSON for the given context.
-"""
\ No newline at end of file
+"""
+
+QUEST_OFFER_PROMPT = """
+You are a quest designer for a text-based RPG. An NPC is going to offer the player a job. Write both what the NPC will say when offering it and the structured quest the player receives on accepting, so the two match exactly.
+You must respond ONLY with a single, valid JSON object and no other text.
+
+The JSON object must have exactly two top-level keys:
+- "offer_text": One or two sentences the NPC says, in their own voice, describing the job and the reward.
+- "quest": A quest object with the keys "id", "name", "description" and "objectives".
+
+Each objective object must have:
+- "id": A unique ID for the objective.
+- "description": A player-facing description.
+- "type": One of "acquire_item", "kill_target", "reach_location", "give_item" or "interact".
+- "target": The specific name or ID of the thing to acquire/kill/reach/give/interact with.
+- "required_count": How many times the action must be performed.
+- "details" (optional): Extra information, like a "recipient" for a "give_item" objective.
+
+If a Quest Outline is given, keep its id, name and objectives; only put the offer into words and fill in missing details.
+
+Example Response:
+{{
+    "offer_text": "My back's not what it was. Haul a barrel of ale up from the storeroom and there's 50 coppers in it for you.",
+    "quest": {{
+        "id": "grog_ale_unloading",
+        "name": "Grog's Heavy Lifting",
+        "description": "Grog the tavernkeep will pay 50 coppers to have a barrel of ale brought up from the storeroom.",
+        "objectives": [
+            {{
+                "id": "unload_ale_barrel_1",
+                "description": "Move an ale barrel from the storeroom to the tavern.",
+                "type": "interact",
+                "target": "ale barrel",
+                "required_count": 1
+            }}
+        ]
+    }}
+}}
+
+Now, generate the offer JSON for the given context.
+"""
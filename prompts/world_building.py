@@ -33,5 +33,7 @@ You are the simulation engine for a text-based RPG. Your job is to determine if
 - "remove_character"
 - "update_location_desc"
 
+The weather is simulated separately and is already in the game state; do not create weather events.
+
 Now, generate an event for the current game state, or an empty JSON object if nothing happens.
 """
\ No newline at end of file
@@ -0,0 +1,199 @@
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from definitions.entities import Character
+from definitions.quests import Quest
+from event_executor import execute_world_mutations
+from game_events import (
+    GameEvent, ITEM_ACQUIRED, ITEM_GIVEN, ITEM_LOST, LEVEL_CHANGED, QUEST_COMPLETED, QUEST_STARTED, REPUTATION_CHANGED
+)
+from game_state import GameState, GameWorld
+
+# ("quest", quest_id) | ("reputation", faction, minimum) | ("level", minimum) | ("item", name)
+Condition = Tuple[Any, ...]
+
+ITEM_EVENT_TYPES = frozenset({ITEM_ACQUIRED, ITEM_GIVEN, ITEM_LOST})
+
+def parse_prerequisites(quest: Quest) -> List[Condition]:
+    prerequisites = quest.prerequisites
+    conditions: List[Condition] = [("quest", quest_id) for quest_id in prerequisites.get("quests", [])]
+    conditions += [("reputation", faction, minimum) for faction, minimum in prerequisites.get("reputation", {}).items()]
+    if prerequisites.get("level"):
+        conditions.append(("level", prerequisites["level"]))
+    conditions += [("item", name.lower()) for name in prerequisites.get("items", [])]
+    return conditions
+
+def trigger_key(condition: Condition) -> Tuple[str, ...]:
+    """The state change that can flip a condition: a quest completing, a faction's score, the level, or any item."""
+    if condition[0] in ("quest", "reputation"):
+        return condition[:2]
+    return condition[:1]
+
+class QuestGraph:
+    """
+    Which authored quests (Location.quests) can be offered right now.
+
+    Quests form a DAG through their "quests" prerequisites. Every unmet
+    condition of every quest is tracked, and watchers map each kind of state
+    change (a quest completing, a faction's reputation, the player's level,
+    the items they hold) to the conditions it can flip. Game events then
+    re-check only those conditions, so availability is kept up to date without
+    scanning every quest each turn. The graph also applies each quest's
+    on_accept and on_complete world mutations.
+    """
+
+    def __init__(self):
+        self.templates: Dict[str, Quest] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        self.blocked: Set[str] = set()
+        self.available: Set[str] = set()
+        self._conditions: Dict[str, List[Condition]] = {}
+        self._unmet: Dict[str, Set[Condition]] = {}
+        self._watchers: Dict[Tuple[str, ...], List[Tuple[str, Condition]]] = {}
+        self._world: Optional[GameWorld] = None
+        self._location_count = 0
+        self._world_revision = 0
+        self._state: Optional[GameState] = None
+
+    def template(self, quest_id: str) -> Optional[Quest]:
+        return self.templates.get(quest_id)
+
+    def improvised_id(self, game_state: GameState, world: GameWorld, quest_id: str) -> str:
+        """An id for a quest not written from an authored outline, so it cannot take over an authored quest's chain."""
+        self._ensure(game_state, world)
+        candidate, number = quest_id, 1
+        while candidate in self.templates:
+            number += 1
+            candidate = f"{quest_id}_{number}"
+        return candidate
+
+    def is_available(self, game_state: GameState, world: GameWorld, quest_id: str) -> bool:
+        self._ensure(game_state, world)
+        return quest_id in self.available
+
+    def offerable_ids(self, game_state: GameState, world: GameWorld, npc: Character) -> List[str]:
+        """The NPC's quests that are unlocked and not yet taken, in the NPC's order."""
+        self._ensure(game_state, world)
+        return [quest_id for quest_id in npc.available_quest_ids if quest_id in self.available]
+
+    def process_events(self, game_state: GameState, world: GameWorld, events: Iterable[GameEvent]):
+        self._ensure(game_state, world)
+        triggers: Set[Tuple[str, ...]] = set()
+        for event in events:
+            if event.type == QUEST_STARTED:
+                self.available.discard(event.target)
+                self._apply_effects(game_state, world, event.target, "on_accept")
+            elif event.type == QUEST_COMPLETED:
+                self._apply_effects(game_state, world, event.target, "on_complete")
+                triggers.add(("quest", event.target))
+            elif event.type == REPUTATION_CHANGED:
+                triggers.add(("reputation", event.target))
+            elif event.type == LEVEL_CHANGED:
+                triggers.add(("level",))
+            elif event.type in ITEM_EVENT_TYPES:
+                triggers.add(("item",))
+
+        for key in triggers:
+            for quest_id, condition in self._watchers.get(key, ()):
+                if quest_id in game_state.quest_log:
+                    continue
+                if self._is_met(condition, game_state):
+                    self._unmet[quest_id].discard(condition)
+                else:
+                    self._unmet[quest_id].add(condition)
+                self._refresh(quest_id, game_state)
+
+    def _apply_effects(self, game_state: GameState, world: GameWorld, quest_id: str, effect: str):
+        quest = self.templates.get(quest_id)
+        mutations = getattr(quest, effect) if quest else None
+        if mutations:
+            logging.info(f"Applying {len(mutations)} {effect} mutations for quest '{quest_id}'.")
+            execute_world_mutations(game_state, world, [dict(m) for m in mutations])
+
+    def _ensure(self, game_state: GameState, world: GameWorld):
+        # An undo swaps in new Location objects, and with them new Quest templates.
+        if self._world is not world or self._world_revision != world.revision or self._location_count != world.loaded_location_count():
+            self._build(world)
+            self._state = None
+        if self._state is not game_state:
+            # A new game, a loaded save or an undo: evaluate everything once.
+            for quest_id in self.templates:
+                self._unmet[quest_id] = {c for c in self._conditions[quest_id] if not self._is_met(c, game_state)}
+            self.available = set()
+            for quest_id in self.templates:
+                self._refresh(quest_id, game_state)
+            self._state = game_state
+            logging.info(f"Evaluated quest availability: {len(self.available)} of {len(self.templates)} quests available.")
+
+    def _build(self, world: GameWorld):
+        # Only loaded locations: the quests of a lazily loaded world join the graph as their locations are read.
+        self.templates = {}
+        for _, location in world.loaded_locations():
+            for quest in location.quests:
+                if quest.id in self.templates:
+                    logging.warning(f"Quest '{quest.id}' is defined more than once; keeping the first definition.")
+                    continue
+                self.templates[quest.id] = quest
+
+        partially_loaded = world.loaded_location_count() < len(world.locations)
+        self.dependents = {}
+        self._conditions = {}
+        self._watchers = {}
+        for quest_id, quest in self.templates.items():
+            self._conditions[quest_id] = parse_prerequisites(quest)
+            for condition in self._conditions[quest_id]:
+                self._watchers.setdefault(trigger_key(condition), []).append((quest_id, condition))
+                if condition[0] == "quest":
+                    if condition[1] not in self.templates and not partially_loaded:
+                        logging.warning(f"Quest '{quest_id}' requires unknown quest '{condition[1]}'.")
+                    self.dependents.setdefault(condition[1], []).append(quest_id)
+
+        self.blocked = self._find_cycles()
+        self._world = world
+        self._location_count = world.loaded_location_count()
+        self._world_revision = world.revision
+        logging.info(f"Built the quest graph: {len(self.templates)} quests, {len(self._watchers)} watched keys.")
+
+    def _find_cycles(self) -> Set[str]:
+        # Kahn's algorithm: quests never reached are part of (or behind) a prerequisite cycle.
+        in_degree = {quest_id: sum(1 for c in conditions if c[0] == "quest" and c[1] in self.templates)
+                     for quest_id, conditions in self._conditions.items()}
+        queue = deque(quest_id for quest_id, degree in in_degree.items() if degree == 0)
+        reached = set()
+        while queue:
+            quest_id = queue.popleft()
+            reached.add(quest_id)
+            for dependent in self.dependents.get(quest_id, ()):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+        blocked = set(self.templates) - reached
+        if blocked:
+            logging.error(f"Quest prerequisites form a cycle; these quests can never be offered: {sorted(blocked)}")
+        return blocked
+
+    def _refresh(self, quest_id: str, game_state: GameState):
+        if not self._unmet[quest_id] and quest_id not in self.blocked and quest_id not in game_state.quest_log:
+            if quest_id not in self.available:
+                self.available.add(quest_id)
+                logging.info(f"Quest '{quest_id}' is now available.")
+        else:
+            self.available.discard(quest_id)
+
+    @staticmethod
+    def _is_met(condition: Condition, game_state: GameState) -> bool:
+        kind = condition[0]
+        if kind == "quest":
+            quest = game_state.quest_log.get(condition[1])
+            return bool(quest and quest.status == "completed")
+        if kind == "reputation":
+            return game_state.reputation.get(condition[1], 0) >= condition[2]
+        if kind == "level":
+            return game_state.player.level >= condition[1]
+        if kind == "item":
+            player = game_state.player
+            return player.inventory.find(condition[1]) is not None or any(
+                item and condition[1] in item.name.lower() for item in player.equipment.values())
+        logging.warning(f"Unknown quest prerequisite '{kind}'.")
+        return False
@@ -0,0 +1,77 @@
+import json
+import lzma
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_bytes(data: Any) -> bytes:
+    """Compact JSON encoding, through orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def loads_bytes(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _identity(raw: bytes) -> bytes:
+    return raw
+
+@dataclass(frozen=True)
+class SaveCodec:
+    """
+    How a save body is stored on disk. Every codec encodes the same JSON
+    document and then optionally compresses it; compressed bodies start with a
+    four-byte magic header so the codec can be detected when loading.
+    """
+    name: str
+    magic: bytes
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+    def encode(self, data: Any) -> bytes:
+        return self.encode_raw(dumps_bytes(data))
+
+    def encode_raw(self, raw_json: bytes) -> bytes:
+        """Wraps an already-serialized JSON document."""
+        return self.magic + self.compress(raw_json)
+
+    def decode(self, payload: bytes) -> Any:
+        return loads_bytes(self.decompress(payload[len(self.magic):]))
+
+
+JSON_CODEC = SaveCodec("json", b"", _identity, _identity)
+
+CODECS: Dict[str, SaveCodec] = {
+    codec.name: codec
+    for codec in (
+        JSON_CODEC,
+        SaveCodec("zlib", b"DLZ1", lambda raw: zlib.compress(raw, 6), zlib.decompress),
+        SaveCodec("lzma", b"DLX1", lzma.compress, lzma.decompress),
+    )
+}
+
+def available_codecs() -> List[str]:
+    return list(CODECS)
+
+def get_codec(name: str) -> SaveCodec:
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown save codec '{name}'. Available: {', '.join(CODECS)}")
+    return codec
+
+def detect_codec(payload: bytes) -> SaveCodec:
+    """Picks the codec from the header. Anything without a known header is plain JSON, which covers old saves."""
+    for codec in CODECS.values():
+        if codec.magic and payload.startswith(codec.magic):
+            return codec
+    return JSON_CODEC
+
+def decode_save(payload: bytes) -> Any:
+    return detect_codec(payload).decode(payload)
@@ -0,0 +1,300 @@
+# simulation/combat_simulator.py
+"""
+Monte Carlo combat simulator for encounter balancing.
+
+Runs many fights between the player and a group of opponents at once, with
+NumPy arrays of shape (trials, combatants) and batched dice rolls. The rules
+follow CombatHandler: initiative is d20 + dexterity modifier; an attack hits
+when d20 + strength modifier + attack bonus reaches the target's total armor
+class; damage is the attacker's damage dice. The player always opens with an
+attack (as when attacking to start a fight) and then targets the first
+opponent still fighting. Opponents choose as CombatTactics does, from the
+same scores: attack, drink a healing item, or flee when badly hurt (if there
+is an exit). Calling for help is not modelled, since it depends on who is
+nearby in the world; the summary says so.
+
+Library use:
+    result = simulate_encounter(player, opponents, trials=20000)
+    result.win_probability, result.difficulty
+
+CLI (from the project root):
+    python -m simulation.combat_simulator --opponent "Grak" --trials 20000
+"""
+import argparse
+import logging
+from dataclasses import dataclass
+from typing import FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from combat_tactics import BRAVE_TAGS, HEAL_THRESHOLD, WOUNDED_THRESHOLD, attack_score, flee_score, heal_score
+from definitions.entities import Character
+from dice import compile_dice
+from game_mechanics import calculate_stat_modifier
+
+@dataclass(frozen=True)
+class CombatantStats:
+    name: str
+    hp: int
+    armor_class: int
+    attack_modifier: int
+    damage_dice: Tuple[int, int]
+    initiative_modifier: int
+    damage_bonus: int = 0
+    max_hp: Optional[int] = None  # defaults to hp
+    tags: FrozenSet[str] = frozenset()
+    faction: Optional[str] = None
+    # (heal amount, used up) for each healing item, in the order CombatTactics would use them.
+    healing: Tuple[Tuple[int, bool], ...] = ()
+
+    @classmethod
+    def from_character(cls, char: Character) -> "CombatantStats":
+        damage = compile_dice(char.get_damage_dice())
+        if len(damage.dice) != 1 or damage.dice[0].mode or damage.dice[0].sign < 0:
+            raise ValueError(f"The simulator only supports NdM+K damage, not '{damage.source}' ({char.name}).")
+        return cls(
+            name=char.name,
+            hp=char.hp,
+            armor_class=char.get_total_armor_class(),
+            attack_modifier=calculate_stat_modifier(char.stats.get("strength", 10)) + char.get_total_attack_bonus(),
+            damage_dice=(damage.dice[0].count, damage.dice[0].sides),
+            initiative_modifier=calculate_stat_modifier(char.stats.get("dexterity", 10)),
+            damage_bonus=damage.modifier(char.stats),
+            max_hp=char.max_hp,
+            tags=frozenset(char.personality_tags),
+            faction=char.faction,
+            healing=cls._healing_items(char),
+        )
+
+    @staticmethod
+    def _healing_items(char: Character) -> Tuple[Tuple[int, bool], ...]:
+        healing = []
+        for item, count in char.inventory.stacks():
+            amount = item.use_effect.get("amount", 0)
+            if item.use_effect.get("op") != "heal" or amount <= 0:
+                continue
+            if item.category != "potion":
+                # Never used up, so nothing after it is ever reached.
+                healing.append((amount, False))
+                break
+            healing.extend([(amount, True)] * count)
+        return tuple(healing)
+
+@dataclass
+class CombatSimulationResult:
+    trials: int
+    wins: int
+    losses: int
+    unresolved: int
+    mean_rounds: float
+    mean_player_hp_remaining: float
+    mean_player_hp_remaining_on_win: float
+    mean_opponent_hp_remaining: float
+    player_max_hp: int
+    mean_opponents_fled: float = 0.0
+    mean_heals: float = 0.0
+
+    @property
+    def win_probability(self) -> float:
+        return self.wins / self.trials
+
+    @property
+    def difficulty(self) -> str:
+        """A rough label from how often, and how comfortably, the player wins."""
+        hp_left = self.mean_player_hp_remaining_on_win / self.player_max_hp if self.player_max_hp else 0
+        if self.win_probability < 0.5:
+            return "deadly"
+        if self.win_probability < 0.8:
+            return "hard"
+        if self.win_probability < 0.95 or hp_left < 0.4:
+            return "medium"
+        if hp_left < 0.75:
+            return "easy"
+        return "trivial"
+
+    def summary(self) -> str:
+        return (
+            f"Win {self.win_probability:.1%} | loss {self.losses / self.trials:.1%} | unresolved {self.unresolved / self.trials:.1%}\n"
+            f"Rounds: {self.mean_rounds:.2f} on average\n"
+            f"Player HP left: {self.mean_player_hp_remaining:.1f}/{self.player_max_hp} overall, {self.mean_player_hp_remaining_on_win:.1f} when winning\n"
+            f"Opponent HP left: {self.mean_opponent_hp_remaining:.1f} in total on average\n"
+            f"Opponents fled: {self.mean_opponents_fled:.2f}, healing items used: {self.mean_heals:.2f} per fight on average\n"
+            f"Difficulty: {self.difficulty}\n"
+            f"Not modelled: opponents calling for help. Allies nearby make the fight harder than this."
+        )
+
+Combatant = Union[Character, CombatantStats]
+
+def _as_stats(combatant: Combatant) -> CombatantStats:
+    return combatant if isinstance(combatant, CombatantStats) else CombatantStats.from_character(combatant)
+
+def _roll_damage(rng: np.random.Generator, attacker_index: np.ndarray, hit: np.ndarray, stats: List[CombatantStats]) -> np.ndarray:
+    damage = np.zeros(attacker_index.shape[0], dtype=np.int32)
+    for index, combatant in enumerate(stats):
+        rows = np.nonzero(hit & (attacker_index == index))[0]
+        if rows.size:
+            num_dice, dice_size = combatant.damage_dice
+            rolled = rng.integers(1, dice_size + 1, size=(rows.size, num_dice)).sum(axis=1) + combatant.damage_bonus
+            damage[rows] = np.maximum(rolled, 0)
+    return damage
+
+def simulate_encounter(
+    player: Combatant,
+    opponents: Sequence[Combatant],
+    trials: int = 10000,
+    max_rounds: int = 50,
+    seed: Optional[int] = None,
+    reputation: Optional[Mapping[str, int]] = None,
+    can_flee: bool = True,
+) -> CombatSimulationResult:
+    """reputation is the player's standing per faction; can_flee is whether the location has an exit."""
+    if not opponents:
+        raise ValueError("An encounter needs at least one opponent.")
+
+    stats = [_as_stats(player)] + [_as_stats(o) for o in opponents]
+    rng = np.random.default_rng(seed)
+    count = len(stats)
+    rows = np.arange(trials)
+
+    hp = np.tile(np.array([s.hp for s in stats], dtype=np.int32), (trials, 1))
+    max_hp = np.array([s.max_hp or s.hp for s in stats], dtype=np.int32)
+    armor_class = np.array([s.armor_class for s in stats], dtype=np.int32)
+    attack_modifier = np.array([s.attack_modifier for s in stats], dtype=np.int32)
+    initiative = rng.integers(1, 21, size=(trials, count)) + np.array([s.initiative_modifier for s in stats])
+    # Stable sort on the negated rolls keeps the original order for ties, as sorted() does.
+    turn_order = np.argsort(-initiative, axis=1, kind="stable")
+
+    # Each combatant's healing items, padded with a zero "none left" entry; heal_index is the next one per fight.
+    most_items = max(len(s.healing) for s in stats)
+    heal_amount = np.zeros((count, most_items + 1), dtype=np.int32)
+    heal_used_up = np.zeros((count, most_items + 1), dtype=bool)
+    for index, combatant in enumerate(stats):
+        for position, (amount, used_up) in enumerate(combatant.healing):
+            heal_amount[index, position] = amount
+            heal_used_up[index, position] = used_up
+    heal_index = np.zeros((trials, count), dtype=np.intp)
+    heals = np.zeros(trials, dtype=np.int32)
+    fled = np.zeros((trials, count), dtype=bool)
+
+    finished = np.zeros(trials, dtype=bool)
+    rounds = np.zeros(trials, dtype=np.int32)
+
+    def fighting_opponents() -> np.ndarray:
+        return (hp[:, 1:] > 0) & ~fled[:, 1:]
+
+    def choose(attacker: np.ndarray, active: np.ndarray) -> np.ndarray:
+        """Carries out the opponents' heals and flights, as CombatTactics chooses them. Returns who attacks."""
+        attacking = active.copy()
+        for index in range(1, count):
+            turn = np.nonzero(active & (attacker == index))[0]
+            if not turn.size:
+                continue
+            combatant = stats[index]
+            standing = (reputation or {}).get(combatant.faction, 0) if combatant.faction else 0
+            health = hp[turn, index] / max_hp[index] if max_hp[index] else np.zeros(turn.size)
+            # Options in CombatTactics' order; like max(), a later option must score strictly higher to win.
+            best = np.full(turn.size, attack_score(set(combatant.tags), standing))
+            amount = heal_amount[index, heal_index[turn, index]]
+            heal = (health < HEAL_THRESHOLD) & (amount > 0) & (heal_score(health) > best)
+            best = np.where(heal, heal_score(health), best)
+            flee = np.zeros(turn.size, dtype=bool)
+            if can_flee and not BRAVE_TAGS & combatant.tags:
+                # The player fights alone, so an opponent is never outnumbered.
+                score = flee_score(health, set(combatant.tags), False, standing)
+                flee = (health < WOUNDED_THRESHOLD) & (score > best)
+                heal &= ~flee
+
+            healed = turn[heal]
+            hp[healed, index] = np.minimum(max_hp[index], hp[healed, index] + amount[heal])
+            heal_index[healed, index] += heal_used_up[index, heal_index[healed, index]]
+            heals[healed] += 1
+            fled[turn[flee], index] = True
+            attacking[turn[heal | flee]] = False
+        return attacking
+
+    def attack(attacker: np.ndarray, active: np.ndarray):
+        first_opponent = np.argmax(fighting_opponents(), axis=1) + 1
+        target = np.where(attacker == 0, first_opponent, 0)
+        attack_roll = rng.integers(1, 21, size=trials) + attack_modifier[attacker]
+        hit = active & (attack_roll >= armor_class[target])
+        hp[rows, target] -= _roll_damage(rng, attacker, hit, stats)
+
+    def update_finished():
+        nonlocal finished
+        finished = finished | (hp[:, 0] <= 0) | ~fighting_opponents().any(axis=1)
+
+    attack(np.zeros(trials, dtype=np.intp), np.ones(trials, dtype=bool))
+    update_finished()
+
+    for round_number in range(1, max_rounds + 1):
+        if finished.all():
+            break
+        rounds[~finished] = round_number
+        for slot in range(count):
+            attacker = turn_order[:, slot]
+            active = ~finished & (hp[rows, attacker] > 0) & ~fled[rows, attacker]
+            if not active.any():
+                continue
+            attack(attacker, choose(attacker, active))
+            update_finished()
+
+    player_hp = np.maximum(hp[:, 0], 0)
+    won = (hp[:, 0] > 0) & ~fighting_opponents().any(axis=1)
+    lost = hp[:, 0] <= 0
+    return CombatSimulationResult(
+        trials=trials,
+        wins=int(won.sum()),
+        losses=int(lost.sum()),
+        unresolved=int((~won & ~lost).sum()),
+        mean_rounds=float(rounds.mean()),
+        mean_player_hp_remaining=float(player_hp.mean()),
+        mean_player_hp_remaining_on_win=float(player_hp[won].mean()) if won.any() else 0.0,
+        mean_opponent_hp_remaining=float(np.maximum(hp[:, 1:], 0).sum(axis=1).mean()),
+        player_max_hp=stats[0].max_hp or stats[0].hp,
+        mean_opponents_fled=float(fled.sum(axis=1).mean()),
+        mean_heals=float(heals.mean()),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate how an encounter between the player and some opponents plays out.")
+    parser.add_argument("--slot", help="Take the player (and, by default, the opponents) from this save slot instead of a new game.")
+    parser.add_argument("--opponent", action="append", default=[], help="Name of an NPC anywhere in the world. Repeatable. Defaults to the hostile NPCs at the player's location.")
+    parser.add_argument("--trials", type=int, default=10000, help="Number of simulated fights.")
+    parser.add_argument("--max-rounds", type=int, default=50, help="Fights still going after this many rounds count as unresolved.")
+    parser.add_argument("--seed", type=int, help="RNG seed for reproducible results.")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    if args.slot:
+        from persistence import PersistenceManager
+        loaded = PersistenceManager().load_game(args.slot)
+        if not loaded:
+            parser.error(f"Could not load save slot '{args.slot}'.")
+        game_state, world = loaded
+    else:
+        from main import setup_new_game
+        game_state, world = setup_new_game()
+
+    if args.opponent:
+        opponents = []
+        for name in args.opponent:
+            found = world.find_character_anywhere(name)
+            if not found:
+                parser.error(f"No character named '{name}' in the world.")
+            opponents.append(found[0])
+    else:
+        location = game_state.get_current_location(world)
+        opponents = [c for c in location.characters if c.is_hostile] if location else []
+        if not opponents:
+            parser.error("There are no hostile characters at the player's location; name opponents with --opponent.")
+
+    # The fight happens where the player is; opponents can only flee if there is somewhere to go.
+    location = game_state.get_current_location(world)
+    can_flee = bool(location and any(world.get_location(loc_id) for loc_id in location.exits.values()))
+    result = simulate_encounter(game_state.player, opponents, trials=args.trials, max_rounds=args.max_rounds, seed=args.seed,
+                                reputation=game_state.reputation, can_flee=can_flee)
+    print(f"{game_state.player.name} vs {', '.join(o.name for o in opponents)} ({args.trials} fights)")
+    print(result.summary())
+
+if __name__ == "__main__":
+    main()
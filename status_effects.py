@@ -0,0 +1,113 @@
+import logging
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from definitions.entities import Character
+from timers import MINUTES, Timer
+
+if TYPE_CHECKING:
+    from game_state import GameState, GameWorld
+    from display_manager import DisplayManager
+
+STATUS_TICK = "status_tick"
+STATUS_EXPIRED = "status_expired"
+
+# How long each effect lasts (game minutes) and the hit points it changes every `interval` minutes.
+# Effects not listed here (or applied without a duration) last until removed.
+STATUS_EFFECTS: Dict[str, Dict[str, int]] = {
+    "poisoned": {"duration": 60, "interval": 10, "hp": -1},
+    "bleeding": {"duration": 30, "interval": 5, "hp": -1},
+    "regenerating": {"duration": 60, "interval": 10, "hp": 2},
+}
+
+def _target_id(game_state: 'GameState', character: Character) -> str:
+    return "player" if character is game_state.player else character.name
+
+def _keys(target_id: str, effect: str):
+    return f"status:{target_id}:{effect}:tick", f"status:{target_id}:{effect}:expire"
+
+def apply_status_effect(game_state: 'GameState', character: Character, effect: str, duration: Optional[int] = None,
+                        location_id: Optional[str] = None) -> bool:
+    """Adds a status effect and schedules its ticks and expiry. Re-applying an effect restarts its duration."""
+    definition = STATUS_EFFECTS.get(effect, {})
+    duration = duration or definition.get("duration")
+    target_id = _target_id(game_state, character)
+    tick_key, expire_key = _keys(target_id, effect)
+    data = {"target": target_id, "effect": effect, "location_id": location_id}
+
+    added = effect not in character.status_effects
+    if added:
+        character.status_effects.append(effect)
+        game_state.mark_changed(character)
+
+    game_state.timers.cancel_key(tick_key)
+    game_state.timers.cancel_key(expire_key)
+    interval = definition.get("interval", 0)
+    if interval and definition.get("hp") and (not duration or duration >= interval):
+        # A ticking effect ends with its last tick, so a long jump can't expire it before the damage lands.
+        repeats = duration // interval if duration else None
+        game_state.timers.schedule(MINUTES, game_state.minutes_elapsed, interval, STATUS_TICK, key=tick_key,
+                                   data={**data, "hp": definition["hp"]}, interval=interval, repeats=repeats)
+    elif duration:
+        game_state.timers.schedule(MINUTES, game_state.minutes_elapsed, duration, STATUS_EXPIRED, key=expire_key, data=data)
+    game_state.mark_changed()
+    logging.info(f"'{target_id}' {'gained' if added else 'renewed'} status effect '{effect}' ({duration or 'no'} minute duration).")
+    return added
+
+def remove_status_effect(game_state: 'GameState', character: Character, effect: str) -> bool:
+    for key in _keys(_target_id(game_state, character), effect):
+        game_state.timers.cancel_key(key)
+    game_state.mark_changed()
+    if effect not in character.status_effects:
+        return False
+    character.status_effects.remove(effect)
+    game_state.mark_changed(character)
+    logging.info(f"'{character.name}' lost status effect '{effect}'.")
+    return True
+
+def _resolve_target(game_state: 'GameState', world: 'GameWorld', data: Dict[str, Any]) -> Optional[Character]:
+    if data["target"] == "player":
+        return game_state.player
+    location = world.get_location(data.get("location_id") or "")
+    if location:
+        character = next((c for c in location.characters if c.name == data["target"]), None)
+        if character:
+            return character
+    found = world.find_character_anywhere(data["target"])
+    return found[0] if found else None
+
+def on_status_tick(game_state: 'GameState', world: 'GameWorld', timer: Timer, firings: int, display: 'DisplayManager'):
+    character = _resolve_target(game_state, world, timer.data)
+    if not character:
+        return
+    if character.hp > 0:
+        _apply_tick(game_state, character, timer, firings, display)
+    if timer.repeats == 0:
+        _expire(game_state, character, timer.data["effect"], display)
+
+def _apply_tick(game_state: 'GameState', character: Character, timer: Timer, firings: int, display: 'DisplayManager'):
+    change = timer.data["hp"] * firings
+    # Effects over time wear a character down but never finish them off.
+    new_hp = max(1, character.hp + change) if change < 0 else min(character.max_hp, character.hp + change)
+    if new_hp == character.hp:
+        return
+    actual = new_hp - character.hp
+    character.hp = new_hp
+    game_state.mark_changed(character)
+    logging.info(f"Status '{timer.data['effect']}' changed '{character.name}' HP by {actual} over {firings} ticks.")
+    if character is game_state.player:
+        display.show_status_tick(timer.data["effect"], actual)
+
+def on_status_expired(game_state: 'GameState', world: 'GameWorld', timer: Timer, firings: int, display: 'DisplayManager'):
+    character = _resolve_target(game_state, world, timer.data)
+    if not character:
+        return
+    _expire(game_state, character, timer.data["effect"], display)
+
+def _expire(game_state: 'GameState', character: Character, effect: str, display: 'DisplayManager'):
+    if remove_status_effect(game_state, character, effect) and character is game_state.player:
+        display.show_status_expired(effect)
+
+STATUS_TIMER_HANDLERS = {
+    STATUS_TICK: on_status_tick,
+    STATUS_EXPIRED: on_status_expired,
+}
@@ -0,0 +1,33 @@
+import logging
+
+import pytest
+
+from definitions.entities import Character
+from definitions.world_objects import Location
+from game_state import GameState, GameWorld
+
+logging.disable(logging.CRITICAL)
+
+@pytest.fixture
+def game():
+    """A new game in a three-location line, location_0 - location_1 - location_2, with one villager in each."""
+    locations = {
+        f"location_{i}": Location(
+            id=f"location_{i}",
+            name=f"Location {i}",
+            description="A quiet place.",
+            characters=[Character(name=f"Villager {i}", description="A local.", stats={})],
+            exits={f"the road to location {j}": f"location_{j}" for j in (i - 1, i + 1) if 0 <= j < 3},
+        )
+        for i in range(3)
+    }
+    world = GameWorld(locations=locations)
+    player = Character(name="Arion", description="An adventurer.", stats={})
+    return GameState(player=player, current_location_id="location_0"), world
+
+@pytest.fixture
+def location_names():
+    """Returns a function mapping each location id of a world to the names of the characters there."""
+    def names(world):
+        return {loc_id: [c.name for c in location.characters] for loc_id, location in world.locations.items()}
+    return names
@@ -0,0 +1,39 @@
+import json
+
+from ai_providers.cassette_client import CassetteClient, prompt_key
+
+class ScriptedClient:
+    def __init__(self, responses):
+        self.responses = responses
+
+    def generate_content(self, prompt, **options):
+        return self.responses.get(prompt)
+
+def test_a_recording_replaces_what_the_session_rerecorded(tmp_path):
+    cassette_path = tmp_path / "session.json"
+    old_entries = {
+        prompt_key("look"): {"prompt": "look", "responses": ["An old room."]},
+        prompt_key("listen"): {"prompt": "listen", "responses": ["Silence."]},
+    }
+    cassette_path.write_text(json.dumps({"version": 1, "entries": old_entries}))
+
+    recorder = CassetteClient(ScriptedClient({"look": "A new room."}), mode="record", cassette_path=str(cassette_path))
+    assert recorder.generate_content("look") == "A new room."
+    assert recorder.generate_content("shout") is None
+    recorder.close()
+
+    player = CassetteClient(ScriptedClient({}), mode="replay", cassette_path=str(cassette_path), latency=0)
+    assert player.generate_content("look") == "A new room."
+    assert player.generate_content("listen") == "Silence."
+    assert prompt_key("shout") not in player.entries
+
+def test_providers_sharing_a_cassette_keep_their_own_responses(tmp_path):
+    cassette_path = str(tmp_path / "session.json")
+    for namespace, response in (("", "Ollama says hi."), ("gemini", "Gemini says hi.")):
+        recorder = CassetteClient(ScriptedClient({"greet": response}), mode="record", cassette_path=cassette_path, namespace=namespace)
+        recorder.generate_content("greet")
+        recorder.close()
+
+    for namespace, response in (("", "Ollama says hi."), ("gemini", "Gemini says hi.")):
+        player = CassetteClient(ScriptedClient({}), mode="replay", cassette_path=cassette_path, latency=0, namespace=namespace)
+        assert player.generate_content("greet") == response
@@ -0,0 +1,30 @@
+import action_handlers.combat_handler as combat_handler
+from action_handlers.combat_handler import CombatHandler
+from definitions.entities import Character
+from dice import dice
+
+class FlavorRecorder:
+    def __init__(self):
+        self.rounds = []
+
+    def describe_combat_round(self, events):
+        self.rounds.append(events)
+        return "Steel rings out."
+
+def test_flavor_text_gets_only_the_npc_lines(game, monkeypatch):
+    monkeypatch.setattr(combat_handler, "COMBAT_FLAVOR_TEXT_ENABLED", True)
+    game_state, world = game
+    game_state.player.hp = game_state.player.max_hp = 1000
+    bandit = Character(name="Bandit", description="A bandit.", stats={"strength": 12}, hp=500, max_hp=500, personality_tags=["cruel"])
+    world.locations["location_0"].add_character(bandit)
+    dice.reseed(1)
+
+    recorder = FlavorRecorder()
+    handler = CombatHandler()
+    report = handler.process_combat_intent(game_state, world, recorder, {"intent": "attack", "target": "Bandit"})
+    handler.process_combat_intent(game_state, world, recorder, {"intent": "attack", "target": "Bandit"})
+
+    assert "Steel rings out." in report
+    assert len(recorder.rounds) == 2
+    for lines in recorder.rounds:
+        assert lines and all(line.startswith("Bandit") for line in lines)
@@ -0,0 +1,31 @@
+from definitions.entities import Character, Item
+from simulation.combat_simulator import simulate_encounter
+
+def fighter(name, hp, tags=(), potions=0):
+    char = Character(name=name, description="A fighter.", stats={"strength": 12}, hp=hp, max_hp=20, personality_tags=list(tags))
+    for _ in range(potions):
+        char.add_item_to_inventory(Item(name="Healing Potion", description="Red.", category="potion", use_effect={"op": "heal", "amount": 8}))
+    return char
+
+def test_wounded_opponents_flee_only_when_tactics_would():
+    player = Character(name="Arion", description="An adventurer.", stats={"strength": 10}, hp=60, max_hp=60)
+    coward = fighter("Coward", 4, tags=["cowardly"])
+
+    fled = simulate_encounter(player, [coward], trials=2000, seed=1)
+    cornered = simulate_encounter(player, [coward], trials=2000, seed=1, can_flee=False)
+    brave = simulate_encounter(player, [fighter("Knight", 4, tags=["brave"])], trials=2000, seed=1)
+
+    assert fled.mean_opponents_fled > 0.1
+    assert cornered.mean_opponents_fled == brave.mean_opponents_fled == 0
+    assert "calling for help" in fled.summary()
+
+def test_opponents_drink_their_potions():
+    player = Character(name="Arion", description="An adventurer.", stats={"strength": 10}, hp=60, max_hp=60)
+    result = simulate_encounter(player, [fighter("Veteran", 6, tags=["brave"], potions=2)], trials=2000, seed=1)
+    assert 0 < result.mean_heals <= 2
+
+def test_a_wounded_player_is_measured_against_their_max_hp():
+    player = Character(name="Arion", description="An adventurer.", stats={"strength": 10}, hp=15, max_hp=60)
+    result = simulate_encounter(player, [fighter("Rat", 1, tags=["brave"])], trials=100, seed=1)
+    assert result.player_max_hp == 60
+    assert "/60 overall" in result.summary()
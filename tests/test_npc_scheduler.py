@@ -0,0 +1,42 @@
+from definitions.entities import Character
+from npc_scheduler import NPCScheduler
+from undo_history import UndoHistory
+
+def guard(schedule):
+    return Character(name="Guard", description="A town guard.", stats={}, schedule=schedule)
+
+def test_npcs_sharing_a_name_keep_their_own_schedules(game, location_names):
+    game_state, world = game
+    world.locations["location_0"].add_character(guard({"08:00": "location_1"}))
+    world.locations["location_2"].add_character(guard({"09:00": "location_1"}))
+
+    NPCScheduler().advance(game_state, world, 0, 10)
+    assert location_names(world)["location_1"] == ["Villager 1", "Guard", "Guard"]
+
+def test_schedules_survive_an_undo(game, location_names):
+    game_state, world = game
+    world.locations["location_2"].add_character(guard({"08:00": "location_1", "12:00": "location_2"}))
+    scheduler = NPCScheduler()
+    history = UndoHistory()
+    history.reset(game_state, world)
+
+    scheduler.advance(game_state, world, 0, 8)
+    game_state.turn_count += 1
+    history.record(game_state, world)
+    assert "Guard" in location_names(world)["location_1"]
+
+    # The undo swaps in a new Guard object, which must still follow the schedule.
+    game_state = history.undo(world, 1)
+    assert "Guard" in location_names(world)["location_2"]
+    scheduler.advance(game_state, world, 0, 8)
+    assert "Guard" in location_names(world)["location_1"]
+
+def test_scheduled_npcs_walk_their_route_one_exit_an_hour(game, location_names):
+    game_state, world = game
+    world.locations["location_0"].add_character(guard({"08:00": "location_2"}))
+    scheduler = NPCScheduler()
+
+    scheduler.advance(game_state, world, 0, 8)
+    assert "Guard" in location_names(world)["location_1"]
+    scheduler.advance(game_state, world, 8, 9)
+    assert "Guard" in location_names(world)["location_2"]
@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from autosave import AutosaveService
+from display_manager import DisplayManager
+from event_executor import execute_world_mutations
+from meta_command_handler import MetaCommandHandler
+from persistence import PersistenceManager, atomic_write_bytes
+
+@pytest.fixture
+def persistence(tmp_path):
+    return PersistenceManager(str(tmp_path))
+
+def test_delta_save_keeps_a_moved_npc_in_one_place(game, persistence, location_names):
+    game_state, world = game
+    villager = world.locations["location_1"].characters[0]
+    # A character with a non-zero version is what used to hide the move from the delta.
+    game_state.mark_changed(villager)
+    assert persistence.save_game(game_state, world, "slot")
+
+    execute_world_mutations(game_state, world, [{"op": "move_npc", "character_name": villager.name, "new_location_id": "location_2"}])
+    assert persistence.save_game(game_state, world, "slot")
+    assert persistence.get_journal_file_path("slot").exists()
+
+    _, loaded_world = PersistenceManager(str(persistence.save_path)).load_game("slot")
+    assert location_names(loaded_world) == location_names(world)
+    assert location_names(loaded_world)["location_2"] == ["Villager 2", "Villager 1"]
+
+def test_delta_save_round_trips_several_changes(game, persistence, location_names):
+    game_state, world = game
+    assert persistence.save_game(game_state, world, "slot")
+    for destination in ("location_0", "location_2", "location_1"):
+        execute_world_mutations(game_state, world, [{"op": "move_npc", "character_name": "Villager 1", "new_location_id": destination}])
+        game_state.turn_count += 1
+        assert persistence.save_game(game_state, world, "slot")
+
+    loaded_state, loaded_world = PersistenceManager(str(persistence.save_path)).load_game("slot")
+    assert loaded_state.turn_count == 3
+    assert location_names(loaded_world) == location_names(world)
+
+def test_backup_rotation_never_removes_the_save(tmp_path, monkeypatch):
+    save = tmp_path / "slot.json"
+    for payload in (b"1", b"2", b"3"):
+        atomic_write_bytes(save, payload, backups=2)
+    assert [save.read_bytes(), (tmp_path / "slot.json.bak1").read_bytes(), (tmp_path / "slot.json.bak2").read_bytes()] == [b"3", b"2", b"1"]
+
+    # A crash before the final rename must leave the current save where it was.
+    real_replace = os.replace
+    def crash_on_save(source, target):
+        if Path(target) == save:
+            raise OSError("simulated crash")
+        real_replace(source, target)
+    monkeypatch.setattr(os, "replace", crash_on_save)
+    with pytest.raises(OSError):
+        atomic_write_bytes(save, b"4", backups=2)
+    assert save.read_bytes() == b"3"
+
+def test_a_save_waits_for_an_autosave_snapshot_of_the_same_slot(game, persistence, monkeypatch):
+    game_state, world = game
+    assert persistence.save_game(game_state, world, "slot")
+    snapshot_text = json.dumps({"snapshot_id": "autosave", "game_state": game_state.to_dict(compact=True), "game_world": world.to_dict(compact=True)})
+
+    # The autosave worker stalls in the middle of writing its snapshot.
+    writing, resume = threading.Event(), threading.Event()
+    def slow_atomic_write_bytes(*args, **kwargs):
+        if threading.current_thread() is autosave:
+            writing.set()
+            resume.wait(5)
+        return atomic_write_bytes(*args, **kwargs)
+    monkeypatch.setattr("persistence.atomic_write_bytes", slow_atomic_write_bytes)
+    autosave = threading.Thread(target=persistence.write_snapshot_text, args=("slot", snapshot_text))
+    autosave.start()
+    assert writing.wait(5)
+
+    game_state.turn_count = 7
+    results = []
+    manual = threading.Thread(target=lambda: results.append(persistence.save_game(game_state, world, "slot")))
+    manual.start()
+    manual.join(0.5)
+    resume.set()
+    autosave.join()
+    manual.join()
+
+    # Had the save appended to the journal under the old snapshot, the autosave would have discarded it.
+    assert results == [True]
+    loaded_state, _ = PersistenceManager(str(persistence.save_path)).load_game("slot")
+    assert loaded_state.turn_count == 7
+
+def test_manual_saves_are_written_by_the_autosave_worker(game, persistence, monkeypatch, capsys):
+    game_state, world = game
+    writers = []
+    def recording_atomic_write_bytes(file_path, *args, **kwargs):
+        writers.append((Path(file_path).name, threading.current_thread().name))
+        return atomic_write_bytes(file_path, *args, **kwargs)
+    monkeypatch.setattr("persistence.atomic_write_bytes", recording_atomic_write_bytes)
+    autosave = AutosaveService(persistence, slot_name="autosave")
+    handler = MetaCommandHandler(persistence, save_service=autosave)
+
+    autosave.request_save(game_state, world)
+    handler.handle_command("save mine", game_state, world, DisplayManager())
+
+    assert "Game saved to slot 'mine'." in capsys.readouterr().out
+    assert {name for name, _ in writers} >= {"autosave.json", "mine.json"}
+    assert {thread for _, thread in writers} == {"autosave-writer"}
+    assert PersistenceManager(str(persistence.save_path)).load_game("mine")
+    autosave.shutdown()
+
+def test_autosave_reserializes_only_the_locations_a_turn_changed(game, persistence):
+    game_state, world = game
+    autosave = AutosaveService(persistence, slot_name="autosave")
+    autosave.request_save(game_state, world)
+    fragments = {loc_id: cached[1] for loc_id, cached in autosave._fragment_cache.items()}
+
+    execute_world_mutations(game_state, world, [{"op": "move_npc", "character_name": "Villager 1", "new_location_id": "location_2"}])
+    game_state.end_turn()
+    autosave.request_save(game_state, world)
+    # The villager is now counted against location_2, where a later change must land.
+    villager = world.locations["location_2"].characters[-1]
+    villager.hp -= 5
+    game_state.mark_changed(villager)
+    game_state.end_turn()
+    autosave.request_save(game_state, world)
+    assert autosave.flush(timeout=5)
+
+    assert autosave._fragment_cache["location_0"][1] is fragments["location_0"]
+    _, loaded_world = PersistenceManager(str(persistence.save_path)).load_game("autosave")
+    assert [c.hp for c in loaded_world.locations["location_2"].characters] == [c.hp for c in world.locations["location_2"].characters]
+    autosave.shutdown()
+
+def test_delta_save_writes_only_the_locations_the_turn_changed(game, persistence):
+    game_state, world = game
+    assert persistence.save_game(game_state, world, "slot")
+    villager = world.locations["location_1"].characters[0]
+    villager.memory.append("The player waved.")
+    game_state.mark_changed(villager)
+    game_state.end_turn()
+    assert persistence.save_game(game_state, world, "slot")
+
+    with open(persistence.get_journal_file_path("slot")) as f:
+        deltas = [json.loads(line) for line in f]
+    assert [sorted(delta["locations"]) for delta in deltas] == [["location_1"]]
+
+def test_a_torn_journal_entry_is_trimmed_atomically(game, persistence, monkeypatch):
+    game_state, world = game
+    assert persistence.save_game(game_state, world, "slot")
+    game_state.turn_count = 4
+    assert persistence.save_game(game_state, world, "slot")
+    journal_path = persistence.get_journal_file_path("slot")
+    with open(journal_path, "a") as f:
+        f.write('{"snapshot_id": "torn')
+
+    rewritten = []
+    def recording_atomic_write_bytes(file_path, payload, *args, **kwargs):
+        rewritten.append(Path(file_path).name)
+        return atomic_write_bytes(file_path, payload, *args, **kwargs)
+    monkeypatch.setattr("persistence.atomic_write_bytes", recording_atomic_write_bytes)
+
+    loaded_state, _ = persistence.load_game("slot")
+    assert loaded_state.turn_count == 4
+    assert rewritten == [journal_path.name]
+    assert journal_path.read_text().count("\n") == 1 and "torn" not in journal_path.read_text()
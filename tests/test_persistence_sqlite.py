@@ -0,0 +1,44 @@
+import pytest
+
+from autosave import AutosaveService
+from event_executor import execute_world_mutations
+from persistence_sqlite import SQLitePersistenceManager
+from undo_history import UndoHistory
+
+@pytest.fixture
+def persistence(tmp_path):
+    return SQLitePersistenceManager(str(tmp_path))
+
+def load_fully(persistence, slot_name):
+    _, world = SQLitePersistenceManager(str(persistence.save_path)).load_game(slot_name)
+    return world
+
+def test_loaded_world_stays_lazy(game, persistence):
+    game_state, world = game
+    assert persistence.save_game(game_state, world, "slot")
+    loaded_state, loaded_world = persistence.load_game("slot")
+
+    UndoHistory().reset(loaded_state, loaded_world)
+    assert loaded_world.find_location_by_name("Location 2").id == "location_2"
+    assert loaded_world.find_character_anywhere("villager 1")[1].id == "location_1"
+    assert sorted(loc_id for loc_id, _ in loaded_world.loaded_locations()) == ["location_1", "location_2"]
+
+def test_saves_of_a_lazy_world_keep_the_unloaded_locations(game, persistence, location_names):
+    game_state, world = game
+    assert persistence.save_game(game_state, world, "slot")
+    expected = location_names(world)
+
+    loaded_state, loaded_world = persistence.load_game("slot")
+    execute_world_mutations(loaded_state, loaded_world, [{"op": "move_npc", "character_name": "Villager 0", "new_location_id": "location_1"}])
+    expected["location_0"], expected["location_1"] = [], ["Villager 1", "Villager 0"]
+    assert loaded_world.locations.unloaded_ids() == ["location_2"]
+
+    assert persistence.save_game(loaded_state, loaded_world, "copy")
+    autosave = AutosaveService(persistence, slot_name="autosave")
+    autosave.request_save(loaded_state, loaded_world)
+    assert autosave.flush(timeout=5)
+    # A fresh save into the slot the world came from keeps its never-loaded rows in place.
+    assert SQLitePersistenceManager(str(persistence.save_path)).save_game(loaded_state, loaded_world, "slot")
+
+    for slot_name in ("copy", "autosave", "slot"):
+        assert location_names(load_fully(persistence, slot_name)) == expected
@@ -0,0 +1,83 @@
+import pytest
+
+from action_handlers.interaction_handler import InteractionHandler
+from action_handlers.quest_handler import QuestHandler
+from definitions.quests import Quest
+from definitions.world_objects import Interactable
+from display_manager import DisplayManager
+from managers.quest_manager import QuestManager
+from managers.quest_offer_manager import VALID_OBJECTIVE_TYPES, validate_offer
+from quest_graph import QuestGraph
+
+def test_interact_objectives_complete_when_the_player_interacts(game):
+    assert "interact" in VALID_OBJECTIVE_TYPES
+    game_state, world = game
+    world.locations["location_0"].interactables.append(
+        Interactable(id="old_chest", name="Old Chest", description="A battered chest.", state={"container": []})
+    )
+    display = DisplayManager()
+    quest_manager = QuestManager()
+    quest_manager.start_quest(game_state, {
+        "id": "open_the_chest", "name": "Open the Chest", "description": "See what is inside.",
+        "objectives": [{"id": "open_chest", "description": "Open the old chest.", "type": "interact", "target": "the old chest"}],
+    }, display)
+    game_state.drain_events()
+
+    result = InteractionHandler().process_interaction_intent(game_state, world, None, {"intent": "interact", "target": "old chest"})
+    assert result.startswith("Success")
+    quest_manager.process_events(game_state, game_state.drain_events(), display)
+    assert game_state.quest_log["open_the_chest"].status == "completed"
+
+class QuestWriter:
+    """Writes the quest a giver remembers offering, as generate_quest_from_context does."""
+    def __init__(self, quest_id):
+        self.quest_id = quest_id
+
+    def generate_quest_from_context(self, quest_giver, offer_memory):
+        return {"id": self.quest_id, "name": "Odd Job", "description": "Something improvised.",
+                "objectives": [{"id": "fetch", "description": "Fetch a crate.", "type": "acquire_item", "target": "crate"}]}
+
+@pytest.mark.parametrize("written_id", ["odd_job", "storeroom_key"])
+def test_a_quest_written_from_memory_never_takes_over_an_authored_quest(game, written_id):
+    game_state, world = game
+    location = world.locations["location_0"]
+    location.quests = [Quest(id="storeroom_key", name="The Storeroom", description="Fetch the key.",
+                             on_accept=[{"op": "move_npc", "character_name": "Villager 1", "new_location_id": "location_0"}])]
+    location.characters[0].available_quest_ids = ["storeroom_key"]
+    location.characters[0].memory.append("I offered the adventurer some work hauling crates.")
+    quest_graph = QuestGraph()
+    handler = QuestHandler(QuestManager(), quest_graph=quest_graph)
+
+    result = handler.process_quest_intent(game_state, world, QuestWriter(written_id),
+                                          {"action_type": "accept", "target": "Villager 0", "display": DisplayManager()})
+    assert result == "Success: Quest Accepted"
+    quest_graph.process_events(game_state, world, game_state.drain_events())
+
+    assert "storeroom_key" not in game_state.quest_log
+    assert [quest.name for quest in game_state.quest_log.values()] == ["Odd Job"]
+    assert [c.name for c in world.locations["location_0"].characters] == ["Villager 0"]
+
+def test_the_tavern_storeroom_door_is_loaded_locked_behind_its_only_exit():
+    from world_loader import WorldLoader
+    world = WorldLoader("data/locations").load_world()
+    tavern = world.locations["salty_siren_tavern"]
+    door = next(i for i in tavern.interactables if i.id == "storeroom_door")
+    assert door.state.get("locked") is True
+    assert list(tavern.exits.values()).count("salty_siren_storeroom") == 1
+    assert all(op["op"] != "add_exit" for quest in tavern.quests for op in quest.on_accept)
+
+def test_an_outlined_offer_keeps_the_outline_objectives():
+    outline = Quest.from_dict({
+        "id": "rat_problem", "name": "Rat Problem", "description": "Clear the cellar.",
+        "objectives": [{"id": "kill_rats", "description": "Kill the rats.", "type": "kill_target", "target": "Giant Rat", "required_count": 3}],
+    }).to_dict()
+    written = {"id": "kill_rats", "description": "Kill a rat.", "type": "kill_target", "target": "Giant Rat", "required_count": 1}
+    response = {"offer_text": "Rats in my cellar!", "quest": {"id": "rats", "name": "Vermin", "description": "Rats.", "objectives": [written]}}
+
+    offer_text, quest_data = validate_offer(response, outline)
+    assert (offer_text, quest_data["id"], quest_data["name"]) == ("Rats in my cellar!", "rat_problem", "Vermin")
+    assert quest_data["objectives"][0]["required_count"] == 3
+    assert quest_data["objectives"][0]["description"] == "Kill the rats."
+
+    written["target"] = "Cellar Spider"
+    assert validate_offer(response, outline) is None
@@ -0,0 +1,17 @@
+from action_processor import ActionProcessor
+from game_events import LOCATION_ENTERED
+from world_graph import DEFAULT_TRAVEL_MINUTES
+
+def test_travel_enters_every_stop_on_the_route(game):
+    game_state, world = game
+    visits = []
+    processor = ActionProcessor(entry_hooks=[lambda state, _world, _ai: visits.append((state.current_location_id, state.minutes_elapsed))])
+    start = game_state.minutes_elapsed
+
+    result = processor.process_action(game_state, world, None, {"intent": "travel", "target": "Location 2"})
+
+    assert result.startswith("Success")
+    assert [(e.type, e.target) for e in game_state.drain_events()] == [(LOCATION_ENTERED, "location_1"), (LOCATION_ENTERED, "location_2")]
+    assert visits == [("location_1", start + DEFAULT_TRAVEL_MINUTES), ("location_2", start + 2 * DEFAULT_TRAVEL_MINUTES)]
+    # The game loop adds the last leg's minutes for a successful action.
+    assert game_state.minutes_elapsed == start + DEFAULT_TRAVEL_MINUTES
@@ -0,0 +1,26 @@
+from definitions.quests import Quest
+from event_executor import execute_world_mutations
+from quest_graph import QuestGraph
+from undo_history import UndoHistory
+
+def test_undo_replaces_locations_and_signals_it(game, location_names):
+    game_state, world = game
+    world.locations["location_1"].quests = [Quest(id="lost_ring", name="The Lost Ring", description="Find the ring.")]
+    expected = location_names(world)
+    quest_graph = QuestGraph()
+    assert quest_graph.is_available(game_state, world, "lost_ring")
+
+    history = UndoHistory()
+    history.reset(game_state, world)
+    execute_world_mutations(game_state, world, [{"op": "move_npc", "character_name": "Villager 1", "new_location_id": "location_2"}])
+    game_state.turn_count += 1
+    history.record(game_state, world)
+
+    revision = world.revision
+    restored_state = history.undo(world, 1)
+    assert restored_state.turn_count == 0
+    assert location_names(world) == expected
+    assert world.revision > revision
+    # Holders of the old objects rebuild from the restored ones.
+    assert quest_graph.is_available(restored_state, world, "lost_ring")
+    assert quest_graph.template("lost_ring") is world.locations["location_1"].quests[0]
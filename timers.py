@@ -0,0 +1,174 @@
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+MINUTES = "minutes"  # driven by GameState.minutes_elapsed
+TURNS = "turns"      # driven by GameState.turn_count
+CLOCKS = (MINUTES, TURNS)
+
+@dataclass(slots=True)
+class Timer:
+    id: int
+    clock: str
+    due: int
+    kind: str  # selects the handler, see TimerManager
+    key: Optional[str] = None  # replaces any other timer with the same key
+    data: Dict[str, Any] = field(default_factory=dict)
+    interval: int = 0  # periodic when > 0
+    repeats: Optional[int] = None  # periodic firings left, None for no limit
+    cancelled: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "clock": self.clock,
+            "due": self.due,
+            "kind": self.kind,
+            "key": self.key,
+            "data": self.data,
+            "interval": self.interval,
+            "repeats": self.repeats,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Timer":
+        return cls(
+            id=data["id"],
+            clock=data["clock"],
+            due=data["due"],
+            kind=data["kind"],
+            key=data.get("key"),
+            data=dict(data.get("data", {})),
+            interval=data.get("interval", 0),
+            repeats=data.get("repeats"),
+        )
+
+class TimerWheel:
+    """
+    The timers of one clock, bucketed by the tick they are due on.
+
+    A heap holds each occupied tick once, so advancing the clock by any
+    amount (a long rest is hundreds of minutes) visits only the buckets that
+    are due: the work is proportional to the timers that expire. Cancelled
+    timers are dropped when their bucket comes up.
+    """
+
+    def __init__(self, now: int = 0):
+        self.now = now
+        self._buckets: Dict[int, List[Timer]] = {}
+        self._ticks: List[int] = []
+
+    def add(self, timer: Timer):
+        bucket = self._buckets.get(timer.due)
+        if bucket is None:
+            self._buckets[timer.due] = bucket = []
+            heapq.heappush(self._ticks, timer.due)
+        bucket.append(timer)
+
+    def advance(self, now: int) -> List[Tuple[Timer, int]]:
+        """Moves the clock to now and returns (timer, firings) for every timer that came due, in order."""
+        fired = []
+        while self._ticks and self._ticks[0] <= now:
+            tick = heapq.heappop(self._ticks)
+            for timer in self._buckets.pop(tick):
+                if timer.cancelled:
+                    continue
+                firings = 1
+                if timer.interval > 0:
+                    # Every period that passed is delivered at once, however long the jump.
+                    firings += (now - tick) // timer.interval
+                    if timer.repeats is not None:
+                        firings = min(firings, timer.repeats)
+                        timer.repeats -= firings
+                    if timer.repeats is None or timer.repeats > 0:
+                        timer.due = tick + firings * timer.interval
+                        self.add(timer)
+                fired.append((timer, firings))
+        self.now = max(self.now, now)
+        return fired
+
+class GameTimers:
+    """Timers on game minutes and turns, with cancellation by id or key. Saved with the game state."""
+
+    def __init__(self, minutes: int = 0, turns: int = 0):
+        self.wheels: Dict[str, TimerWheel] = {MINUTES: TimerWheel(minutes), TURNS: TimerWheel(turns)}
+        self.next_id = 1
+        self._by_id: Dict[int, Timer] = {}
+        self._by_key: Dict[str, int] = {}
+
+    def schedule(self, clock: str, now: int, delay: int, kind: str, key: Optional[str] = None, data: Optional[Dict[str, Any]] = None,
+                 interval: int = 0, repeats: Optional[int] = None) -> int:
+        """Fires `delay` ticks after `now` (and then every `interval` ticks, `repeats` times, when periodic)."""
+        if key is not None:
+            self.cancel_key(key)
+        timer = Timer(id=self.next_id, clock=clock, due=now + max(1, delay), kind=kind, key=key,
+                      data=dict(data or {}), interval=interval, repeats=repeats)
+        self.next_id += 1
+        self._track(timer)
+        return timer.id
+
+    def cancel(self, timer_id: int) -> bool:
+        timer = self._by_id.pop(timer_id, None)
+        if timer is None:
+            return False
+        timer.cancelled = True
+        if timer.key is not None and self._by_key.get(timer.key) == timer_id:
+            del self._by_key[timer.key]
+        return True
+
+    def cancel_key(self, key: str) -> bool:
+        timer_id = self._by_key.get(key)
+        return self.cancel(timer_id) if timer_id is not None else False
+
+    def has_key(self, key: str) -> bool:
+        return key in self._by_key
+
+    def get_key(self, key: str) -> Optional[Timer]:
+        timer_id = self._by_key.get(key)
+        return self._by_id.get(timer_id) if timer_id is not None else None
+
+    def advance(self, clock: str, now: int) -> List[Tuple[Timer, int]]:
+        fired = self.wheels[clock].advance(now)
+        for timer, _ in fired:
+            if timer.interval <= 0 or timer.repeats == 0:
+                self._forget(timer)
+        return fired
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _track(self, timer: Timer):
+        self._by_id[timer.id] = timer
+        if timer.key is not None:
+            self._by_key[timer.key] = timer.id
+        self.wheels[timer.clock].add(timer)
+
+    def _forget(self, timer: Timer):
+        self._by_id.pop(timer.id, None)
+        if timer.key is not None and self._by_key.get(timer.key) == timer.id:
+            del self._by_key[timer.key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "now": {clock: wheel.now for clock, wheel in self.wheels.items()},
+            "next_id": self.next_id,
+            "timers": [timer.to_dict() for timer in self._by_id.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameTimers":
+        now = data.get("now", {})
+        timers = cls(now.get(MINUTES, 0), now.get(TURNS, 0))
+        timers.next_id = data.get("next_id", 1)
+        for timer_data in data.get("timers", []):
+            try:
+                timer = Timer.from_dict(timer_data)
+            except (KeyError, TypeError) as e:
+                logging.error(f"Dropping unreadable saved timer. Error: {e}. Data: {timer_data}")
+                continue
+            if timer.clock not in timers.wheels:
+                logging.error(f"Dropping saved timer {timer.id} with unknown clock '{timer.clock}'.")
+                continue
+            timers._track(timer)
+        return timers
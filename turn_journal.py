@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import TURN_JOURNAL_DIR, TURN_JOURNAL_KEEP_SESSIONS
+from game_state import GameState, GameWorld
+
+def new_turn_seed() -> int:
+    """A fresh seed for the global RNG, drawn from the OS so it does not depend on earlier turns."""
+    return random.SystemRandom().getrandbits(32)
+
+def journal_safe_intent(intent_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """intent_data without the runtime-only entries (the display manager) that handlers receive."""
+    if intent_data is None:
+        return None
+    return {k: v for k, v in intent_data.items() if k != "display"}
+
+class TurnJournal:
+    """
+    An append-only, event-sourced record of a play session.
+
+    Each session file (<dir>/session-<time>-<id>.jsonl) starts with a header
+    holding the full starting state, followed by one line per turn: the raw
+    input, the resolved intent_data, the RNG seed the turn ran with, the
+    handler result, the turn's change set and every raw LLM response. Applying
+    the turns to the header state with the recorded seeds and responses
+    rebuilds the session without calling the model, which is used both to
+    recover from a crash and as a replay fixture for performance runs. A
+    session that ends normally gets a closing "end" line; one without it was
+    interrupted and can be recovered.
+    """
+
+    def __init__(self, journal_directory: str = TURN_JOURNAL_DIR, keep_sessions: int = TURN_JOURNAL_KEEP_SESSIONS):
+        self.journal_path = Path(journal_directory)
+        self.journal_path.mkdir(parents=True, exist_ok=True)
+        self.keep_sessions = keep_sessions
+        self.session_file: Optional[Path] = None
+        self._file = None
+        logging.info(f"TurnJournal initialized. Directory: '{self.journal_path.resolve()}'")
+
+    def start_session(self, game_state: GameState, world: GameWorld) -> Path:
+        """Closes any open session and starts a new one whose base is the given state."""
+        self.end_session()
+        self._prune_sessions()
+        session_id = uuid.uuid4().hex[:8]
+        self.session_file = self.journal_path / f"session-{time.strftime('%Y%m%d-%H%M%S')}-{session_id}.jsonl"
+        header = {
+            "type": "session",
+            "session_id": session_id,
+            "started_at": time.time(),
+            "game_state": game_state.to_dict(compact=True),
+            "game_world": world.to_dict(compact=True),
+        }
+        self._file = open(self.session_file, 'a')
+        self._append(header)
+        logging.info(f"Started turn journal session '{self.session_file.name}'.")
+        return self.session_file
+
+    def record_turn(
+        self,
+        turn: int,
+        user_input: str,
+        rng_seed: int,
+        intent_data: Optional[Dict[str, Any]],
+        result: Optional[str],
+        changes: Dict[str, Any],
+        llm_responses: List[Optional[str]],
+        duration_ms: float,
+    ):
+        if self._file is None:
+            return
+        self._append({
+            "type": "turn",
+            "turn": turn,
+            "input": user_input,
+            "rng_seed": rng_seed,
+            "intent_data": journal_safe_intent(intent_data),
+            "result": result,
+            "changes": changes,
+            "llm_responses": llm_responses,
+            "duration_ms": round(duration_ms, 3),
+        })
+
+    def end_session(self):
+        if self._file is None:
+            return
+        self._append({"type": "end", "ended_at": time.time()})
+        self._file.close()
+        self._file = None
+        logging.info(f"Closed turn journal session '{self.session_file.name if self.session_file else ''}'.")
+
+    def _append(self, entry: Dict[str, Any]):
+        assert self._file is not None
+        # default=str keeps a stray non-JSON value in intent_data from losing the whole turn.
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def list_sessions(self) -> List[Path]:
+        return sorted(self.journal_path.glob("session-*.jsonl"))
+
+    def find_unfinished_session(self) -> Optional[Path]:
+        """The most recent session that has turns but no closing line, if any."""
+        sessions = self.list_sessions()
+        if not sessions or sessions[-1] == self.session_file:
+            return None
+        header, turns, closed = load_session(sessions[-1])
+        if header is None or closed or not turns:
+            return None
+        return sessions[-1]
+
+    def _prune_sessions(self):
+        sessions = self.list_sessions()
+        for old_session in sessions[:max(0, len(sessions) - self.keep_sessions + 1)]:
+            old_session.unlink(missing_ok=True)
+
+
+def load_session(session_file: Path) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], bool]:
+    """Reads a session file into (header, turns, closed). A torn final line from a crash is ignored."""
+    header = None
+    turns: List[Dict[str, Any]] = []
+    closed = False
+    with open(session_file, 'r') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(f"Ignoring unreadable entry {line_number} in turn journal '{session_file}'.")
+                break
+            entry_type = entry.get("type")
+            if entry_type == "session":
+                header = entry
+            elif entry_type == "turn":
+                turns.append(entry)
+            elif entry_type == "end":
+                closed = True
+    return header, turns, closed
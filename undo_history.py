@@ -0,0 +1,89 @@
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+
+from config import UNDO_HISTORY_TURNS
+from definitions.world_objects import ContentVersion
+from game_state import GameState, GameWorld, Location
+
+@dataclass
+class _TurnEntry:
+    turn: int
+    game_state: str
+    # Serialized location states from before this turn, only for locations the turn changed.
+    before: Dict[str, Optional[str]] = field(default_factory=dict)
+
+class UndoHistory:
+    """
+    A bounded in-memory history of the last N turn states for 'undo'.
+
+    Each entry stores the (small) game state and only the locations whose
+    content version changed during that turn, as immutable JSON strings. A
+    location that did not change is never copied; its current object is the
+    state of every entry. Undoing n turns restores the game state of the
+    target entry and rebuilds just the locations changed since then from
+    their stored before-images, so the cost follows the size of the rewound
+    changes rather than the size of the world.
+    """
+
+    def __init__(self, max_turns: int = UNDO_HISTORY_TURNS):
+        self.max_turns = max_turns
+        self._entries: Deque[_TurnEntry] = deque(maxlen=max_turns + 1)
+        # The last serialized state of every location, and the content version it was taken at.
+        self._latest: Dict[str, Tuple[Location, ContentVersion, str]] = {}
+
+    def __len__(self) -> int:
+        """How many turns can currently be undone."""
+        return max(0, len(self._entries) - 1)
+
+    def reset(self, game_state: GameState, world: GameWorld):
+        """Starts a new history whose oldest entry is the current state, e.g. after loading a save."""
+        self._entries.clear()
+        self._latest = {}
+        for loc_id, location in world.loaded_locations():
+            self._remember(location)
+        # A lazily loaded location is recorded as it was read, so a turn that loads and changes it can be undone.
+        load_listeners = getattr(world.locations, "load_listeners", None)
+        if load_listeners is not None and self._remember not in load_listeners:
+            load_listeners.append(self._remember)
+        self._entries.append(_TurnEntry(turn=game_state.turn_count, game_state=json.dumps(game_state.to_dict(compact=True))))
+
+    def record(self, game_state: GameState, world: GameWorld):
+        """Adds the state at the end of a turn."""
+        entry = _TurnEntry(turn=game_state.turn_count, game_state=json.dumps(game_state.to_dict(compact=True)))
+        for loc_id, location in world.loaded_locations():
+            version = location.content_version()
+            latest = self._latest.get(loc_id)
+            if latest and latest[0] is location and latest[1] == version:
+                continue
+            entry.before[loc_id] = latest[2] if latest else None
+            self._latest[loc_id] = (location, version, json.dumps(location.to_dict(compact=True)))
+        self._entries.append(entry)
+
+    def _remember(self, location: Location):
+        self._latest[location.id] = (location, location.content_version(), json.dumps(location.to_dict(compact=True)))
+
+    def undo(self, world: GameWorld, turns: int = 1) -> Optional[GameState]:
+        """Rewinds the world in place and returns the game state as it was `turns` turns ago."""
+        if turns < 1 or turns > len(self):
+            return None
+
+        restored: Dict[str, Optional[str]] = {}
+        for _ in range(turns):
+            # Newer entries are undone first, so the oldest before-image of a location wins.
+            restored.update(self._entries.pop().before)
+
+        for loc_id, location_json in restored.items():
+            if location_json is None:
+                # The location was generated during the rewound turns. It stays in the world
+                # (unreachable once its entrance is rewound) so its generated content is not lost.
+                continue
+            location = Location.from_dict(json.loads(location_json))
+            world.replace_location(location)
+            self._latest[loc_id] = (location, location.content_version(), location_json)
+
+        target = self._entries[-1]
+        logging.info(f"Undid {turns} turns, back to turn {target.turn} ({len(restored)} locations restored).")
+        return GameState.from_dict(json.loads(target.game_state), world)
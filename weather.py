@@ -0,0 +1,181 @@
+import logging
+import math
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from config import WEATHER_CACHE_HOURS, WEATHER_REGION_RADIUS
+from game_state import GameWorld
+
+CONDITIONS = ("clear", "overcast", "fog", "drizzle", "rain", "storm", "snow")
+TEMPERATURE_EDGES = np.array([0.0, 8.0, 15.0, 22.0, 28.0])
+TEMPERATURE_NAMES = ("freezing", "cold", "cool", "mild", "warm", "hot")
+WIND_EDGES = np.array([5.0, 20.0, 35.0])
+WIND_NAMES = ("calm", "breezy", "windy", "gale")
+
+# Noise octaves as (period in hours, weight): weather fronts over a day, showers within it.
+OCTAVES = ((24, 0.7), (6, 0.3))
+TEMPERATURE, PRECIPITATION, WIND = range(3)
+
+_MASK = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads each uint64 into a well-mixed uint64."""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return (x ^ (x >> np.uint64(31))) & _MASK
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    """Hashes to floats in [-1, 1)."""
+    return (_mix(x) >> np.uint64(11)).astype(np.float64) * (2.0 / 2 ** 53) - 1.0
+
+@dataclass(frozen=True, slots=True)
+class WeatherSnapshot:
+    """Every region's weather for one game hour, indexed like WeatherModel.region_ids."""
+    hour: int
+    temperature: np.ndarray  # degrees Celsius
+    precipitation: np.ndarray  # -1 (dry) .. 1 (downpour)
+    wind: np.ndarray  # km/h
+    condition: np.ndarray  # index into CONDITIONS
+
+    def describe(self, region: int) -> Dict[str, Any]:
+        temperature = float(self.temperature[region])
+        wind = float(self.wind[region])
+        return {
+            "condition": CONDITIONS[self.condition[region]],
+            "temperature": TEMPERATURE_NAMES[int(np.searchsorted(TEMPERATURE_EDGES, temperature, side="right"))],
+            "temperature_c": round(temperature),
+            "wind": WIND_NAMES[int(np.searchsorted(WIND_EDGES, wind, side="right"))],
+        }
+
+class WeatherModel:
+    """
+    Deterministic weather for every region of the world, from a seed.
+
+    Regions group the locations within WEATHER_REGION_RADIUS exits of a
+    region's first location; locations generated later join a neighbouring
+    region. Each region has its own climate and value-noise stream, hashed
+    from the seed and the region's first location id, so the weather at a
+    given hour never depends on what was computed before. A whole hour is
+    computed for all regions at once and the last few hours are cached.
+    """
+
+    def __init__(self, seed: int, radius: int = WEATHER_REGION_RADIUS, cache_hours: int = WEATHER_CACHE_HOURS):
+        self.seed = seed
+        self.radius = radius
+        self.cache_hours = cache_hours
+        self.region_ids: List[str] = []
+        self.region_of: Dict[str, int] = {}
+        self._region_keys = np.zeros(0, dtype=np.uint64)
+        self._base_temperature = np.zeros(0)
+        self._wetness = np.zeros(0)
+        self._cache: "OrderedDict[int, WeatherSnapshot]" = OrderedDict()
+        self._world: Optional[GameWorld] = None
+
+    def region(self, world: GameWorld, location_id: str) -> Optional[int]:
+        self._ensure(world)
+        return self.region_of.get(location_id)
+
+    def snapshot(self, world: GameWorld, hour: int) -> WeatherSnapshot:
+        self._ensure(world)
+        cached = self._cache.get(hour)
+        if cached is not None:
+            self._cache.move_to_end(hour)
+            return cached
+        snapshot = self._compute(hour)
+        self._cache[hour] = snapshot
+        if len(self._cache) > self.cache_hours:
+            self._cache.popitem(last=False)
+        return snapshot
+
+    def _compute(self, hour: int) -> WeatherSnapshot:
+        noise = np.zeros((3, len(self.region_ids)))
+        channels = np.arange(3, dtype=np.uint64)[:, None]
+        for period, weight in OCTAVES:
+            lattice = hour // period
+            t = (hour % period) / period
+            smooth = t * t * (3 - 2 * t)
+            keys = self._region_keys[None, :] ^ _mix(channels * np.uint64(0x9E3779B97F4A7C15) + np.uint64(period))
+            before = _unit(keys ^ _mix(np.uint64(lattice & 0xFFFFFFFFFFFFFFFF)))
+            after = _unit(keys ^ _mix(np.uint64((lattice + 1) & 0xFFFFFFFFFFFFFFFF)))
+            noise += weight * (before + (after - before) * smooth)
+
+        # Coolest before dawn, warmest mid-afternoon.
+        daily = 5.0 * math.sin(2 * math.pi * ((hour % 24) - 9) / 24)
+        temperature = self._base_temperature + daily + 6.0 * noise[TEMPERATURE]
+        precipitation = np.clip(0.7 * noise[PRECIPITATION] + 0.3 * self._wetness, -1.0, 1.0)
+        wind = np.maximum(0.0, 15.0 + 25.0 * noise[WIND])
+
+        condition = np.select(
+            [
+                (precipitation > 0.2) & (temperature <= 0.0),
+                (precipitation > 0.5) & (wind > 30.0),
+                precipitation > 0.35,
+                precipitation > 0.2,
+                (precipitation > 0.05) & (wind < 8.0),
+                precipitation > -0.15,
+            ],
+            [CONDITIONS.index(name) for name in ("snow", "storm", "rain", "drizzle", "fog", "overcast")],
+            default=CONDITIONS.index("clear"),
+        )
+        return WeatherSnapshot(hour, temperature, precipitation, wind, condition)
+
+    def _ensure(self, world: GameWorld):
+        if self._world is not world:
+            self.region_ids = []
+            self.region_of = {}
+            self._region_keys = np.zeros(0, dtype=np.uint64)
+            self._base_temperature = np.zeros(0)
+            self._wetness = np.zeros(0)
+            self._cache.clear()
+            self._world = world
+        if len(self.region_of) == len(world.locations):
+            return
+        new_regions = self._assign(world)
+        if new_regions:
+            keys = np.array([zlib.crc32(region_id.encode()) for region_id in new_regions], dtype=np.uint64)
+            keys = _mix(keys ^ _mix(np.uint64(self.seed)))
+            climate = _unit(keys[None, :] ^ np.array([[1], [2]], dtype=np.uint64))
+            self._region_keys = np.concatenate([self._region_keys, keys])
+            self._base_temperature = np.concatenate([self._base_temperature, 12.0 + 6.0 * climate[0]])
+            self._wetness = np.concatenate([self._wetness, climate[1]])
+            self._cache.clear()
+        logging.info(f"Weather regions: {len(self.region_ids)} for {len(self.region_of)} locations.")
+
+    def _assign(self, world: GameWorld) -> List[str]:
+        """Places the locations without a region and returns the ids of any regions created."""
+        # Exits are one-way; a region is about being nearby, so follow them both ways.
+        adjacent: Dict[str, Set[str]] = {location_id: set(world.graph.neighbors(location_id)) for location_id in world.locations}
+        for location_id, neighbors in list(adjacent.items()):
+            for neighbor in neighbors:
+                adjacent[neighbor].add(location_id)
+
+        joining = bool(self.region_ids)
+        new_regions = []
+        for location_id in sorted(world.locations.keys() - self.region_of.keys()):
+            if location_id in self.region_of:
+                continue
+            if joining:
+                # A location generated during play joins the region it was reached from.
+                region = next((self.region_of[n] for n in sorted(adjacent[location_id]) if n in self.region_of), None)
+                if region is not None:
+                    self.region_of[location_id] = region
+                    continue
+            region = len(self.region_ids)
+            self.region_ids.append(location_id)
+            new_regions.append(location_id)
+            self.region_of[location_id] = region
+            frontier = deque([(location_id, 0)])
+            while frontier:
+                current, distance = frontier.popleft()
+                if distance == self.radius:
+                    continue
+                for neighbor in sorted(adjacent[current]):
+                    if neighbor not in self.region_of:
+                        self.region_of[neighbor] = region
+                        frontier.append((neighbor, distance + 1))
+        return new_regions
@@ -0,0 +1,105 @@
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from definitions.world_objects import Location
+
+# Every exit currently costs the same in-game time as a single 'move' turn.
+DEFAULT_TRAVEL_MINUTES = 5
+
+class WorldGraph:
+    """
+    A directed graph of the loaded locations, built from Location.exits.
+
+    Edges are kept up to date incrementally as exits are added or removed, so
+    pathfinding never has to rescan every location's exits dict. Edges may point
+    at locations that have not been generated yet; routes only pass through
+    locations that are loaded.
+    """
+
+    def __init__(self, locations: Optional[Iterable['Location']] = None):
+        self.edges: Dict[str, Dict[str, int]] = {}
+        self.nodes: Set[str] = set()
+        if locations:
+            for location in locations:
+                self.add_location(location)
+
+    def add_location(self, location: 'Location'):
+        self.nodes.add(location.id)
+        self.refresh_location(location)
+
+    def add_node(self, location_id: str, destination_ids: Iterable[str]):
+        """Adds a location from its exit destinations alone, without needing the Location object."""
+        self.nodes.add(location_id)
+        self.edges[location_id] = {dest_id: DEFAULT_TRAVEL_MINUTES for dest_id in destination_ids}
+
+    def refresh_location(self, location: 'Location'):
+        """Recomputes the outgoing edges of a single location from its exits."""
+        self.edges[location.id] = {dest_id: DEFAULT_TRAVEL_MINUTES for dest_id in location.exits.values()}
+
+    def add_exit(self, source_id: str, destination_id: str, cost: int = DEFAULT_TRAVEL_MINUTES):
+        self.edges.setdefault(source_id, {})[destination_id] = cost
+
+    def remove_exit(self, source_id: str, destination_id: str):
+        self.edges.get(source_id, {}).pop(destination_id, None)
+
+    def neighbors(self, location_id: str) -> List[str]:
+        return [dest for dest in self.edges.get(location_id, {}) if dest in self.nodes]
+
+    def shortest_path(self, source_id: str, destination_id: str) -> Optional[List[str]]:
+        """Breadth-first search for the route with the fewest hops. Returns the ids from source to destination."""
+        if source_id not in self.nodes or destination_id not in self.nodes:
+            return None
+        if source_id == destination_id:
+            return [source_id]
+
+        previous: Dict[str, str] = {}
+        frontier = deque([source_id])
+        visited = {source_id}
+        while frontier:
+            current = frontier.popleft()
+            for neighbor in self.neighbors(current):
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                previous[neighbor] = current
+                if neighbor == destination_id:
+                    return self._rebuild_path(previous, source_id, destination_id)
+                frontier.append(neighbor)
+        return None
+
+    def cheapest_path(self, source_id: str, destination_id: str) -> Optional[List[str]]:
+        """Dijkstra search for the route with the lowest total travel cost."""
+        if source_id not in self.nodes or destination_id not in self.nodes:
+            return None
+
+        best: Dict[str, int] = {source_id: 0}
+        previous: Dict[str, str] = {}
+        queue = [(0, source_id)]
+        while queue:
+            cost, current = heapq.heappop(queue)
+            if current == destination_id:
+                return self._rebuild_path(previous, source_id, destination_id)
+            if cost > best.get(current, cost):
+                continue
+            for neighbor, edge_cost in self.edges.get(current, {}).items():
+                if neighbor not in self.nodes:
+                    continue
+                new_cost = cost + edge_cost
+                if new_cost < best.get(neighbor, new_cost + 1):
+                    best[neighbor] = new_cost
+                    previous[neighbor] = current
+                    heapq.heappush(queue, (new_cost, neighbor))
+        return None
+
+    def path_cost(self, path: List[str]) -> int:
+        return sum(self.edges[a][b] for a, b in zip(path, path[1:]))
+
+    @staticmethod
+    def _rebuild_path(previous: Dict[str, str], source_id: str, destination_id: str) -> List[str]:
+        path = [destination_id]
+        while path[-1] != source_id:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
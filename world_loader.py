@@ -3,15 +3,18 @@ import logging
 from typing import Dict
 from pathlib import Path
 
-from game_state import GameWorld, Location, Character, Item
+from game_state import GameWorld, Location, Character, Item, Interactable
 from definitions.quests import Quest, Objective
+from definitions.item_templates import item_templates
 
 class WorldLoader:
-    def __init__(self, locations_data_dir: str):
+    def __init__(self, locations_data_dir: str, items_data_dir: str = "data/items"):
         self.locations_path = Path(locations_data_dir)
+        self.items_path = Path(items_data_dir)
 
     def load_world(self) -> GameWorld:
         logging.info(f"Loading world data from directory '{self.locations_path}'...")
+        item_templates.load(str(self.items_path))
         
         rebuilt_locations = {}
         try:
@@ -49,7 +52,7 @@ class WorldLoader:
             name=char_data['name'],
             description=char_data['description'],
             stats=char_data['stats'],
-            inventory=char_data.get('inventory', []),
+            inventory=[Item.from_dict(item) for item in char_data.get('inventory', [])],
             mood=char_data.get('mood', 'neutral'),
             memory=char_data.get('memory', []),
             available_quest_ids=char_data.get('available_quest_ids', []),
@@ -59,7 +62,7 @@ class WorldLoader:
         )
 
     def _rebuild_location(self, loc_data: Dict) -> Location:
-        items = [Item(**item) for item in loc_data.get('items', [])]
+        items = [Item.from_dict(item) for item in loc_data.get('items', [])]
         characters = [self._rebuild_character(char) for char in loc_data.get('characters', [])]
 
         rebuilt_quests = []
@@ -71,7 +74,10 @@ class WorldLoader:
                 description=quest_data['description'],
                 required_stat=quest_data.get('required_stat'),
                 required_dc=quest_data.get('required_dc', 0),
-                objectives=objectives
+                objectives=objectives,
+                prerequisites=quest_data.get('prerequisites', {}),
+                on_accept=quest_data.get('on_accept', []),
+                on_complete=quest_data.get('on_complete', [])
             )
             rebuilt_quests.append(quest)
         
@@ -81,6 +87,7 @@ class WorldLoader:
             description=loc_data['description'],
             characters=characters,
             items=items,
+            interactables=[Interactable(**i) for i in loc_data.get('interactables', [])],
             exits=loc_data.get('exits', {}),
             quests=rebuilt_quests
         )
\ No newline at end of file